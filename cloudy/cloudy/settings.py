@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from decouple import config, Csv
 from datetime import timedelta
@@ -47,6 +48,14 @@ CORS_ALLOW_HEADERS = [
     "x-requested-with",
 ]    
 
+# 프론트엔드에서 읽을 수 있도록 노출하는 응답 헤더
+CORS_EXPOSE_HEADERS = [
+    "retry-after",
+    "x-github-ratelimit-limit",
+    "x-github-ratelimit-remaining",
+    "x-github-ratelimit-reset",
+]
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -76,6 +85,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'github.middleware.GitHubRateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -163,6 +173,58 @@ AUTH_USER_MODEL = 'users.User'
 GITHUB_CLIENT_ID = config('GITHUB_CLIENT_ID')
 GITHUB_CLIENT_SECRET = config('GITHUB_CLIENT_SECRET')
 GITHUB_CALLBACK_URL = config('GITHUB_CALLBACK_URL')
+GITHUB_API_URL = config('GITHUB_API_URL', default='https://api.github.com')
+GITHUB_WEBHOOK_SECRET = config('GITHUB_WEBHOOK_SECRET', default='')
+GITHUB_URL = config('GITHUB_URL', default='https://github.com')
+
+# GitHub API 공용 클라이언트 (timeout 단위: 초)
+GITHUB_HTTP_POOL_SIZE = config('GITHUB_HTTP_POOL_SIZE', default=20, cast=int)
+GITHUB_HTTP_CONNECT_TIMEOUT = config('GITHUB_HTTP_CONNECT_TIMEOUT', default=5, cast=float)
+GITHUB_HTTP_READ_TIMEOUT = config('GITHUB_HTTP_READ_TIMEOUT', default=30, cast=float)
+GITHUB_HTTP_MAX_RETRIES = config('GITHUB_HTTP_MAX_RETRIES', default=3, cast=int)
+GITHUB_HTTP_RETRY_BACKOFF = config('GITHUB_HTTP_RETRY_BACKOFF', default=0.5, cast=float)
+# 비동기 뷰는 한 워커(이벤트 루프)가 동시에 많은 요청을 처리하므로 별도 연결 수 사용
+GITHUB_ASYNC_POOL_SIZE = config('GITHUB_ASYNC_POOL_SIZE', default=100, cast=int)
+
+# 디렉토리 내용 조회 (동시 요청 수, 파일 내용 총 크기, recursive 조회 시 최대 하위 디렉토리 수)
+GITHUB_CONTENT_FETCH_WORKERS = config('GITHUB_CONTENT_FETCH_WORKERS', default=8, cast=int)
+GITHUB_CONTENT_MAX_BYTES = config('GITHUB_CONTENT_MAX_BYTES', default=10 * 1024 * 1024, cast=int)
+GITHUB_CONTENT_MAX_DIRECTORIES = config('GITHUB_CONTENT_MAX_DIRECTORIES', default=200, cast=int)
+
+# 파일 업로드 (bulk 업로드 시 blob 동시 생성 수, 파일당 최대 크기 — GitHub 제한 100MB)
+GITHUB_UPLOAD_WORKERS = config('GITHUB_UPLOAD_WORKERS', default=8, cast=int)
+GITHUB_UPLOAD_MAX_BYTES = config('GITHUB_UPLOAD_MAX_BYTES', default=100 * 1024 * 1024, cast=int)
+
+# 파일 내용 디스크 캐시 (git blob SHA 기준, 0 이면 사용 안 함), 임계값 이상인 파일은 mmap 으로 읽음
+GITHUB_BLOB_CACHE_DIR = config('GITHUB_BLOB_CACHE_DIR', default=os.path.join(tempfile.gettempdir(), 'cloudy-blobs'))
+GITHUB_BLOB_CACHE_MAX_BYTES = config('GITHUB_BLOB_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+GITHUB_BLOB_MMAP_THRESHOLD = config('GITHUB_BLOB_MMAP_THRESHOLD', default=1024 * 1024, cast=int)
+# 저장소 스캔 시 캐시에 없는 파일이 이보다 많으면 파일별 요청 대신 tarball 한 번으로 받음
+GITHUB_BLOB_FETCH_MAX_MISSES = config('GITHUB_BLOB_FETCH_MAX_MISSES', default=20, cast=int)
+
+# GitHub GET 응답 조건부 요청 캐시 (메모리 → DB 순, TTL/정리 주기 단위: 초)
+GITHUB_ETAG_CACHE_TTL = config('GITHUB_ETAG_CACHE_TTL', default=86400, cast=int)
+GITHUB_ETAG_CACHE_MAX_BYTES = config('GITHUB_ETAG_CACHE_MAX_BYTES', default=32 * 1024 * 1024, cast=int)
+GITHUB_ETAG_CACHE_DB = config('GITHUB_ETAG_CACHE_DB', default=True, cast=bool)
+GITHUB_ETAG_DB_MAX_ROWS = config('GITHUB_ETAG_DB_MAX_ROWS', default=50000, cast=int)
+GITHUB_ETAG_DB_PRUNE_INTERVAL = config('GITHUB_ETAG_DB_PRUNE_INTERVAL', default=60, cast=int)
+
+# 동시에 들어온 같은 GitHub 조회 요청은 호출 한 번으로 처리
+# SINGLE_FLIGHT_DIR 을 지정하면 같은 호스트의 워커 프로세스끼리도 잠금 파일로 공유
+GITHUB_SINGLE_FLIGHT = config('GITHUB_SINGLE_FLIGHT', default=True, cast=bool)
+GITHUB_SINGLE_FLIGHT_DIR = config('GITHUB_SINGLE_FLIGHT_DIR', default='')
+
+# 목록 API 페이지네이션 (최대 페이지 수, 병렬 요청 수)
+GITHUB_LIST_MAX_PAGES = config('GITHUB_LIST_MAX_PAGES', default=50, cast=int)
+GITHUB_PAGE_FETCH_WORKERS = config('GITHUB_PAGE_FETCH_WORKERS', default=4, cast=int)
+
+# 토큰별 GitHub 호출 예산 (남은 호출 수 기준, 대기 시간 단위: 초)
+# SLOWDOWN 아래로 내려가면 급하지 않은 호출을 reset 까지 분산, RESERVE 는 사용자 요청 몫으로 남김
+GITHUB_RATE_LIMIT_RESERVE = config('GITHUB_RATE_LIMIT_RESERVE', default=100, cast=int)
+GITHUB_RATE_LIMIT_SLOWDOWN = config('GITHUB_RATE_LIMIT_SLOWDOWN', default=1000, cast=int)
+GITHUB_RATE_LIMIT_MAX_WAIT = config('GITHUB_RATE_LIMIT_MAX_WAIT', default=300, cast=float)
+GITHUB_RATE_LIMIT_URGENT_MAX_WAIT = config('GITHUB_RATE_LIMIT_URGENT_MAX_WAIT', default=5, cast=float)
+GITHUB_RATE_LIMIT_MAX_TOKENS = config('GITHUB_RATE_LIMIT_MAX_TOKENS', default=10000, cast=int)
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -176,4 +238,36 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
-}
\ No newline at end of file
+}
+
+# tfsec 스캔 결과 캐시 (TTL/정리 주기 단위: 초)
+TFSEC_CACHE_SIZE = config('TFSEC_CACHE_SIZE', default=256, cast=int)
+TFSEC_CACHE_TTL = config('TFSEC_CACHE_TTL', default=3600, cast=int)
+TFSEC_DB_CACHE_MAX_ROWS = config('TFSEC_DB_CACHE_MAX_ROWS', default=10000, cast=int)
+TFSEC_DB_CACHE_PRUNE_INTERVAL = config('TFSEC_DB_CACHE_PRUNE_INTERVAL', default=60, cast=int)
+TFSEC_AST_CACHE_SIZE = config('TFSEC_AST_CACHE_SIZE', default=512, cast=int)  # fast 모드 HCL 파싱 결과
+
+# 비동기 tfsec 스캔 워커 수
+TFSEC_JOB_WORKERS = config('TFSEC_JOB_WORKERS', default=4, cast=int)
+# 이 시간(초)이 지나도 끝나지 않은 pending/running 작업은 조회 시 실패로 처리 (워커 재시작 등으로 유실된 작업)
+# TFSEC_QUEUE_TIMEOUT + TFSEC_TIMEOUT 보다 길어야 함, 0 이면 사용 안 함
+TFSEC_JOB_STALE_AFTER = config('TFSEC_JOB_STALE_AFTER', default=600, cast=int)
+
+# tfsec 동시 실행 제한 (TFSEC_MAX_CONCURRENT 0 이면 제한 없음, 시간 단위: 초)
+TFSEC_MAX_CONCURRENT = config('TFSEC_MAX_CONCURRENT', default=os.cpu_count() or 2, cast=int)
+TFSEC_MAX_QUEUE = config('TFSEC_MAX_QUEUE', default=16, cast=int)
+TFSEC_QUEUE_TIMEOUT = config('TFSEC_QUEUE_TIMEOUT', default=30, cast=float)
+TFSEC_TIMEOUT = config('TFSEC_TIMEOUT', default=60, cast=int)
+TFSEC_CPU_LIMIT = config('TFSEC_CPU_LIMIT', default=60, cast=int)
+TFSEC_MEMORY_LIMIT_MB = config('TFSEC_MEMORY_LIMIT_MB', default=2048, cast=int)
+
+# 배치 스캔 최대 코드 조각 수
+TFSEC_BATCH_MAX_SNIPPETS = config('TFSEC_BATCH_MAX_SNIPPETS', default=100, cast=int)
+
+# 모듈/압축 파일 업로드 스캔 제한
+TFSEC_UPLOAD_MAX_BYTES = config('TFSEC_UPLOAD_MAX_BYTES', default=20 * 1024 * 1024, cast=int)
+TFSEC_UPLOAD_MAX_FILES = config('TFSEC_UPLOAD_MAX_FILES', default=500, cast=int)
+TFSEC_REPO_ARCHIVE_MAX_BYTES = config('TFSEC_REPO_ARCHIVE_MAX_BYTES', default=200 * 1024 * 1024, cast=int)
+
+# tfsec 실행 전 내장 HCL 파서로 문법 검사 (오류가 있으면 tfsec 를 실행하지 않고 400)
+TFSEC_SYNTAX_PRECHECK = config('TFSEC_SYNTAX_PRECHECK', default=True, cast=bool)
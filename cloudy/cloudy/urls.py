@@ -1,11 +1,31 @@
 from django.contrib import admin
 from django.urls import path
 from login.views import GitHubLogin, GitHubOAuthURLView, Logout, ProfileView
-from github.views.repo import GitHubRepoList, GitHubCreateRepo, GitHubRepoFileContentsView
+from github.views.repo import GitHubRepoList, GitHubCreateRepo, GitHubRepoFileContentsView, GitHubRepoTreeView
 from github.views.upload import GitHubUploadFiles
 from github.views.secrets import GitHubUploadSecrets
 from github.views.github_actions import GitHubActionsStatus
-from tfsec.views import CheckTerraformSecurityView
+from github.views.async_proxy import (
+    AsyncGitHubRepoList,
+    AsyncGitHubRepoFileContentsView,
+    AsyncGitHubActionsStatus,
+    AsyncGitHubUploadFiles,
+)
+from tfsec.views import (
+    CheckTerraformSecurityView,
+    CheckTerraformSecurityBatchView,
+    CheckTerraformModuleView,
+    CheckRepoSecurityView,
+    CheckTerraformSecurityStreamView,
+    RepoFindingsView,
+    ScanListView,
+    FindingListView,
+    ScanDiffView,
+    GitHubPushWebhookView,
+    ScanJobCreateView,
+    ScanJobDetailView,
+    ScanSchedulerStatsView,
+)
 from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
@@ -18,8 +38,26 @@ urlpatterns = [
     path('github/repos/', GitHubRepoList.as_view()),
     path('github/create-repo/', GitHubCreateRepo.as_view()),
     path('github/repo-files/', GitHubRepoFileContentsView.as_view()),
+    path('github/repo-tree/', GitHubRepoTreeView.as_view()),
     path('github/upload-files/', GitHubUploadFiles.as_view()),
     path('github/secrets/', GitHubUploadSecrets.as_view()),
     path('github/actions-status/', GitHubActionsStatus.as_view()),
+    # 비동기 버전 (ASGI 서버(uvicorn)로 실행할 때 이벤트 루프에서 동시에 처리, WSGI 에서도 동작)
+    path('github/async/repos/', AsyncGitHubRepoList.as_view()),
+    path('github/async/repo-files/', AsyncGitHubRepoFileContentsView.as_view()),
+    path('github/async/upload-files/', AsyncGitHubUploadFiles.as_view()),
+    path('github/async/actions-status/', AsyncGitHubActionsStatus.as_view()),
     path('check_security/', CheckTerraformSecurityView.as_view()),
+    path('check_security/batch/', CheckTerraformSecurityBatchView.as_view()),
+    path('check_security/upload/', CheckTerraformModuleView.as_view()),
+    path('check_security/stream/', CheckTerraformSecurityStreamView.as_view()),
+    path('check_security/repo/', CheckRepoSecurityView.as_view()),
+    path('check_security/repo/findings/', RepoFindingsView.as_view()),
+    path('check_security/scans/', ScanListView.as_view()),
+    path('check_security/scans/diff/', ScanDiffView.as_view()),
+    path('check_security/findings/', FindingListView.as_view()),
+    path('check_security/webhook/', GitHubPushWebhookView.as_view()),
+    path('check_security/jobs/', ScanJobCreateView.as_view()),
+    path('check_security/jobs/<uuid:job_id>/', ScanJobDetailView.as_view()),
+    path('check_security/scheduler/', ScanSchedulerStatsView.as_view()),
 ]
\ No newline at end of file
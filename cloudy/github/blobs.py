@@ -0,0 +1,135 @@
+import os
+import mmap
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+def git_blob_sha(data: bytes) -> str:
+    # git hash-object 와 같은 값: sha1("blob <크기>\0" + 내용)
+    return git_blob_sha_chunks(len(data), [data])
+
+
+def git_blob_sha_chunks(size: int, chunks) -> str:
+    # 내용을 청크로 읽으면서 계산 (큰 파일을 메모리에 올리지 않음)
+    digest = hashlib.sha1(f'blob {size}\0'.encode())
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BlobCache:
+    """git blob SHA 로 주소를 정하는 디스크 캐시 (내용이 바뀌지 않으므로 무효화 없음)
+
+    총 크기가 max_bytes 를 넘으면 마지막 사용 시각(mtime)이 오래된 것부터 삭제
+    """
+
+    def __init__(self, root, max_bytes, mmap_threshold):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.total_bytes = None
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path(self, sha):
+        return os.path.join(self.root, sha[:2], sha[2:])
+
+    def touch(self, path):
+        # 캐시 적중 시 mtime 갱신 (LRU 순서)
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def __contains__(self, sha):
+        return self.enabled and os.path.exists(self.path(sha))
+
+    @contextmanager
+    def open(self, sha):
+        """캐시된 내용을 bytes 또는 mmap 으로 제공 (없으면 None), 큰 파일은 메모리에 복사하지 않음"""
+        path = self.path(sha)
+        if not self.enabled or not self.touch(path):
+            yield None
+            return
+
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < self.mmap_threshold or size == 0:
+                yield f.read()
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def read_text(self, sha):
+        with self.open(sha) as data:
+            if data is None:
+                return None
+            return str(data, 'utf-8', 'replace')
+
+    def put(self, sha, data: bytes):
+        """내용의 SHA 가 맞을 때만 저장 (다른 내용이 같은 키로 들어가지 않도록)"""
+        if not self.enabled or len(data) > self.max_bytes or git_blob_sha(data) != sha:
+            return False
+
+        path = self.path(sha)
+        if self.touch(path):
+            return True
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓴 뒤 rename: 동시에 읽는 쪽이 쓰다 만 파일을 보지 않음
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = self.disk_usage()
+            else:
+                self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        return True
+
+    def entries(self):
+        # (경로, 크기, mtime) — 다른 워커가 동시에 지운 파일은 건너뜀
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def disk_usage(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # 여유를 두고 max_bytes 의 90% 까지 줄임 (매 저장마다 정리하지 않도록)
+        target = self.max_bytes * 0.9
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+        self.total_bytes = total
+
+
+blob_cache = BlobCache(settings.GITHUB_BLOB_CACHE_DIR, settings.GITHUB_BLOB_CACHE_MAX_BYTES, settings.GITHUB_BLOB_MMAP_THRESHOLD)
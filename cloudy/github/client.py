@@ -0,0 +1,199 @@
+import time
+import random
+import asyncio
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+from github.ratelimit import rate_limits, header_int, GitHubRateLimited
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# POST(저장소 생성, OAuth 토큰 교환)는 중복 실행될 수 있으므로 연결 실패만 재시도
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+
+
+def build_headers(access_token=None, headers=None):
+    request_headers = {"Accept": "application/vnd.github+json"}
+    if access_token:
+        request_headers["Authorization"] = f"token {access_token}"
+    request_headers.update(headers or {})
+    return request_headers
+
+
+def api_url(path):
+    # '/' 로 시작하면 GITHUB_API_URL 기준 경로, 그 외에는 전체 URL (download_url 등)
+    if path.startswith('/'):
+        return f"{settings.GITHUB_API_URL}{path}"
+    return path
+
+
+def rate_limited(response):
+    """secondary rate limit / 429 응답의 Retry-After (초), 해당하지 않으면 None"""
+    if response.status_code not in (403, 429):
+        return None
+    return header_int(response.headers, 'Retry-After')
+
+
+class GitHubRetry(Retry):
+    # Retry-After 가 붙은 403/429 는 여기서 재시도하지 않고 rate_limits 로 처리 (대기 시간 상한 적용)
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code in (403, 429) and has_retry_after:
+            return False
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class GitHubClient:
+    """GitHub API 공용 클라이언트 (keep-alive 연결 풀, 기본 timeout, 5xx/rate limit 재시도)
+
+    path 가 '/' 로 시작하면 settings.GITHUB_API_URL 기준, 그 외에는 전체 URL 로 요청
+    urgent=False 인 호출은 토큰의 남은 호출 수가 적으면 rate_limits 에 따라 늦춰짐
+    """
+
+    def __init__(self, pool_size=None, max_retries=None, backoff=None):
+        self.pool_size = pool_size or settings.GITHUB_HTTP_POOL_SIZE
+        self.max_retries = settings.GITHUB_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.GITHUB_HTTP_RETRY_BACKOFF if backoff is None else backoff
+        self.session = self.build_session()
+
+    def build_session(self):
+        retry = GitHubRetry(
+            total=self.max_retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    @property
+    def timeout(self):
+        return (settings.GITHUB_HTTP_CONNECT_TIMEOUT, settings.GITHUB_HTTP_READ_TIMEOUT)
+
+    def request(self, method, path, access_token=None, headers=None, urgent=True, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            # Retry-After 가 허용 대기 시간을 넘으면 여기서 GitHubRateLimited
+            wait = rate_limits.wait_time(access_token, urgent)
+            if wait:
+                time.sleep(wait)
+
+            response = self.session.request(method, api_url(path), headers=build_headers(access_token, headers), **kwargs)
+            rate_limits.update(access_token, response)
+            retry_after = rate_limited(response)
+            if retry_after is None:
+                return response
+            if not access_token or method not in RETRY_METHODS or attempt >= self.max_retries:
+                raise GitHubRateLimited(retry_after)
+
+            response.close()
+            attempt += 1
+
+    def get(self, path, access_token=None, **kwargs):
+        return self.request('GET', path, access_token, **kwargs)
+
+    def post(self, path, access_token=None, **kwargs):
+        return self.request('POST', path, access_token, **kwargs)
+
+    def put(self, path, access_token=None, **kwargs):
+        return self.request('PUT', path, access_token, **kwargs)
+
+    def patch(self, path, access_token=None, **kwargs):
+        return self.request('PATCH', path, access_token, **kwargs)
+
+
+class AsyncGitHubClient:
+    """ASGI 뷰용 비동기 클라이언트 (httpx), 재시도 정책은 GitHubClient 와 같음
+
+    httpx.AsyncClient 는 이벤트 루프에 묶이므로 루프마다 연결 풀을 하나씩 둠
+    """
+
+    def __init__(self, pool_size=None, max_retries=None, backoff=None):
+        self.pool_size = pool_size or settings.GITHUB_ASYNC_POOL_SIZE
+        self.max_retries = settings.GITHUB_HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff = settings.GITHUB_HTTP_RETRY_BACKOFF if backoff is None else backoff
+        self.clients = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self.clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.GITHUB_HTTP_READ_TIMEOUT, connect=settings.GITHUB_HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                # 연결 실패는 transport 에서 재시도
+                transport=httpx.AsyncHTTPTransport(retries=self.max_retries),
+                follow_redirects=True,
+            )
+            self.clients[loop] = client
+        return client
+
+    def retry_delay(self, response, attempt):
+        # 재시도 대상이 아니면 None (Retry-After 는 사용자 요청 허용 대기 시간까지만 따름)
+        if response.status_code not in RETRY_STATUSES:
+            return None
+        retry_after = header_int(response.headers, 'Retry-After')
+        if retry_after is not None:
+            return min(float(retry_after), settings.GITHUB_RATE_LIMIT_URGENT_MAX_WAIT)
+        return self.backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def request(self, method, path, access_token=None, headers=None, urgent=True, **kwargs):
+        url = api_url(path)
+        request_headers = build_headers(access_token, headers)
+
+        attempt = 0
+        while True:
+            wait = rate_limits.wait_time(access_token, urgent)
+            if wait:
+                await asyncio.sleep(wait)
+
+            response = await self.client.request(method, url, headers=request_headers, **kwargs)
+            rate_limits.update(access_token, response)
+            retry_after = rate_limited(response)
+            if retry_after is not None:
+                # 다음 시도 전 wait_time 에서 기다리거나 GitHubRateLimited
+                await response.aclose()
+                if not access_token or method not in RETRY_METHODS or attempt >= self.max_retries:
+                    raise GitHubRateLimited(retry_after)
+                attempt += 1
+                continue
+
+            if method not in RETRY_METHODS or attempt >= self.max_retries:
+                return response
+
+            delay = self.retry_delay(response, attempt)
+            if delay is None:
+                return response
+
+            await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path, access_token=None, **kwargs):
+        return await self.request('GET', path, access_token, **kwargs)
+
+    async def post(self, path, access_token=None, **kwargs):
+        return await self.request('POST', path, access_token, **kwargs)
+
+    async def put(self, path, access_token=None, **kwargs):
+        return await self.request('PUT', path, access_token, **kwargs)
+
+    async def patch(self, path, access_token=None, **kwargs):
+        return await self.request('PATCH', path, access_token, **kwargs)
+
+
+# 프로세스 전체에서 공유 (연결 재사용)
+github = GitHubClient()
+async_github = AsyncGitHubClient()
@@ -0,0 +1,249 @@
+import time
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, connections
+from django.utils import timezone
+from requests.structures import CaseInsensitiveDict
+
+from github.client import github, async_github, api_url
+from github.models import ConditionalResponseCache
+from github.singleflight import single_flight
+
+# 캐시된 응답을 재구성할 때 필요한 헤더만 저장
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+# 다른 프로세스와 결과를 공유할 때 전달하는 헤더
+SHARED_HEADERS = CACHED_HEADERS + ('X-GitHub-Cache',)
+
+# 마지막 DB 캐시 정리 시각 (프로세스 단위)
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+class SizedLRUCache:
+    """전체 크기(max_bytes)와 TTL(초)로 제한되는 스레드 안전 LRU"""
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            stored_at, size, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._pop(key)
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, size):
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (time.monotonic(), size, value)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.total_bytes = 0
+
+
+memory_cache = SizedLRUCache(settings.GITHUB_ETAG_CACHE_MAX_BYTES, settings.GITHUB_ETAG_CACHE_TTL)
+
+
+def closing_connections(fn):
+    # 스레드 풀 작업이 캐시 DB 를 사용한 뒤 해당 스레드의 DB 연결 정리
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            connections.close_all()
+    return wrapper
+
+
+def make_cache_key(access_token, url, params=None, accept=None) -> str:
+    # 같은 URL 이라도 토큰(사용자)마다 응답이 다르므로 토큰 해시를 키에 포함 (토큰 자체는 저장하지 않음)
+    digest = hashlib.sha256()
+    for part in (access_token or '', url, repr(sorted((params or {}).items())), accept or ''):
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_entry(key):
+    entry = memory_cache.get(key)
+    if entry is not None:
+        return entry
+
+    if not settings.GITHUB_ETAG_CACHE_DB:
+        return None
+
+    expires_before = timezone.now() - timedelta(seconds=settings.GITHUB_ETAG_CACHE_TTL)
+    row = ConditionalResponseCache.objects.filter(key=key, last_hit_at__gte=expires_before).first()
+    if row is None:
+        return None
+
+    ConditionalResponseCache.objects.filter(pk=row.pk).update(last_hit_at=timezone.now())
+    entry = {'etag': row.etag, 'last_modified': row.last_modified, 'headers': row.headers, 'body': row.body}
+    memory_cache.set(key, entry, len(row.body))
+    return entry
+
+
+def save_entry(key, res):
+    entry = {
+        'etag': res.headers.get('ETag', ''),
+        'last_modified': res.headers.get('Last-Modified', ''),
+        'headers': {name: res.headers[name] for name in CACHED_HEADERS if name in res.headers},
+        'body': res.text,
+    }
+    memory_cache.set(key, entry, len(entry['body']))
+
+    if not settings.GITHUB_ETAG_CACHE_DB:
+        return
+
+    try:
+        ConditionalResponseCache.objects.update_or_create(
+            key=key,
+            defaults={**entry, 'last_hit_at': timezone.now()}
+        )
+    except IntegrityError:
+        # 다른 워커가 같은 키를 먼저 저장한 경우
+        return
+    if prune_due():
+        prune_db_cache()
+
+
+def prune_due():
+    # 정리 쿼리는 저장마다가 아니라 GITHUB_ETAG_DB_PRUNE_INTERVAL 초에 한 번만
+    global _last_prune
+    now = time.time()
+    with _prune_lock:
+        if now - _last_prune < settings.GITHUB_ETAG_DB_PRUNE_INTERVAL:
+            return False
+        _last_prune = now
+        return True
+
+
+def prune_db_cache():
+    expires_before = timezone.now() - timedelta(seconds=settings.GITHUB_ETAG_CACHE_TTL)
+    ConditionalResponseCache.objects.filter(last_hit_at__lt=expires_before).delete()
+
+    stale_ids = list(
+        ConditionalResponseCache.objects.order_by('-last_hit_at')
+        .values_list('id', flat=True)[settings.GITHUB_ETAG_DB_MAX_ROWS:]
+    )
+    if stale_ids:
+        ConditionalResponseCache.objects.filter(id__in=stale_ids).delete()
+
+
+def conditional_headers(entry, headers=None):
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry['etag']:
+            request_headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            request_headers['If-Modified-Since'] = entry['last_modified']
+    return request_headers
+
+
+def cached_headers(entry):
+    return {**entry['headers'], 'X-GitHub-Cache': 'revalidated'}
+
+
+def build_response(status_code, headers, body, url):
+    res = requests.Response()
+    res.status_code = status_code
+    res.url = url
+    res.headers = CaseInsensitiveDict(headers)
+    res.encoding = 'utf-8'
+    res._content = body
+    return res
+
+
+def response_from(entry, url):
+    # 304 → 캐시된 본문으로 200 응답 재구성 (뷰 코드는 그대로 사용)
+    return build_response(200, cached_headers(entry), entry['body'].encode('utf-8'), url)
+
+
+def response_record(res):
+    # requests/httpx 응답 → 프로세스 간 공유용 (status_code, headers, body)
+    return res.status_code, {name: res.headers[name] for name in SHARED_HEADERS if name in res.headers}, res.content
+
+
+def cacheable(res):
+    return res.status_code == 200 and ('ETag' in res.headers or 'Last-Modified' in res.headers)
+
+
+def cached_get(path, access_token=None, params=None, headers=None, **kwargs):
+    """ETag/Last-Modified 조건부 GET — 304 는 GitHub rate limit 에 포함되지 않음
+
+    같은 토큰/URL/파라미터의 요청이 동시에 들어오면 GitHub 호출 한 번의 결과를 공유
+    """
+    url = api_url(path)
+    key = make_cache_key(access_token, url, params, (headers or {}).get('Accept'))
+    return single_flight.do(
+        key,
+        lambda: conditional_get(key, url, path, access_token, params, headers, **kwargs),
+        encode=response_record,
+        decode=lambda record: build_response(*record, url)
+    )
+
+
+def conditional_get(key, url, path, access_token, params, headers, **kwargs):
+    entry = load_entry(key)
+
+    res = github.get(path, access_token, params=params, headers=conditional_headers(entry, headers), **kwargs)
+    if res.status_code == 304 and entry is not None:
+        return response_from(entry, url)
+    if cacheable(res):
+        save_entry(key, res)
+    return res
+
+
+async def async_cached_get(path, access_token=None, params=None, headers=None, **kwargs):
+    """cached_get 의 비동기 버전 (httpx 응답, 304 는 캐시된 본문으로 재구성)"""
+    url = api_url(path)
+    key = make_cache_key(access_token, url, params, (headers or {}).get('Accept'))
+    return await single_flight.async_do(
+        key,
+        lambda: async_conditional_get(key, path, access_token, params, headers, **kwargs),
+        encode=response_record,
+        decode=lambda record: httpx.Response(record[0], headers=record[1], content=record[2])
+    )
+
+
+async def async_conditional_get(key, path, access_token, params, headers, **kwargs):
+    entry = await sync_to_async(load_entry)(key)
+
+    res = await async_github.get(path, access_token, params=params, headers=conditional_headers(entry, headers), **kwargs)
+    if res.status_code == 304 and entry is not None:
+        return httpx.Response(200, headers=cached_headers(entry), content=entry['body'].encode('utf-8'), request=res.request)
+    if cacheable(res):
+        await sync_to_async(save_entry)(key, res)
+    return res
@@ -0,0 +1,261 @@
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from github.blobs import blob_cache
+from github.client import github, async_github
+from github.conditional import cached_get, async_cached_get, closing_connections
+
+CONTENTS_ACCEPT = {"Accept": "application/vnd.github.v3+json"}
+RAW_ACCEPT = {"Accept": "application/vnd.github.raw"}
+SHA_ACCEPT = {"Accept": "application/vnd.github.sha"}
+TREE_TYPES = {"blob": "file", "tree": "dir", "commit": "submodule"}
+
+
+class GitHubContentsError(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(f'GitHub contents request failed ({status_code})')
+        self.status_code = status_code
+        self.detail = detail
+
+
+def parse_bool(value, default=False):
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def parse_max_bytes(value):
+    # 파일 내용 총 크기 제한 (정수가 아니거나 음수면 ValueError, 설정값을 넘지 않음)
+    max_bytes = int(value)
+    if max_bytes < 0:
+        raise ValueError(f'negative max_bytes: {max_bytes}')
+    return min(max_bytes, settings.GITHUB_CONTENT_MAX_BYTES)
+
+
+def contents_url(owner, repo_name, path):
+    return f"/repos/{owner}/{repo_name}/contents/{path}"
+
+
+def listing_from(res):
+    if res.status_code != 200:
+        try:
+            detail = res.json()
+        except ValueError:
+            detail = res.text
+        raise GitHubContentsError(res.status_code, detail)
+    return res.json()
+
+
+def flatten(entries, children):
+    # 디렉토리 항목 바로 뒤에 하위 항목을 이어 붙임 (GitHub 목록 순서 유지)
+    flat = []
+    for entry in entries:
+        flat.append(entry)
+        if entry["type"] == "dir" and entry["path"] in children:
+            flat.extend(flatten(children[entry["path"]], children))
+    return flat
+
+
+def decode_content(data):
+    return str(data, 'utf-8', 'replace')
+
+
+def cached_content(entry):
+    # blob SHA 가 같으면 내용도 같으므로 GitHub 요청 없이 캐시 사용
+    return blob_cache.read_text(entry["sha"]) if entry.get("sha") else None
+
+
+def store_content(entry, res):
+    if res.status_code != 200:
+        return None
+    if entry.get("sha"):
+        blob_cache.put(entry["sha"], res.content)
+    return decode_content(res.content)
+
+
+# blob 캐시는 디스크를 읽고 쓰므로 (저장 시 정리 포함) 비동기 뷰에서는 스레드에서 실행
+async def async_cached_content(entry):
+    return await asyncio.to_thread(cached_content, entry)
+
+
+async def async_store_content(entry, res):
+    return await asyncio.to_thread(store_content, entry, res)
+
+
+def download_file(entry):
+    content = cached_content(entry)
+    if content is None:
+        content = store_content(entry, github.get(entry["download_url"]))
+    return content
+
+
+def has_download_url(entry):
+    return entry["type"] == "file" and bool(entry.get("download_url"))
+
+
+def plan_downloads(entries, max_bytes, downloadable=has_download_url):
+    """내려받을 파일 인덱스와 크기 제한 초과 여부 (목록의 size 기준, 앞에서부터 채움)"""
+    selected = []
+    total = 0
+    truncated = False
+    for index, entry in enumerate(entries):
+        if not downloadable(entry):
+            continue
+        size = entry.get("size") or 0
+        if total + size > max_bytes:
+            truncated = True
+            continue
+        total += size
+        selected.append(index)
+    return selected, truncated
+
+
+def file_entries(entries, contents):
+    return [{
+        "name": entry["name"],
+        "path": entry["path"],
+        "content": contents.get(index)
+    } for index, entry in enumerate(entries)]
+
+
+def fetch_directory(access_token, owner, repo_name, branch, entries, recursive=False, with_content=True, max_bytes=None):
+    """디렉토리 목록 → (파일 목록, 크기 제한으로 잘렸는지) — 하위 목록/파일 내용은 병렬로 요청"""
+    max_bytes = settings.GITHUB_CONTENT_MAX_BYTES if max_bytes is None else max_bytes
+    truncated = False
+
+    @closing_connections
+    def fetch_listing(path):
+        return listing_from(cached_get(contents_url(owner, repo_name, path), access_token, params={"ref": branch}, headers=CONTENTS_ACCEPT))
+
+    with ThreadPoolExecutor(max_workers=settings.GITHUB_CONTENT_FETCH_WORKERS) as executor:
+        if recursive:
+            # 깊이 단위로 하위 디렉토리 목록을 한꺼번에 요청
+            children = {}
+            pending = [entry["path"] for entry in entries if entry["type"] == "dir"]
+            while pending:
+                budget = settings.GITHUB_CONTENT_MAX_DIRECTORIES - len(children)
+                if len(pending) > budget:
+                    pending, truncated = pending[:budget], True
+                for path, listing in zip(pending, executor.map(fetch_listing, pending)):
+                    children[path] = listing
+                pending = [entry["path"] for path in pending for entry in children[path] if entry["type"] == "dir"]
+            entries = flatten(entries, children)
+
+        contents = {}
+        if with_content:
+            selected, over_size = plan_downloads(entries, max_bytes)
+            truncated = truncated or over_size
+            contents = dict(zip(selected, executor.map(download_file, [entries[index] for index in selected])))
+
+    return file_entries(entries, contents), truncated
+
+
+async def async_fetch_directory(access_token, owner, repo_name, branch, entries, recursive=False, with_content=True, max_bytes=None):
+    """fetch_directory 의 비동기 버전 (동시 요청 수는 세마포어로 제한)"""
+    max_bytes = settings.GITHUB_CONTENT_MAX_BYTES if max_bytes is None else max_bytes
+    semaphore = asyncio.Semaphore(settings.GITHUB_CONTENT_FETCH_WORKERS)
+    truncated = False
+
+    async def fetch_listing(path):
+        async with semaphore:
+            res = await async_cached_get(contents_url(owner, repo_name, path), access_token, params={"ref": branch}, headers=CONTENTS_ACCEPT)
+        return listing_from(res)
+
+    async def download(entry):
+        content = await async_cached_content(entry)
+        if content is not None:
+            return content
+        async with semaphore:
+            file_res = await async_github.get(entry["download_url"])
+        return await async_store_content(entry, file_res)
+
+    if recursive:
+        children = {}
+        pending = [entry["path"] for entry in entries if entry["type"] == "dir"]
+        while pending:
+            budget = settings.GITHUB_CONTENT_MAX_DIRECTORIES - len(children)
+            if len(pending) > budget:
+                pending, truncated = pending[:budget], True
+            listings = await asyncio.gather(*[fetch_listing(path) for path in pending])
+            children.update(zip(pending, listings))
+            pending = [entry["path"] for path in pending for entry in children[path] if entry["type"] == "dir"]
+        entries = flatten(entries, children)
+
+    contents = {}
+    if with_content:
+        selected, over_size = plan_downloads(entries, max_bytes)
+        truncated = truncated or over_size
+        downloaded = await asyncio.gather(*[download(entries[index]) for index in selected])
+        contents = dict(zip(selected, downloaded))
+
+    return file_entries(entries, contents), truncated
+
+
+def glob_to_regex(pattern):
+    # '**' 는 디렉토리 경계를 넘어 매칭, '*' 와 '?' 는 한 경로 구성요소 안에서만 매칭
+    regex = ''
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith('**/', index):
+            regex += '(?:.*/)?'
+            index += 3
+        elif pattern.startswith('**', index):
+            regex += '.*'
+            index += 2
+        elif pattern[index] == '*':
+            regex += '[^/]*'
+            index += 1
+        elif pattern[index] == '?':
+            regex += '[^/]'
+            index += 1
+        else:
+            regex += re.escape(pattern[index])
+            index += 1
+    return re.compile(f'{regex}\\Z')
+
+
+def path_filter(patterns):
+    compiled = [glob_to_regex(pattern) for pattern in patterns]
+    if not compiled:
+        return lambda path: True
+    return lambda path: any(regex.match(path) for regex in compiled)
+
+
+def resolve_commit(access_token, owner, repo_name, branch):
+    # 브랜치 → 커밋 SHA (이후 내용 조회도 같은 커밋 기준으로 고정)
+    res = cached_get(f"/repos/{owner}/{repo_name}/commits/{branch}", access_token, headers=SHA_ACCEPT)
+    if res.status_code != 200:
+        listing_from(res)
+    return res.text.strip()
+
+
+def fetch_tree(access_token, owner, repo_name, commit_sha):
+    """재귀 트리 한 번 요청 → ([{path, sha, size, type}], GitHub 가 목록을 잘랐는지)"""
+    tree = listing_from(github.get(f"/repos/{owner}/{repo_name}/git/trees/{commit_sha}", access_token, params={"recursive": 1}))
+    entries = [{
+        "path": entry["path"],
+        "sha": entry["sha"],
+        "size": entry.get("size"),
+        "type": TREE_TYPES.get(entry["type"], entry["type"]),
+    } for entry in tree.get("tree", [])]
+    return entries, bool(tree.get("truncated"))
+
+
+def fetch_tree_contents(access_token, owner, repo_name, ref, entries, max_bytes=None):
+    """트리 항목 중 파일 내용만 병렬 요청 → ({경로: 내용}, 크기 제한으로 잘렸는지)"""
+    max_bytes = settings.GITHUB_CONTENT_MAX_BYTES if max_bytes is None else max_bytes
+
+    def download(entry):
+        content = cached_content(entry)
+        if content is None:
+            res = github.get(contents_url(owner, repo_name, entry["path"]), access_token, params={"ref": ref}, headers=RAW_ACCEPT)
+            content = store_content(entry, res)
+        return content
+
+    selected, truncated = plan_downloads(entries, max_bytes, downloadable=lambda entry: entry["type"] == "file")
+    with ThreadPoolExecutor(max_workers=settings.GITHUB_CONTENT_FETCH_WORKERS) as executor:
+        contents = executor.map(download, [entries[index] for index in selected])
+        return dict(zip([entries[index]["path"] for index in selected], contents)), truncated
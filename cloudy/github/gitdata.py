@@ -0,0 +1,149 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from github.client import github, async_github
+from github.conditional import cached_get, async_cached_get
+from github.uploads import Base64JSONBody, AsyncBody
+
+FILE_MODE = "100644"
+# 커밋 도중 브랜치가 움직이면 새 HEAD 기준으로 트리/커밋을 다시 만듦
+REF_UPDATE_ATTEMPTS = 3
+
+
+class GitDataError(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(f'GitHub git data request failed ({status_code})')
+        self.status_code = status_code
+        self.detail = detail
+
+
+def response_data(res, expected=(200, 201)):
+    if res.status_code not in expected:
+        try:
+            detail = res.json()
+        except ValueError:
+            detail = res.text
+        raise GitDataError(res.status_code, detail)
+    return res.json()
+
+
+def existing_from(tree, paths):
+    # 트리 목록 중 업로드할 경로의 blob SHA 만 (잘린 목록이면 빠진 경로는 개별 조회)
+    wanted = set(paths)
+    existing = {entry["path"]: entry["sha"] for entry in tree.get("tree", []) if entry["type"] == "blob" and entry["path"] in wanted}
+    missing = [path for path in paths if path not in existing] if tree.get("truncated") else []
+    return existing, missing
+
+
+def existing_blobs(access_token, owner, repo, head_sha, paths):
+    """브랜치 HEAD 트리를 한 번에 받아 {경로: blob SHA} (없는 파일은 포함하지 않음)"""
+    tree = response_data(cached_get(f"/repos/{owner}/{repo}/git/trees/{head_sha}", access_token, params={"recursive": 1}))
+    existing, missing = existing_from(tree, paths)
+    for path in missing:
+        res = github.get(f"/repos/{owner}/{repo}/contents/{path}", access_token, params={"ref": head_sha})
+        if res.status_code != 404:
+            existing[path] = response_data(res)["sha"]
+    return existing
+
+
+async def async_existing_blobs(access_token, owner, repo, head_sha, paths):
+    tree = response_data(await async_cached_get(f"/repos/{owner}/{repo}/git/trees/{head_sha}", access_token, params={"recursive": 1}))
+    existing, missing = existing_from(tree, paths)
+    for path in missing:
+        res = await async_github.get(f"/repos/{owner}/{repo}/contents/{path}", access_token, params={"ref": head_sha})
+        if res.status_code != 404:
+            existing[path] = response_data(res)["sha"]
+    return existing
+
+
+def plan_upload(sources, existing):
+    """로컬에서 계산한 blob SHA 가 브랜치와 같은 파일은 제외 → (올릴 파일, {created, updated, skipped})"""
+    changed = []
+    report = {"created": [], "updated": [], "skipped": []}
+    for source in sources:
+        sha = existing.get(source.path)
+        if sha is None:
+            report["created"].append(source.path)
+        elif sha == source.sha:
+            report["skipped"].append(source.path)
+            continue
+        else:
+            report["updated"].append(source.path)
+        changed.append(source)
+    return changed, report
+
+
+def blob_body(source):
+    # 내용은 base64 로 청크 단위 인코딩하며 전송
+    return Base64JSONBody({"encoding": "base64"}, source)
+
+
+def tree_payload(base_tree, sources, blob_shas):
+    return {
+        "base_tree": base_tree,
+        "tree": [
+            {"path": source.path, "mode": FILE_MODE, "type": "blob", "sha": sha}
+            for source, sha in zip(sources, blob_shas)
+        ]
+    }
+
+
+def commit_files(access_token, owner, repo, branch, head_sha, message, sources):
+    """파일들을 blob 으로 병렬 생성 → 트리 하나, 커밋 하나 → 브랜치 fast-forward (새 커밋 SHA 반환)"""
+    base = f"/repos/{owner}/{repo}/git"
+
+    def create_blob(source):
+        body = blob_body(source)
+        return response_data(github.post(f"{base}/blobs", access_token, data=body, headers=body.headers))["sha"]
+
+    with ThreadPoolExecutor(max_workers=settings.GITHUB_UPLOAD_WORKERS) as executor:
+        blob_shas = list(executor.map(create_blob, sources))
+
+    for attempt in range(REF_UPDATE_ATTEMPTS):
+        base_tree = response_data(github.get(f"{base}/commits/{head_sha}", access_token))["tree"]["sha"]
+        tree = response_data(github.post(f"{base}/trees", access_token, json=tree_payload(base_tree, sources, blob_shas)))
+        commit = response_data(github.post(f"{base}/commits", access_token, json={
+            "message": message,
+            "tree": tree["sha"],
+            "parents": [head_sha]
+        }))
+
+        # force=False: 그 사이 브랜치가 움직였으면 422 (덮어쓰지 않음)
+        ref_res = github.patch(f"{base}/refs/heads/{branch}", access_token, json={"sha": commit["sha"], "force": False})
+        if ref_res.status_code != 422 or attempt == REF_UPDATE_ATTEMPTS - 1:
+            response_data(ref_res)
+            return commit["sha"]
+
+        head_sha = response_data(github.get(f"{base}/ref/heads/{branch}", access_token))["object"]["sha"]
+
+
+async def async_commit_files(access_token, owner, repo, branch, head_sha, message, sources):
+    """commit_files 의 비동기 버전"""
+    base = f"/repos/{owner}/{repo}/git"
+    semaphore = asyncio.Semaphore(settings.GITHUB_UPLOAD_WORKERS)
+
+    async def create_blob(source):
+        body = blob_body(source)
+        async with semaphore:
+            res = await async_github.post(f"{base}/blobs", access_token, content=AsyncBody(body), headers=body.headers)
+        return response_data(res)["sha"]
+
+    blob_shas = await asyncio.gather(*[create_blob(source) for source in sources])
+
+    for attempt in range(REF_UPDATE_ATTEMPTS):
+        base_tree = response_data(await async_github.get(f"{base}/commits/{head_sha}", access_token))["tree"]["sha"]
+        tree = response_data(await async_github.post(f"{base}/trees", access_token, json=tree_payload(base_tree, sources, blob_shas)))
+        commit = response_data(await async_github.post(f"{base}/commits", access_token, json={
+            "message": message,
+            "tree": tree["sha"],
+            "parents": [head_sha]
+        }))
+
+        ref_res = await async_github.patch(f"{base}/refs/heads/{branch}", access_token, json={"sha": commit["sha"], "force": False})
+        if ref_res.status_code != 422 or attempt == REF_UPDATE_ATTEMPTS - 1:
+            response_data(ref_res)
+            return commit["sha"]
+
+        head_sha = response_data(await async_github.get(f"{base}/ref/heads/{branch}", access_token))["object"]["sha"]
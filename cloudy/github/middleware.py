@@ -0,0 +1,60 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from rest_framework import status
+from login.utils import decrypt_token
+
+from github.ratelimit import rate_limits, GitHubRateLimited
+
+
+class GitHubRateLimitMiddleware:
+    """GitHub 호출 한도 초과 → 429 + Retry-After, 응답마다 토큰의 남은 호출 수 헤더 추가
+
+    동기/비동기 뷰 모두 같은 모드로 실행 (async 뷰가 스레드로 전환되지 않도록)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_budget_headers(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_budget_headers(request, await self.get_response(request))
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, GitHubRateLimited):
+            return None
+        response = JsonResponse({
+            "error": "GitHub rate limit exceeded",
+            "retry_after": exception.retry_after
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        response["Retry-After"] = str(exception.retry_after)
+        return response
+
+    def add_budget_headers(self, request, response):
+        # 뷰에서 인증된 사용자만 사용 (AuthenticationMiddleware 의 lazy user 는 평가하지 않음)
+        user = request.__dict__.get("user")
+        if not issubclass(type(user), get_user_model()) or not user.github_access_token:
+            return response
+
+        try:
+            budget = rate_limits.snapshot(decrypt_token(user.github_access_token))
+        except Exception:
+            return response
+
+        if budget is not None:
+            limit, remaining, reset = budget
+            response["X-GitHub-RateLimit-Remaining"] = str(remaining)
+            if limit is not None:
+                response["X-GitHub-RateLimit-Limit"] = str(limit)
+            if reset:
+                response["X-GitHub-RateLimit-Reset"] = str(reset)
+        return response
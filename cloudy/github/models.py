@@ -1,3 +1,13 @@
 from django.db import models
 
 # Create your models here.
+
+# GitHub GET 응답 캐시 (ETag/Last-Modified 조건부 요청용, 키에 토큰 해시 포함)
+class ConditionalResponseCache(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    etag = models.CharField(max_length=255, blank=True, default='')
+    last_modified = models.CharField(max_length=64, blank=True, default='')
+    headers = models.JSONField(default=dict)
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(db_index=True)
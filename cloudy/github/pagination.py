@@ -0,0 +1,186 @@
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+
+from django.conf import settings
+
+from github.conditional import cached_get, async_cached_get, closing_connections
+from github.ratelimit import GitHubRateLimited
+
+logger = logging.getLogger(__name__)
+
+# GitHubRepoList 응답 필드 (?fields= 로 일부만 선택)
+REPO_FIELDS = {
+    "name": lambda repo: repo["name"],
+    "full_name": lambda repo: repo["full_name"],
+    "html_url": lambda repo: repo["html_url"],
+    "default_branch": lambda repo: repo["default_branch"],
+    "owner": lambda repo: repo["owner"]["login"],
+}
+
+
+class GitHubPageError(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(f'GitHub page request failed ({status_code})')
+        self.status_code = status_code
+        self.detail = detail
+
+
+def parse_fields(value):
+    """'name,owner' → 필드 목록 (알 수 없는 필드가 있으면 None)"""
+    if not value:
+        return list(REPO_FIELDS)
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields or any(field not in REPO_FIELDS for field in fields):
+        return None
+    return fields
+
+
+def project(repo, fields):
+    return {field: REPO_FIELDS[field](repo) for field in fields}
+
+
+def page_links(res):
+    # requests/httpx 응답 모두 Link 헤더를 {rel: {'url': ...}} 로 제공
+    return res.links or {}
+
+
+def last_page(res):
+    last = page_links(res).get("last")
+    if last is None:
+        return None
+    pages = parse_qs(urlparse(last["url"]).query).get("page")
+    return int(pages[0]) if pages and pages[0].isdigit() else None
+
+
+def page_data(res):
+    if res.status_code != 200:
+        try:
+            detail = res.json()
+        except ValueError:
+            detail = res.text
+        raise GitHubPageError(res.status_code, detail)
+    return res.json()
+
+
+def new_listing():
+    # 스트리밍 도중 알게 되는 목록 상태 (목록 뒤에 응답 본문의 필드로 기록)
+    return {"truncated": False}
+
+
+def iter_pages(path, access_token, params, first_res, listing):
+    """첫 페이지 응답 → 페이지별 목록 (last 페이지 번호를 알면 나머지 페이지를 병렬 요청, 순서는 유지)
+
+    GITHUB_LIST_MAX_PAGES 에서 끊으면 listing["truncated"] = True
+    """
+    yield page_data(first_res)
+
+    last = last_page(first_res)
+    max_pages = settings.GITHUB_LIST_MAX_PAGES
+    if last is None:
+        # last 링크가 없으면 next 링크를 따라 순서대로
+        res, page = first_res, 1
+        while "next" in page_links(res) and page < max_pages:
+            res = cached_get(page_links(res)["next"]["url"], access_token)
+            page += 1
+            yield page_data(res)
+        listing["truncated"] = "next" in page_links(res)
+        return
+
+    listing["truncated"] = last > max_pages
+
+    @closing_connections
+    def fetch_page(page):
+        return page_data(cached_get(path, access_token, params={**params, "page": page}))
+
+    executor = ThreadPoolExecutor(max_workers=settings.GITHUB_PAGE_FETCH_WORKERS)
+    try:
+        futures = [executor.submit(fetch_page, page) for page in range(2, min(last, max_pages) + 1)]
+        for future in futures:
+            yield future.result()
+    finally:
+        # 클라이언트가 스트림을 끊으면 남은 페이지 요청은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def async_iter_pages(path, access_token, params, first_res, listing):
+    """iter_pages 의 비동기 버전"""
+    yield page_data(first_res)
+
+    last = last_page(first_res)
+    max_pages = settings.GITHUB_LIST_MAX_PAGES
+    if last is None:
+        res, page = first_res, 1
+        while "next" in page_links(res) and page < max_pages:
+            res = await async_cached_get(page_links(res)["next"]["url"], access_token)
+            page += 1
+            yield page_data(res)
+        listing["truncated"] = "next" in page_links(res)
+        return
+
+    listing["truncated"] = last > max_pages
+    semaphore = asyncio.Semaphore(settings.GITHUB_PAGE_FETCH_WORKERS)
+
+    async def fetch_page(page):
+        async with semaphore:
+            return page_data(await async_cached_get(path, access_token, params={**params, "page": page}))
+
+    tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, min(last, max_pages) + 1)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def stream_error(error):
+    """응답(200)이 시작된 뒤의 실패 → 목록 뒤에 붙일 오류 필드"""
+    if isinstance(error, GitHubPageError):
+        logger.warning("GitHub list page failed mid-stream (%s): %s", error.status_code, error.detail)
+        return {"error": "GitHub API error", "status_code": error.status_code, "detail": error.detail}
+    if isinstance(error, GitHubRateLimited):
+        logger.warning("GitHub rate limit hit mid-stream (retry after %ss)", error.retry_after)
+        return {"error": "GitHub rate limit exceeded", "retry_after": error.retry_after}
+    logger.exception("GitHub list stream failed")
+    return {"error": "Internal server error", "detail": str(error)}
+
+
+def listing_trailer(listing, error=None):
+    # 목록이 중간에 끊긴 경우(페이지 수 제한, 오류) truncated: true, 오류는 error/status_code/detail 필드로
+    fields = {**listing}
+    if error is not None:
+        fields = {**fields, "truncated": True, **stream_error(error)}
+    return "]," + json.dumps(fields)[1:]
+
+
+def json_list_chunks(items, listing):
+    """{"items": [...], "truncated": bool[, "error": ...]} 를 한 건씩 전송 (전체 목록을 메모리에 모으지 않음)
+
+    상태 필드는 목록을 다 보낸 뒤에 알 수 있으므로 items 뒤에 기록
+    """
+    yield '{"items": ['
+    index = 0
+    error = None
+    try:
+        for item in items:
+            yield ("," if index else "") + json.dumps(item)
+            index += 1
+    except Exception as e:
+        error = e
+    yield listing_trailer(listing, error)
+
+
+async def async_json_list_chunks(items, listing):
+    yield '{"items": ['
+    index = 0
+    error = None
+    try:
+        async for item in items:
+            yield ("," if index else "") + json.dumps(item)
+            index += 1
+    except Exception as e:
+        error = e
+    yield listing_trailer(listing, error)
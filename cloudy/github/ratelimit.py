@@ -0,0 +1,154 @@
+import math
+import time
+import hashlib
+import threading
+
+from django.conf import settings
+
+# core 이외(search, graphql 등)는 별도 한도이므로 추적하지 않음
+TRACKED_RESOURCE = 'core'
+
+
+class GitHubRateLimited(Exception):
+    """토큰의 GitHub 호출 한도 소진 (retry_after: 재시도 권장 초)"""
+
+    def __init__(self, retry_after):
+        super().__init__('GitHub rate limit exceeded')
+        self.retry_after = retry_after
+
+
+def token_key(access_token):
+    # 토큰 자체는 메모리에도 보관하지 않음
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def header_int(headers, name):
+    value = headers.get(name)
+    return int(value) if value is not None and value.isdigit() else None
+
+
+class RateLimitBudget:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = 0.0
+        self.blocked_until = 0.0
+        self.next_slot = 0.0
+
+    def refresh(self, now):
+        # reset 시각이 지나면 한도가 다시 채워진 것으로 봄
+        if self.reset and now >= self.reset:
+            self.remaining = self.limit
+            self.reset = 0.0
+
+    def interval(self, now, reserve, slowdown):
+        """급하지 않은 호출 사이 간격 (초) — 남은 호출이 slowdown 아래로 내려가면 reset 까지 고르게 분산"""
+        if self.remaining is None or self.remaining > slowdown or not self.reset:
+            return 0.0
+        spendable = self.remaining - reserve
+        if spendable <= 0:
+            return math.inf
+        return max(self.reset - now, 0.0) / spendable
+
+
+class RateLimitTracker:
+    """토큰별 GitHub 호출 예산 (응답의 X-RateLimit-* / Retry-After 헤더로 갱신, 프로세스 단위)
+
+    urgent(사용자 요청) 호출은 차단 중일 때만 기다리고, 급하지 않은 호출(웹훅 재스캔 등)은
+    예산이 줄어들면 간격을 두고 순서대로 실행 — reserve 만큼은 사용자 요청 몫으로 남김
+    """
+
+    def __init__(self, reserve, slowdown, max_wait, urgent_max_wait):
+        self.reserve = reserve
+        self.slowdown = slowdown
+        self.max_wait = max_wait
+        self.urgent_max_wait = urgent_max_wait
+        self.budgets = {}
+        self.lock = threading.Lock()
+
+    def wait_time(self, access_token, urgent=True):
+        """요청 전 기다릴 시간 (초), 허용 대기 시간을 넘으면 GitHubRateLimited"""
+        if not access_token:
+            return 0.0
+
+        now = time.time()
+        with self.lock:
+            budget = self.budgets.get(token_key(access_token))
+            if budget is None:
+                return 0.0
+            budget.refresh(now)
+
+            start = max(now, budget.blocked_until)
+            if not urgent:
+                interval = budget.interval(now, self.reserve, self.slowdown)
+                if interval == math.inf:
+                    start = max(start, budget.reset)
+                elif interval:
+                    start = max(start, budget.next_slot)
+                    budget.next_slot = start + interval
+
+            wait = start - now
+            if wait > (self.urgent_max_wait if urgent else self.max_wait):
+                raise GitHubRateLimited(math.ceil(wait))
+
+            # 응답이 오기 전에 동시에 들어온 호출도 줄어든 예산을 보도록 미리 차감
+            if budget.remaining:
+                budget.remaining -= 1
+            return wait
+
+    def update(self, access_token, response):
+        if not access_token:
+            return
+
+        headers = response.headers
+        now = time.time()
+        with self.lock:
+            key = token_key(access_token)
+            budget = self.budgets.get(key)
+            if budget is None:
+                if len(self.budgets) >= settings.GITHUB_RATE_LIMIT_MAX_TOKENS:
+                    self.prune(now)
+                budget = self.budgets[key] = RateLimitBudget()
+
+            remaining = header_int(headers, 'X-RateLimit-Remaining')
+            if remaining is not None and headers.get('X-RateLimit-Resource', TRACKED_RESOURCE) == TRACKED_RESOURCE:
+                budget.limit = header_int(headers, 'X-RateLimit-Limit') or budget.limit
+                budget.remaining = remaining
+                budget.reset = float(header_int(headers, 'X-RateLimit-Reset') or 0)
+
+            if response.status_code in (403, 429):
+                # secondary rate limit 은 Retry-After, 한도 소진은 reset 시각까지 차단
+                retry_after = header_int(headers, 'Retry-After')
+                if retry_after is not None:
+                    budget.blocked_until = max(budget.blocked_until, now + retry_after)
+                elif remaining == 0 and budget.reset:
+                    budget.blocked_until = max(budget.blocked_until, budget.reset)
+
+    def snapshot(self, access_token):
+        # 응답 헤더용 (limit, remaining, reset), 기록이 없으면 None
+        with self.lock:
+            budget = self.budgets.get(token_key(access_token))
+            if budget is None or budget.remaining is None:
+                return None
+            budget.refresh(time.time())
+            return budget.limit, budget.remaining, int(budget.reset)
+
+    def prune(self, now):
+        # reset 과 차단이 모두 지난 토큰부터 정리
+        expired = [key for key, budget in self.budgets.items() if budget.reset <= now and budget.blocked_until <= now]
+        for key in expired:
+            del self.budgets[key]
+        if len(self.budgets) >= settings.GITHUB_RATE_LIMIT_MAX_TOKENS:
+            self.budgets.clear()
+
+    def clear(self):
+        with self.lock:
+            self.budgets.clear()
+
+
+rate_limits = RateLimitTracker(
+    settings.GITHUB_RATE_LIMIT_RESERVE,
+    settings.GITHUB_RATE_LIMIT_SLOWDOWN,
+    settings.GITHUB_RATE_LIMIT_MAX_WAIT,
+    settings.GITHUB_RATE_LIMIT_URGENT_MAX_WAIT,
+)
@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+import weakref
+from concurrent.futures import Future
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 에서는 프로세스 간 공유 없이 프로세스 내에서만 동작
+    fcntl = None
+
+from django.conf import settings
+
+# 결과 파일 정리 주기 (초)
+PRUNE_INTERVAL = 60
+
+
+class FileFlight:
+    """잠금 파일로 워커 프로세스 간 같은 키의 호출을 하나로 모음
+
+    먼저 배타 잠금을 잡은 프로세스가 호출하고 결과 파일을 남기며, 나머지는 공유 잠금으로
+    끝나기를 기다렸다가 그 결과를 읽음 (결과가 없으면 직접 호출)
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.last_prune = 0.0
+
+    @property
+    def enabled(self):
+        return bool(self.root) and fcntl is not None
+
+    def path(self, key, suffix):
+        return os.path.join(self.root, f'{key}.{suffix}')
+
+    def lead(self, key):
+        """배타 잠금을 잡으면 잠금 파일 fd, 다른 프로세스가 호출 중이면 None"""
+        os.makedirs(self.root, exist_ok=True)
+        fd = os.open(self.path(key, 'lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+
+    def release(self, fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def publish(self, key, record):
+        # record: (status_code, headers, body) — 임시 파일에 쓴 뒤 rename
+        status_code, headers, body = record
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps({'status_code': status_code, 'headers': headers}).encode() + b'\n')
+            f.write(body)
+        os.replace(temp_path, self.path(key, 'result'))
+        self.prune()
+
+    def wait(self, key, since):
+        """호출 중인 프로세스가 끝날 때까지 기다린 뒤 그 결과 (since 이후 결과가 없으면 None)"""
+        fd = os.open(self.path(key, 'lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            try:
+                with open(self.path(key, 'result'), 'rb') as f:
+                    if os.fstat(f.fileno()).st_mtime < since:
+                        return None
+                    meta = json.loads(f.readline())
+                    return meta['status_code'], meta['headers'], f.read()
+            except (FileNotFoundError, ValueError):
+                return None
+        finally:
+            os.close(fd)
+
+    def prune(self):
+        now = time.time()
+        if now - self.last_prune < PRUNE_INTERVAL:
+            return
+        self.last_prune = now
+        for entry in os.scandir(self.root):
+            try:
+                if now - entry.stat().st_mtime > PRUNE_INTERVAL:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+
+
+class SingleFlight:
+    """동시에 들어온 같은 키의 호출을 한 번만 실행하고 결과를 공유 (프로세스 내, 선택적으로 프로세스 간)
+
+    프로세스 간 공유는 결과를 (status_code, headers, body) 로 주고받으므로 encode/decode 를 함께 넘김
+    """
+
+    def __init__(self, enabled, root=''):
+        self.enabled = enabled
+        self.files = FileFlight(root)
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.async_calls = weakref.WeakKeyDictionary()
+
+    def do(self, key, fn, encode, decode):
+        if not self.enabled:
+            return fn()
+
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = self.across_processes(key, fn, encode, decode)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    def across_processes(self, key, fn, encode, decode):
+        if not self.files.enabled:
+            return fn()
+
+        since = time.time()
+        fd = self.files.lead(key)
+        if fd is None:
+            record = self.files.wait(key, since)
+            return decode(record) if record is not None else fn()
+
+        try:
+            result = fn()
+            self.files.publish(key, encode(result))
+            return result
+        finally:
+            self.files.release(fd)
+
+    async def async_do(self, key, coro_fn, encode, decode):
+        if not self.enabled:
+            return await coro_fn()
+
+        # asyncio 작업은 이벤트 루프에 묶이므로 루프마다 따로 관리
+        calls = self.async_calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+        if task is None:
+            task = calls[key] = asyncio.ensure_future(self.async_across_processes(key, coro_fn, encode, decode))
+            task.add_done_callback(lambda _: calls.pop(key, None))
+        # 기다리던 요청 하나가 취소되어도 공유 중인 호출은 계속 진행
+        return await asyncio.shield(task)
+
+    async def async_across_processes(self, key, coro_fn, encode, decode):
+        if not self.files.enabled:
+            return await coro_fn()
+
+        since = time.time()
+        fd = self.files.lead(key)
+        if fd is None:
+            record = await asyncio.to_thread(self.files.wait, key, since)
+            return decode(record) if record is not None else await coro_fn()
+
+        try:
+            result = await coro_fn()
+            self.files.publish(key, encode(result))
+            return result
+        finally:
+            self.files.release(fd)
+
+
+single_flight = SingleFlight(settings.GITHUB_SINGLE_FLIGHT, settings.GITHUB_SINGLE_FLIGHT_DIR)
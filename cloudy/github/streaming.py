@@ -0,0 +1,31 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+async def iterate_in_thread(iterator):
+    # 동기 iterator 를 스레드에서 한 청크씩 진행 (이벤트 루프를 막지 않음)
+    next_chunk = sync_to_async(next, thread_sensitive=False)
+    while True:
+        chunk = await next_chunk(iterator, _DONE)
+        if chunk is _DONE:
+            return
+        yield chunk
+
+
+def streaming_response(request, chunks, **kwargs):
+    """동기 청크 iterator 로 StreamingHttpResponse 생성
+
+    ASGI 는 동기 iterator 를 끝까지 모은 뒤에 전송하므로, ASGI 요청이면 비동기 iterator 로 감싸 청크마다 바로 보냄
+    """
+    if not isinstance(getattr(request, '_request', request), ASGIRequest):
+        return StreamingHttpResponse(chunks, **kwargs)
+
+    iterator = iter(chunks)
+    response = StreamingHttpResponse(iterate_in_thread(iterator), **kwargs)
+    # 중간에 연결이 끊겨도 원래 iterator 의 정리(finally)가 실행되도록
+    if hasattr(iterator, 'close'):
+        response._resource_closers.append(iterator.close)
+    return response
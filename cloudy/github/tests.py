@@ -1,3 +1,711 @@
-from django.test import TestCase
+import json
+import base64
+import asyncio
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import httpx
+
+from django.http import JsonResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from github.blobs import git_blob_sha
+from github.client import GitHubClient
+from github.conditional import build_response, cached_get, async_cached_get, memory_cache
+from github.contents import parse_max_bytes
+from github.models import ConditionalResponseCache
+from github.gitdata import GitDataError, commit_files, async_commit_files, existing_blobs, plan_upload
+from github.pagination import GitHubPageError, iter_pages, json_list_chunks, new_listing
+from github.ratelimit import GitHubRateLimited, RateLimitTracker, RateLimitBudget, rate_limits
+from github.singleflight import SingleFlight
+from github.uploads import UploadSource, Base64JSONBody, AsyncBody, base64_chunks, upload_from
+from github.views.async_proxy import AsyncGitHubUploadFiles
+
+
+def source_from(data, chunk_size):
+    # 청크 경계가 3 바이트 단위와 맞지 않는 경우까지 확인할 수 있도록 크기를 지정
+    def open_chunks():
+        return iter([data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size)])
+    return UploadSource('dir/file.tf', len(data), open_chunks)
+
+
+class Base64JSONBodyTests(SimpleTestCase):
+    def test_length_and_content(self):
+        for size in (0, 1, 2, 3, 4, 100, 64 * 1024 + 1):
+            for chunk_size in (1, 2, 5, 7, 64 * 1024):
+                data = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+                with self.subTest(size=size, chunk_size=chunk_size):
+                    body = Base64JSONBody({"message": "m", "branch": "main"}, source_from(data, chunk_size))
+                    raw = b''.join(body)
+
+                    self.assertEqual(len(body), len(raw))
+                    self.assertEqual(body.headers["Content-Length"], str(len(raw)))
+                    payload = json.loads(raw)
+                    self.assertEqual(payload["message"], "m")
+                    self.assertEqual(payload["branch"], "main")
+                    self.assertEqual(base64.b64decode(payload["content"]), data)
+
+    def test_fields_are_escaped(self):
+        body = Base64JSONBody({"message": 'quote " and 한글'}, source_from(b'x', 1))
+        self.assertEqual(json.loads(b''.join(body))["message"], 'quote " and 한글')
+
+    def test_can_be_iterated_again(self):
+        # 재시도 시 본문을 처음부터 다시 생성
+        body = Base64JSONBody({"encoding": "base64"}, source_from(b'abcdefgh', 3))
+        self.assertEqual(b''.join(body), b''.join(body))
+
+    def test_base64_chunks_match_single_encoding(self):
+        data = b'0123456789' * 7
+        chunks = [data[:4], data[4:5], data[5:33], data[33:]]
+        self.assertEqual(b''.join(base64_chunks(chunks)), base64.b64encode(data))
+
+    def test_source_sha_matches_git(self):
+        data = b'resource "a" "b" {}\n'
+        self.assertEqual(source_from(data, 4).sha, git_blob_sha(data))
+
+
+class ParseMaxBytesTests(SimpleTestCase):
+    @override_settings(GITHUB_CONTENT_MAX_BYTES=100)
+    def test_parse_max_bytes(self):
+        self.assertEqual(parse_max_bytes("0"), 0)
+        self.assertEqual(parse_max_bytes("50"), 50)
+        self.assertEqual(parse_max_bytes("1000"), 100)
+        for value in ("-1", "x", ""):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_max_bytes(value)
+
+
+
+class AsyncUploadTests(SimpleTestCase):
+    def test_async_body_reads_chunks_off_the_event_loop(self):
+        threads = []
+
+        def open_chunks():
+            for chunk in (b'abc', b'defg', b'h'):
+                threads.append(threading.get_ident())
+                yield chunk
+
+        body = Base64JSONBody({"encoding": "base64"}, UploadSource('a.tf', 8, open_chunks))
+        threads.clear()
+
+        async def collect():
+            return threading.get_ident(), b''.join([chunk async for chunk in AsyncBody(body)])
+
+        loop_thread, raw = asyncio.run(collect())
+        self.assertEqual(base64.b64decode(json.loads(raw)["content"]), b'abcdefgh')
+        self.assertTrue(threads)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_request_parsing_runs_off_the_event_loop(self):
+        request = RequestFactory().post(
+            '/github/async/upload-files/?repo_name=r&branch=main&commit_message=m&path=main.tf',
+            data=b'resource "a" "b" {}\n', content_type='text/plain'
+        )
+        request.user = mock.Mock(username='u')
+        parsed = {}
+
+        def recording_upload_from(*args, **kwargs):
+            parsed['thread'] = threading.get_ident()
+            return upload_from(*args, **kwargs)
+
+        async def upload(owner, fields, sources):
+            parsed['loop_thread'] = threading.get_ident()
+            parsed['content'] = b''.join(sources[0].chunks())
+            return JsonResponse({})
+
+        view = AsyncGitHubUploadFiles()
+        view.upload = upload
+        with mock.patch('github.views.async_proxy.upload_from', recording_upload_from):
+            asyncio.run(view.post(request))
+
+        self.assertEqual(parsed['content'], b'resource "a" "b" {}\n')
+        self.assertNotEqual(parsed['thread'], parsed['loop_thread'])
+
+
+class FakePage:
+    def __init__(self, items, links=None, status_code=200):
+        self.items = items
+        self.links = links or {}
+        self.status_code = status_code
+
+    def json(self):
+        return self.items
+
+
+class RepoListingTests(SimpleTestCase):
+    def body(self, items, listing=None):
+        return json.loads(''.join(json_list_chunks(items, listing or new_listing())))
+
+    def test_items(self):
+        self.assertEqual(self.body(iter([{"a": 1}, {"a": 2}])), {"items": [{"a": 1}, {"a": 2}], "truncated": False})
+        self.assertEqual(self.body(iter([])), {"items": [], "truncated": False})
+
+    def test_page_error_is_reported_outside_items(self):
+        def items():
+            yield {"name": "r0"}
+            raise GitHubPageError(502, {"message": "Bad Gateway"})
+
+        with self.assertLogs('github.pagination', 'WARNING'):
+            body = self.body(items())
+        self.assertEqual(body, {
+            "items": [{"name": "r0"}],
+            "truncated": True,
+            "error": "GitHub API error",
+            "status_code": 502,
+            "detail": {"message": "Bad Gateway"},
+        })
+
+    @override_settings(GITHUB_LIST_MAX_PAGES=2)
+    def test_truncated_with_last_link(self):
+        first = FakePage([1], {"last": {"url": "https://api.github.com/user/repos?per_page=100&page=5"}})
+        listing = new_listing()
+        with mock.patch('github.pagination.cached_get', return_value=FakePage([2])) as get:
+            pages = list(iter_pages("/user/repos", "token", {"per_page": 100}, first, listing))
+        self.assertEqual(pages, [[1], [2]])
+        self.assertEqual(get.call_count, 1)
+        self.assertTrue(listing["truncated"])
+
+    @override_settings(GITHUB_LIST_MAX_PAGES=2)
+    def test_truncated_with_next_links(self):
+        next_link = {"next": {"url": "https://api.github.com/user/repos?page=n"}}
+        first = FakePage([1], next_link)
+        listing = new_listing()
+        with mock.patch('github.pagination.cached_get', return_value=FakePage([2], next_link)):
+            self.assertEqual(list(iter_pages("/user/repos", "token", {}, first, listing)), [[1], [2]])
+        self.assertTrue(listing["truncated"])
+
+    @override_settings(GITHUB_LIST_MAX_PAGES=5)
+    def test_complete_listing(self):
+        first = FakePage([1], {"last": {"url": "https://api.github.com/user/repos?page=3"}})
+        listing = new_listing()
+        with mock.patch('github.pagination.cached_get', side_effect=[FakePage([2]), FakePage([3])]):
+            self.assertEqual(list(iter_pages("/user/repos", "token", {}, first, listing)), [[1], [2], [3]])
+        self.assertFalse(listing["truncated"])
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    # server.responses 의 (상태 코드, 헤더) 를 순서대로 응답, 마지막 항목은 계속 반복
+    def log_message(self, *args):
+        pass
+
+    def respond(self):
+        server = self.server
+        server.requests.append((self.command, self.path))
+        status_code, headers = server.responses.pop(0) if len(server.responses) > 1 else server.responses[0]
+        body = b'{}'
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = respond
+
+
+class GitHubClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.enterClassContext(override_settings(GITHUB_API_URL=f'http://127.0.0.1:{cls.server.server_port}'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests = []
+        rate_limits.clear()
+        self.addCleanup(rate_limits.clear)
+        self.client = GitHubClient(pool_size=1, max_retries=2, backoff=0)
+        patcher = mock.patch('github.client.time.sleep')
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def respond(self, *responses):
+        self.server.responses = list(responses)
+
+    def test_server_errors_are_retried(self):
+        self.respond((502, {}), (503, {}), (200, {}))
+        self.assertEqual(self.client.get('/user', 'token').status_code, 200)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_retries_are_limited(self):
+        self.respond((502, {}))
+        self.assertEqual(self.client.get('/user', 'token').status_code, 502)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_post_is_not_retried(self):
+        self.respond((502, {}), (200, {}))
+        self.assertEqual(self.client.post('/user/repos', 'token').status_code, 502)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retry_after_waits_then_retries(self):
+        self.respond((403, {'Retry-After': '2'}), (200, {}))
+        self.assertEqual(self.client.get('/user', 'token').status_code, 200)
+        self.assertEqual(len(self.server.requests), 2)
+        [(wait,), _] = self.sleep.call_args
+        self.assertAlmostEqual(wait, 2, delta=0.5)
+
+    def test_long_retry_after_raises(self):
+        self.respond((429, {'Retry-After': '60'}))
+        with self.assertRaises(GitHubRateLimited) as raised:
+            self.client.get('/user', 'token')
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertGreaterEqual(raised.exception.retry_after, 59)
+
+        # 차단 중에는 요청을 보내지 않음
+        with self.assertRaises(GitHubRateLimited):
+            self.client.get('/user', 'token')
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_rate_limit_retries_are_limited(self):
+        self.respond((429, {'Retry-After': '1'}))
+        with self.assertRaises(GitHubRateLimited):
+            self.client.get('/user', 'token')
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_rate_limited_without_token_or_for_post(self):
+        self.respond((429, {'Retry-After': '1'}))
+        with self.assertRaises(GitHubRateLimited):
+            self.client.get('/user')
+        with self.assertRaises(GitHubRateLimited):
+            self.client.post('/user/repos', 'token')
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_forbidden_without_retry_after_is_returned(self):
+        self.respond((403, {}))
+        self.assertEqual(self.client.get('/repos/u/private', 'token').status_code, 403)
+        self.assertEqual(len(self.server.requests), 1)
+
+
+def github_response(status_code, body=b'', **headers):
+    return build_response(status_code, headers, body, 'https://api.github.com/user/repos')
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        memory_cache.clear()
+        self.addCleanup(memory_cache.clear)
+        patcher = mock.patch('github.conditional.github')
+        self.github = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent_headers(self, call_index=-1):
+        return self.github.get.call_args_list[call_index].kwargs['headers']
+
+    def test_not_modified_is_rebuilt_from_cache(self):
+        link = '<https://api.github.com/user/repos?page=2>; rel="next"'
+        self.github.get.side_effect = [
+            github_response(200, b'[{"name": "r"}]', ETag='"abc"', Link=link, **{'Content-Type': 'application/json'}),
+            github_response(304, ETag='"abc"'),
+        ]
+
+        first = cached_get('/user/repos', 'token', params={'page': 1})
+        second = cached_get('/user/repos', 'token', params={'page': 1})
+
+        self.assertNotIn('If-None-Match', self.sent_headers(0))
+        self.assertEqual(self.sent_headers(1)['If-None-Match'], '"abc"')
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers['X-GitHub-Cache'], 'revalidated')
+        self.assertEqual(second.links['next']['url'], 'https://api.github.com/user/repos?page=2')
+
+    def test_not_modified_from_db_entry(self):
+        self.github.get.side_effect = [
+            github_response(200, b'{"login": "u"}', **{'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}),
+            github_response(304),
+        ]
+        cached_get('/user', 'token')
+        memory_cache.clear()
+
+        res = cached_get('/user', 'token')
+        self.assertEqual(self.sent_headers()['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+        self.assertEqual((res.status_code, res.json()), (200, {'login': 'u'}))
+        self.assertEqual(ConditionalResponseCache.objects.count(), 1)
+
+    def test_entries_are_per_token_and_params(self):
+        self.github.get.return_value = github_response(200, b'[]', ETag='"abc"')
+        cached_get('/user/repos', 'token', params={'page': 1})
+        cached_get('/user/repos', 'other-token', params={'page': 1})
+        cached_get('/user/repos', 'token', params={'page': 2})
+
+        self.assertTrue(all('If-None-Match' not in call.kwargs['headers'] for call in self.github.get.call_args_list))
+
+    def test_uncacheable_responses_are_not_stored(self):
+        self.github.get.side_effect = [github_response(200, b'[]'), github_response(404, b'{}', ETag='"x"'), github_response(304)]
+        cached_get('/user/repos', 'token')
+        cached_get('/user/repos', 'token')
+
+        # 저장된 항목이 없으면 304 를 그대로 돌려줌
+        self.assertEqual(cached_get('/user/repos', 'token').status_code, 304)
+        self.assertFalse(ConditionalResponseCache.objects.exists())
+
+    @override_settings(GITHUB_ETAG_CACHE_DB=False)
+    def test_async_not_modified_is_rebuilt_from_cache(self):
+        request = httpx.Request('GET', 'https://api.github.com/user')
+        responses = [
+            httpx.Response(200, headers={'ETag': '"abc"'}, content=b'{"login": "u"}', request=request),
+            httpx.Response(304, request=request),
+        ]
+
+        async def run():
+            with mock.patch('github.conditional.async_github') as async_github:
+                async_github.get = mock.AsyncMock(side_effect=responses)
+                await async_cached_get('/user', 'token')
+                res = await async_cached_get('/user', 'token')
+                return res, async_github.get.call_args.kwargs['headers']
+
+        res, headers = asyncio.run(run())
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+        self.assertEqual((res.status_code, res.json()), (200, {'login': 'u'}))
+        self.assertEqual(res.headers['X-GitHub-Cache'], 'revalidated')
+        self.assertFalse(ConditionalResponseCache.objects.exists())
+
+
+def rate_limit_response(status_code=200, remaining=None, reset=None, limit=5000, **headers):
+    if remaining is not None:
+        headers.update({'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(remaining), 'X-RateLimit-Reset': str(int(reset))})
+    return mock.Mock(status_code=status_code, headers=headers)
+
+
+class RateLimitTrackerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1_000_000.0
+        patcher = mock.patch('github.ratelimit.time')
+        patcher.start().time.side_effect = lambda: self.now
+        self.addCleanup(patcher.stop)
+        self.tracker = RateLimitTracker(reserve=10, slowdown=100, max_wait=300, urgent_max_wait=5)
+
+    def test_unknown_token_does_not_wait(self):
+        self.assertEqual(self.tracker.wait_time('token', urgent=False), 0)
+        self.assertEqual(self.tracker.wait_time(None), 0)
+
+    def test_plenty_of_budget(self):
+        self.tracker.update('token', rate_limit_response(remaining=4000, reset=self.now + 100))
+        self.assertEqual([self.tracker.wait_time('token', urgent=False) for _ in range(3)], [0, 0, 0])
+
+    def test_background_calls_are_spread_until_reset(self):
+        self.tracker.update('token', rate_limit_response(remaining=60, reset=self.now + 100))
+        waits = [self.tracker.wait_time('token', urgent=False) for _ in range(3)]
+
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 100 / 50)
+        self.assertAlmostEqual(waits[2], 100 / 50 + 100 / 49)
+        # 사용자 요청은 간격 없이 바로 실행
+        self.assertEqual(self.tracker.wait_time('token'), 0)
+
+    def test_reserve_is_kept_for_urgent_calls(self):
+        self.tracker.update('token', rate_limit_response(remaining=10, reset=self.now + 100))
+        self.assertEqual(self.tracker.wait_time('token', urgent=False), 100)
+        self.assertEqual(self.tracker.wait_time('token'), 0)
+
+        self.tracker.update('token', rate_limit_response(remaining=10, reset=self.now + 1000))
+        with self.assertRaises(GitHubRateLimited) as raised:
+            self.tracker.wait_time('token', urgent=False)
+        self.assertEqual(raised.exception.retry_after, 1000)
+
+    def test_exhausted_budget_blocks_until_reset(self):
+        self.tracker.update('token', rate_limit_response(403, remaining=0, reset=self.now + 60))
+        with self.assertRaises(GitHubRateLimited) as raised:
+            self.tracker.wait_time('token')
+        self.assertEqual(raised.exception.retry_after, 60)
+        self.assertEqual(self.tracker.wait_time('token', urgent=False), 60)
+
+        # reset 이 지나면 한도가 다시 채워짐
+        self.now += 61
+        self.assertEqual(self.tracker.wait_time('token', urgent=False), 0)
+        self.assertEqual(self.tracker.snapshot('token'), (5000, 4999, 0))
+
+    def test_retry_after(self):
+        self.tracker.update('token', rate_limit_response(429, **{'Retry-After': '3'}))
+        self.assertEqual(self.tracker.wait_time('token'), 3)
+        self.tracker.update('token', rate_limit_response(403, **{'Retry-After': '30'}))
+        with self.assertRaises(GitHubRateLimited):
+            self.tracker.wait_time('token')
+        self.assertEqual(self.tracker.wait_time('other-token'), 0)
+
+    def test_other_resources_are_ignored(self):
+        self.tracker.update('token', rate_limit_response(remaining=0, reset=self.now + 60, **{'X-RateLimit-Resource': 'search'}))
+        self.assertIsNone(self.tracker.snapshot('token'))
+        self.assertEqual(self.tracker.wait_time('token', urgent=False), 0)
+
+    def test_snapshot_counts_calls_in_flight(self):
+        self.tracker.update('token', rate_limit_response(remaining=200, reset=self.now + 60))
+        self.tracker.wait_time('token')
+        self.tracker.wait_time('token')
+        self.assertEqual(self.tracker.snapshot('token'), (5000, 198, int(self.now + 60)))
+
+    @override_settings(GITHUB_RATE_LIMIT_MAX_TOKENS=2)
+    def test_expired_tokens_are_pruned(self):
+        self.tracker.update('a', rate_limit_response(remaining=1, reset=self.now + 10))
+        self.tracker.update('b', rate_limit_response(remaining=1, reset=self.now + 1000))
+        self.now += 20
+        self.tracker.update('c', rate_limit_response(remaining=1, reset=self.now + 10))
+
+        self.assertEqual(len(self.tracker.budgets), 2)
+        self.assertIsNone(self.tracker.snapshot('a'))
+        self.assertNotIn('b', self.tracker.budgets)
+
+
+class RateLimitBudgetTests(SimpleTestCase):
+    def test_interval(self):
+        budget = RateLimitBudget()
+        self.assertEqual(budget.interval(0, 10, 100), 0)
+
+        budget.remaining, budget.reset = 500, 100.0
+        self.assertEqual(budget.interval(0, 10, 100), 0)
+        budget.remaining = 30
+        self.assertEqual(budget.interval(0, 10, 100), 5)
+        budget.remaining = 10
+        self.assertEqual(budget.interval(0, 10, 100), float('inf'))
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def slow_call(self, result=b'body'):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return 200, {'ETag': '"abc"'}, result
+
+    def call(self, flight, key='k', fn=None):
+        return flight.do(key, fn or self.slow_call, encode=lambda record: record, decode=tuple)
+
+    def run_concurrently(self, calls):
+        results = [None] * len(calls)
+
+        def worker(index, fn):
+            results[index] = fn()
+
+        threads = [threading.Thread(target=worker, args=(index, fn)) for index, fn in enumerate(calls)]
+        threads[0].start()
+        self.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        # 뒤따르는 호출이 진행 중인 호출에 합류할 시간
+        threading.Event().wait(0.1)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_concurrent_calls_are_coalesced(self):
+        flight = SingleFlight(True)
+        results = self.run_concurrently([lambda: self.call(flight)] * 5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [(200, {'ETag': '"abc"'}, b'body')] * 5)
+        self.assertEqual(flight.calls, {})
+
+    def test_different_keys_are_not_coalesced(self):
+        flight = SingleFlight(True)
+        self.run_concurrently([lambda: self.call(flight, 'a'), lambda: self.call(flight, 'b')])
+        self.assertEqual(self.calls, 2)
+
+    def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight(True)
+        self.release.set()
+        self.call(flight)
+        self.call(flight)
+        self.assertEqual(self.calls, 2)
+
+    def test_disabled(self):
+        flight = SingleFlight(False)
+        self.run_concurrently([lambda: self.call(flight)] * 3)
+        self.assertEqual(self.calls, 3)
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight(True)
+
+        def failing_call():
+            self.slow_call()
+            raise ValueError('GitHub unavailable')
+
+        def attempt(fn):
+            try:
+                self.call(flight, fn=fn)
+            except ValueError as e:
+                return str(e)
+
+        results = self.run_concurrently([lambda: attempt(failing_call), lambda: attempt(None)])
+        self.assertEqual(results, ['GitHub unavailable'] * 2)
+        self.assertEqual(self.calls, 1)
+
+    def test_across_processes(self):
+        # 프로세스마다 SingleFlight 인스턴스가 따로 있고 잠금 파일 디렉토리만 공유
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        first, second = SingleFlight(True, root), SingleFlight(True, root)
+
+        results = self.run_concurrently([lambda: self.call(first), lambda: self.call(second)])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results[0], results[1])
+
+    def test_async_calls_are_coalesced(self):
+        flight = SingleFlight(True)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 200, {}, b'body'
+
+        async def run():
+            tasks = [asyncio.ensure_future(flight.async_do('k', fetch, encode=None, decode=None)) for _ in range(4)]
+            await asyncio.sleep(0)
+            # 기다리던 요청 하나가 취소되어도 나머지는 결과를 받음
+            tasks[0].cancel()
+            return await asyncio.gather(*tasks[1:])
+
+        self.assertEqual(asyncio.run(run()), [(200, {}, b'body')] * 3)
+        self.assertEqual(len(calls), 1)
+
+
+class FakeGitData:
+    # git data API 흉내: PATCH refs 는 moves 횟수만큼 브랜치가 움직인 것처럼 422
+    def __init__(self, moves=0):
+        self.moves = moves
+        self.head = 'head0'
+        self.commits = []
+        self.requests = []
+
+    def respond(self, data, status_code=200):
+        return build_response(status_code, {'Content-Type': 'application/json'}, json.dumps(data).encode(), '')
+
+    def get(self, path, access_token=None, **kwargs):
+        self.requests.append(('GET', path))
+        if '/commits/' in path:
+            return self.respond({'tree': {'sha': f'tree-of-{path.rsplit("/", 1)[1]}'}})
+        if path.endswith('/ref/heads/main'):
+            return self.respond({'object': {'sha': self.head}})
+        return self.respond({'message': 'Not Found'}, 404)
+
+    def post(self, path, access_token=None, data=None, **kwargs):
+        self.requests.append(('POST', path))
+        if path.endswith('/blobs'):
+            content = base64.b64decode(json.loads(b''.join(data))['content'])
+            return self.respond({'sha': git_blob_sha(content)}, 201)
+        if path.endswith('/trees'):
+            return self.respond({'sha': f'tree{len(self.commits)}'}, 201)
+        self.commits.append(kwargs['json'])
+        return self.respond({'sha': f'commit{len(self.commits)}'}, 201)
+
+    def patch(self, path, access_token=None, **kwargs):
+        self.requests.append(('PATCH', path))
+        if self.moves:
+            self.moves -= 1
+            self.head = f'moved{self.moves}'
+            return self.respond({'message': 'Update is not a fast forward'}, 422)
+        self.head = kwargs['json']['sha']
+        return self.respond({'object': {'sha': self.head}})
+
+
+class AsyncFakeGitData(FakeGitData):
+    async def get(self, path, access_token=None, **kwargs):
+        return FakeGitData.get(self, path, access_token, **kwargs)
+
+    async def post(self, path, access_token=None, content=None, **kwargs):
+        data = [chunk async for chunk in content] if content is not None else None
+        return FakeGitData.post(self, path, access_token, data=data, **kwargs)
+
+    async def patch(self, path, access_token=None, **kwargs):
+        return FakeGitData.patch(self, path, access_token, **kwargs)
+
+
+class CommitFilesTests(SimpleTestCase):
+    def sources(self):
+        return [source_from(b'a = 1\n', 4), UploadSource('b.tf', 6, lambda: iter([b'b = 2\n']))]
+
+    def commit(self, fake):
+        with mock.patch('github.gitdata.github', fake):
+            return commit_files('token', 'u', 'r', 'main', 'head0', 'm', self.sources())
+
+    def test_fast_forward(self):
+        fake = FakeGitData()
+        self.assertEqual(self.commit(fake), 'commit1')
+        self.assertEqual(fake.head, 'commit1')
+        self.assertEqual(fake.commits, [{'message': 'm', 'tree': 'tree0', 'parents': ['head0']}])
+        self.assertEqual([method for method, _ in fake.requests].count('POST'), 4)
+
+    def test_retries_on_top_of_moved_branch(self):
+        fake = FakeGitData(moves=1)
+        self.assertEqual(self.commit(fake), 'commit2')
+
+        # 새 HEAD 기준으로 트리/커밋을 다시 만들고, blob 은 다시 올리지 않음
+        self.assertEqual([commit['parents'] for commit in fake.commits], [['head0'], ['moved0']])
+        self.assertIn(('GET', '/repos/u/r/git/commits/moved0'), fake.requests)
+        self.assertEqual([path for _, path in fake.requests].count('/repos/u/r/git/blobs'), 2)
+        self.assertEqual(fake.head, 'commit2')
+
+    def test_gives_up_after_attempts(self):
+        fake = FakeGitData(moves=5)
+        with self.assertRaises(GitDataError) as raised:
+            self.commit(fake)
+        self.assertEqual(raised.exception.status_code, 422)
+        self.assertEqual(len(fake.commits), 3)
+
+    def test_async_retries_on_top_of_moved_branch(self):
+        fake = AsyncFakeGitData(moves=2)
+        with mock.patch('github.gitdata.async_github', fake):
+            sha = asyncio.run(async_commit_files('token', 'u', 'r', 'main', 'head0', 'm', self.sources()))
+        self.assertEqual(sha, 'commit3')
+        self.assertEqual([commit['parents'] for commit in fake.commits], [['head0'], ['moved1'], ['moved0']])
+
+
+class PlanUploadTests(SimpleTestCase):
+    def source(self, path, data):
+        return UploadSource(path, len(data), lambda: iter([data]))
+
+    def test_created_updated_skipped(self):
+        sources = [
+            self.source('new.tf', b'a = 1\n'),
+            self.source('changed.tf', b'b = 2\n'),
+            self.source('same.tf', b'c = 3\n'),
+        ]
+        existing = {'changed.tf': git_blob_sha(b'b = 1\n'), 'same.tf': git_blob_sha(b'c = 3\n'), 'other.tf': 'x'}
+
+        changed, report = plan_upload(sources, existing)
+        self.assertEqual([source.path for source in changed], ['new.tf', 'changed.tf'])
+        self.assertEqual(report, {'created': ['new.tf'], 'updated': ['changed.tf'], 'skipped': ['same.tf']})
+
+    def test_nothing_changed(self):
+        source = self.source('same.tf', b'c = 3\n')
+        self.assertEqual(plan_upload([source], {'same.tf': source.sha}), ([], {'created': [], 'updated': [], 'skipped': ['same.tf']}))
+
+    def test_existing_blobs_from_tree(self):
+        tree = {'tree': [
+            {'path': 'a.tf', 'type': 'blob', 'sha': 'sha-a'},
+            {'path': 'dir', 'type': 'tree', 'sha': 'sha-dir'},
+            {'path': 'unrelated.tf', 'type': 'blob', 'sha': 'sha-u'},
+        ], 'truncated': False}
+
+        with mock.patch('github.gitdata.cached_get', return_value=github_response(200, json.dumps(tree).encode())), \
+                mock.patch('github.gitdata.github') as client:
+            existing = existing_blobs('token', 'u', 'r', 'head', ['a.tf', 'dir', 'b.tf'])
+        self.assertEqual(existing, {'a.tf': 'sha-a'})
+        client.get.assert_not_called()
+
+    def test_truncated_tree_looks_up_missing_paths(self):
+        tree = {'tree': [{'path': 'a.tf', 'type': 'blob', 'sha': 'sha-a'}], 'truncated': True}
+        contents = {
+            '/repos/u/r/contents/b.tf': github_response(200, b'{"sha": "sha-b"}'),
+            '/repos/u/r/contents/c.tf': github_response(404, b'{}'),
+        }
+
+        with mock.patch('github.gitdata.cached_get', return_value=github_response(200, json.dumps(tree).encode())), \
+                mock.patch('github.gitdata.github') as client:
+            client.get.side_effect = lambda path, *args, **kwargs: contents[path]
+            existing = existing_blobs('token', 'u', 'r', 'head', ['a.tf', 'b.tf', 'c.tf'])
+        self.assertEqual(existing, {'a.tf': 'sha-a', 'b.tf': 'sha-b'})
@@ -0,0 +1,184 @@
+import json
+import math
+import base64
+import tempfile
+from collections.abc import Mapping
+
+from django.conf import settings
+
+from github.blobs import git_blob_sha_chunks
+from github.contents import parse_bool
+from github.streaming import iterate_in_thread
+
+CHUNK_SIZE = 64 * 1024
+# 원시 본문은 이 크기까지만 메모리에 두고 넘으면 임시 파일로
+SPOOL_MAX_MEMORY = 1024 * 1024
+UPLOAD_FIELDS = ("repo_name", "branch", "commit_message")
+
+
+class GitHubUploadRejected(Exception):
+    """업로드 요청 거부 (status_code: 400 또는 413)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UploadSource:
+    """업로드할 파일 하나 (JSON 본문, multipart 파일, 원시 본문 공통)
+
+    내용은 청크로만 읽고, 여러 번 읽을 수 있어야 함 (blob SHA 계산, 업로드, 재시도)
+    """
+
+    def __init__(self, path, size, open_chunks, close=None):
+        self.path = path
+        self.size = size
+        self.open_chunks = open_chunks
+        self.close = close or (lambda: None)
+        self.sha = git_blob_sha_chunks(size, self.chunks())
+
+    def chunks(self):
+        return self.open_chunks()
+
+
+def check_size(path, size):
+    if size > settings.GITHUB_UPLOAD_MAX_BYTES:
+        raise GitHubUploadRejected(f"'{path}' exceeds {settings.GITHUB_UPLOAD_MAX_BYTES} bytes", status_code=413)
+
+
+def text_source(path, content):
+    data = content.encode()
+    check_size(path, len(data))
+    return UploadSource(path, len(data), lambda: iter([data]))
+
+
+def file_source(path, uploaded):
+    # Django UploadedFile: 큰 파일은 이미 임시 파일에 있음 (chunks() 는 처음부터 다시 읽음)
+    check_size(path, uploaded.size)
+    return UploadSource(path, uploaded.size, lambda: uploaded.chunks(chunk_size=CHUNK_SIZE))
+
+
+def stream_source(path, stream, content_length=None):
+    """요청 본문을 청크 단위로 임시 파일에 옮긴 뒤 source 로 (본문 전체를 메모리에 두지 않음)"""
+    if content_length and content_length.isdigit():
+        check_size(path, int(content_length))
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    size = 0
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > settings.GITHUB_UPLOAD_MAX_BYTES:
+            spool.close()
+            check_size(path, size)
+        spool.write(chunk)
+
+    def open_chunks():
+        spool.seek(0)
+        return iter(lambda: spool.read(CHUNK_SIZE), b'')
+
+    return UploadSource(path, size, open_chunks, close=spool.close)
+
+
+def invalid_files(files):
+    # 업로드 전에 전부 검사 (일부만 올라가지 않도록)
+    return not isinstance(files, list) or any(
+        not isinstance(file, dict) or not file.get("path") or not isinstance(file.get("content"), str)
+        for file in files
+    )
+
+
+def upload_from(content_type, data, uploaded_files, stream, query, content_length=None):
+    """요청 형식별 업로드 내용 → (필드 dict, [UploadSource])
+
+    - application/json: files=[{path, content}]
+    - multipart/form-data: files (여러 개) + paths (선택, 없으면 파일 이름)
+    - 그 외 (원시 본문): 본문 전체가 파일 하나, 필드와 path 는 쿼리 파라미터
+    """
+    fields = data if content_type in ("application/json", "multipart/form-data") else query
+    if not isinstance(fields, Mapping):
+        raise GitHubUploadRejected("Invalid JSON")
+
+    values = {name: fields.get(name) for name in UPLOAD_FIELDS}
+    bulk = fields.get("bulk")
+    values["bulk"] = bulk if isinstance(bulk, bool) else parse_bool(bulk)
+    if not all(values[name] for name in UPLOAD_FIELDS):
+        raise GitHubUploadRejected("Missing required fields")
+
+    if content_type == "application/json":
+        files = data.get("files", [])
+        if not files:
+            raise GitHubUploadRejected("Missing required fields")
+        if invalid_files(files):
+            raise GitHubUploadRejected("Each file must include 'path' and 'content'")
+        return values, [text_source(file["path"], file["content"]) for file in files]
+
+    if content_type == "multipart/form-data":
+        files = uploaded_files.getlist("files")
+        paths = data.getlist("paths")
+        if not files:
+            raise GitHubUploadRejected("Missing required fields")
+        if paths and len(paths) != len(files):
+            raise GitHubUploadRejected("'paths' must match the number of 'files'")
+        return values, [file_source(paths[index] if paths else uploaded.name, uploaded) for index, uploaded in enumerate(files)]
+
+    path = query.get("path")
+    if not path or stream is None:
+        raise GitHubUploadRejected("Raw uploads require a 'path' parameter and a request body")
+    return values, [stream_source(path, stream, content_length)]
+
+
+def close_sources(sources):
+    for source in sources:
+        source.close()
+
+
+def base64_chunks(chunks):
+    # 3 바이트 단위로 끊어 인코딩 (청크 경계에서 패딩이 생기지 않도록 나머지는 다음 청크로)
+    rest = b''
+    for chunk in chunks:
+        data = rest + chunk
+        cut = len(data) - len(data) % 3
+        rest = data[cut:]
+        if cut:
+            yield base64.b64encode(data[:cut])
+    if rest:
+        yield base64.b64encode(rest)
+
+
+class Base64JSONBody:
+    """{..., "content": "<base64>"} JSON 본문을 청크 단위로 생성
+
+    길이를 미리 계산할 수 있으므로 Content-Length 로 전송하고, 재시도 시 처음부터 다시 생성
+    """
+
+    def __init__(self, fields, source):
+        # content 를 마지막 키로 둔 JSON 에서 빈 문자열 앞뒤로 나눔
+        text = json.dumps({**fields, "content": ""})
+        self.prefix = text[:-2].encode()
+        self.suffix = text[-2:].encode()
+        self.source = source
+
+    def __len__(self):
+        return len(self.prefix) + 4 * math.ceil(self.source.size / 3) + len(self.suffix)
+
+    def __iter__(self):
+        yield self.prefix
+        yield from base64_chunks(self.source.chunks())
+        yield self.suffix
+
+    @property
+    def headers(self):
+        return {"Content-Type": "application/json", "Content-Length": str(len(self))}
+
+
+class AsyncBody:
+    # httpx.AsyncClient 용 (동기 iterable 은 받지 않음), 임시 파일 읽기와 인코딩은 스레드에서
+    def __init__(self, body):
+        self.body = body
+
+    async def __aiter__(self):
+        async for chunk in iterate_in_thread(iter(self.body)):
+            yield chunk
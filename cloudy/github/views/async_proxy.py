@@ -0,0 +1,299 @@
+import json
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from login.utils import decrypt_token
+
+from github.client import async_github
+from github.conditional import async_cached_get
+from github.pagination import async_iter_pages, async_json_list_chunks, new_listing, parse_fields, project
+from github.gitdata import async_commit_files, async_existing_blobs, plan_upload, GitDataError
+from github.uploads import upload_from, close_sources, Base64JSONBody, AsyncBody, GitHubUploadRejected
+from github.contents import async_fetch_directory, async_cached_content, async_store_content, parse_bool, parse_max_bytes, GitHubContentsError
+
+
+class AsyncGitHubView(View):
+    """ASGI 서버에서 이벤트 루프로 실행되는 GitHub 프록시 뷰 (DRF APIView 는 async 미지원)
+
+    인증(JWT)과 토큰 복호화만 동기 코드로 처리하고 GitHub 호출은 모두 await
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            authenticated = await sync_to_async(JWTAuthentication().authenticate)(request)
+        except (AuthenticationFailed, InvalidToken) as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+            return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+
+        if authenticated is None:
+            return JsonResponse({"detail": "Authentication credentials were not provided."}, status=status.HTTP_401_UNAUTHORIZED)
+
+        request.user = authenticated[0]
+        try:
+            self.access_token = decrypt_token(request.user.github_access_token)
+        except Exception as e:
+            return JsonResponse({"error": "Token decrypt failed", "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return await super().dispatch(request, *args, **kwargs)
+
+    def request_data(self, request):
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+
+
+# repo 조회
+class AsyncGitHubRepoList(AsyncGitHubView):
+    async def get(self, request):
+        fields = parse_fields(request.GET.get("fields"))
+        if fields is None:
+            return JsonResponse({"error": "Invalid fields parameter"}, status=status.HTTP_400_BAD_REQUEST)
+
+        params = {"per_page": 100, "visibility": "public"}
+        res = await async_cached_get("/user/repos", self.access_token, params=params)
+
+        try:
+            repos_data = res.json()
+        except ValueError:
+            return JsonResponse({
+                "error": "Invalid JSON from GitHub",
+                "raw_response": res.text
+            }, status=status.HTTP_502_BAD_GATEWAY)
+
+        if res.status_code != status.HTTP_200_OK:
+            return JsonResponse({
+                "error": "GitHub API error",
+                "status_code": res.status_code,
+                "detail": repos_data
+            }, status=res.status_code)
+
+        listing = new_listing()
+
+        async def repos():
+            async for page in async_iter_pages("/user/repos", self.access_token, params, res, listing):
+                for repo in page:
+                    yield project(repo, fields)
+
+        return StreamingHttpResponse(async_json_list_chunks(repos(), listing), content_type="application/json", status=status.HTTP_200_OK)
+
+
+# 파일 내용 조회
+class AsyncGitHubRepoFileContentsView(AsyncGitHubView):
+    async def get(self, request):
+        repo_name = request.GET.get("repo_name")
+        branch = request.GET.get("branch", "main")
+        path = request.GET.get("path", "")
+        recursive = parse_bool(request.GET.get("recursive"))
+        with_content = parse_bool(request.GET.get("content"), default=True)
+        max_bytes = request.GET.get("max_bytes", settings.GITHUB_CONTENT_MAX_BYTES)
+
+        if not repo_name:
+            return JsonResponse({"error": "Missing required parameter: repo_name"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            max_bytes = parse_max_bytes(max_bytes)
+        except ValueError:
+            return JsonResponse({"error": "max_bytes must be a non-negative integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        api_url = f"/repos/{request.user.username}/{repo_name}/contents/{path}"
+        res = await async_cached_get(api_url, self.access_token, params={"ref": branch}, headers={"Accept": "application/vnd.github.v3+json"})
+        if res.status_code != status.HTTP_200_OK:
+            return JsonResponse({"error": "GitHub API error", "detail": res.json()}, status=res.status_code)
+
+        item = res.json()
+
+        if isinstance(item, list):
+            # 디렉토리: 각 파일 내용 포함해서 반환
+            try:
+                files_data, truncated = await async_fetch_directory(
+                    self.access_token, request.user.username, repo_name, branch, item,
+                    recursive=recursive, with_content=with_content, max_bytes=max_bytes
+                )
+            except GitHubContentsError as e:
+                return JsonResponse({"error": "GitHub API error", "detail": e.detail}, status=e.status_code)
+
+            response_data = {
+                "repo": repo_name,
+                "branch": branch,
+                "path": path,
+                "files": files_data
+            }
+            if truncated:
+                response_data["truncated"] = True
+            return JsonResponse(response_data, status=status.HTTP_200_OK)
+
+        elif isinstance(item, dict) and item.get("type") == "file":
+            # 단일 파일 요청
+            content = None
+            if with_content and item.get("download_url"):
+                content = await self.download(item)
+            return JsonResponse({
+                "repo": repo_name,
+                "branch": branch,
+                "path": path,
+                "file": {
+                    "name": item["name"],
+                    "path": item["path"],
+                    "content": content
+                }
+            }, status=status.HTTP_200_OK)
+
+        return JsonResponse({"error": "Unexpected GitHub API response"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    async def download(self, item):
+        content = await async_cached_content(item)
+        if content is None:
+            content = await async_store_content(item, await async_github.get(item["download_url"]))
+        return content
+
+
+# GitHub Actions 실행 결과 확인
+class AsyncGitHubActionsStatus(AsyncGitHubView):
+    async def get(self, request):
+        repo_name = request.GET.get("repo_name")
+        branch = request.GET.get("branch", "main")
+
+        if not repo_name:
+            return JsonResponse({
+                "error": "Missing required parameter: repo_name"
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        api_url = f"/repos/{request.user.username}/{repo_name}/actions/runs"
+        res = await async_cached_get(api_url, self.access_token, params={"branch": branch, "per_page": 1})
+
+        try:
+            result_data = res.json()
+        except ValueError:
+            return JsonResponse({
+                "error": "Invalid JSON from GitHub",
+                "raw_response": res.text
+            }, status=status.HTTP_502_BAD_GATEWAY)
+
+        if res.status_code != 200:
+            return JsonResponse({
+                "error": "GitHub API error",
+                "status_code": res.status_code,
+                "detail": result_data
+            }, status=res.status_code)
+
+        runs = result_data.get("workflow_runs", [])
+        if not runs:
+            return JsonResponse({
+                "message": f"No workflow runs found on branch '{branch}'"
+            }, status=status.HTTP_204_NO_CONTENT)
+
+        latest = runs[0]
+        return JsonResponse({
+            "id": latest["id"],
+            "name": latest.get("name"),
+            "branch": latest.get("head_branch"),
+            "status": latest.get("status"),
+            "conclusion": latest.get("conclusion"),
+            "html_url": latest.get("html_url"),
+            "updated_at": latest.get("updated_at")
+        }, status=status.HTTP_200_OK)
+
+
+# 파일 업로드
+class AsyncGitHubUploadFiles(AsyncGitHubView):
+    async def post(self, request):
+        # 본문 파싱(multipart 포함), 임시 파일 기록, blob SHA 계산은 디스크를 읽으므로 스레드에서 처리
+        try:
+            fields, sources = await asyncio.to_thread(self.upload_sources, request)
+        except GitHubUploadRejected as e:
+            return JsonResponse({"error": str(e)}, status=e.status_code)
+
+        try:
+            return await self.upload(request.user.username, fields, sources)
+        finally:
+            await asyncio.to_thread(close_sources, sources)
+
+    def upload_sources(self, request):
+        # JSON(files 에 내용 포함), multipart(files 파일 업로드), 그 외 본문은 파일 하나로 스트림에서 직접 읽음
+        content_type = (request.content_type or '').split(';')[0].strip().lower()
+        if content_type == "application/json":
+            return upload_from(content_type, self.request_data(request), None, None, request.GET)
+        if content_type == "multipart/form-data":
+            return upload_from(content_type, request.POST, request.FILES, None, request.GET)
+        return upload_from(content_type, None, None, request, request.GET, request.META.get("CONTENT_LENGTH"))
+
+    async def upload(self, owner, fields, sources):
+        repo = fields["repo_name"]
+        branch = fields["branch"]
+        commit_message = fields["commit_message"]
+
+        # 1. 브랜치 존재 여부 확인
+        ref_resp = await async_github.get(f"/repos/{owner}/{repo}/git/ref/heads/{branch}", self.access_token)
+        if ref_resp.status_code != 200:
+            return JsonResponse({
+                "error": f"Branch '{branch}' does not exist. Please create it first."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # 2. 브랜치 트리와 blob SHA 를 비교해 바뀐 파일만 업로드
+        head_sha = ref_resp.json()["object"]["sha"]
+        try:
+            existing = await async_existing_blobs(self.access_token, owner, repo, head_sha, [source.path for source in sources])
+        except GitDataError as e:
+            return JsonResponse({
+                "error": "Failed to read branch tree",
+                "detail": e.detail
+            }, status=e.status_code)
+
+        changed, report = plan_upload(sources, existing)
+        if not changed:
+            return JsonResponse({
+                "message": "No changes to upload",
+                **report
+            }, status=status.HTTP_200_OK)
+
+        # 3-a. bulk: 전체 파일을 커밋 하나로 (중간에 실패해도 브랜치는 그대로)
+        if fields["bulk"]:
+            try:
+                commit_sha = await async_commit_files(self.access_token, owner, repo, branch, head_sha, commit_message, changed)
+            except GitDataError as e:
+                return JsonResponse({
+                    "error": "Failed to commit files",
+                    "detail": e.detail
+                }, status=e.status_code)
+
+            return JsonResponse({
+                "message": "Files uploaded successfully",
+                "commit": commit_sha,
+                **report
+            }, status=status.HTTP_201_CREATED)
+
+        # 3. 파일 업로드 (같은 브랜치에 커밋이 쌓이므로 순서대로, 내용은 base64 로 청크 단위 인코딩하며 전송)
+        for source in changed:
+            payload = {
+                "message": commit_message,
+                "branch": branch
+            }
+            # 기존 파일을 덮어쓸 때는 현재 blob SHA 가 필요
+            if source.path in existing:
+                payload["sha"] = existing[source.path]
+
+            body = Base64JSONBody(payload, source)
+            upload_resp = await async_github.put(f"/repos/{owner}/{repo}/contents/{source.path}", self.access_token, content=AsyncBody(body), headers=body.headers)
+
+            if upload_resp.status_code not in (200, 201):
+                return JsonResponse({
+                    "error": f"Failed to upload '{source.path}'",
+                    "detail": upload_resp.json()
+                }, status=upload_resp.status_code)
+
+        return JsonResponse({
+            "message": "Files uploaded successfully",
+            **report
+        }, status=status.HTTP_201_CREATED)
@@ -1,4 +1,4 @@
-import requests
+from github.conditional import cached_get
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -28,14 +28,9 @@ class GitHubActionsStatus(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         github_username = user.username
-        api_url = f"https://api.github.com/repos/{github_username}/{repo_name}/actions/runs?branch={branch}&per_page=1"
+        api_url = f"/repos/{github_username}/{repo_name}/actions/runs"
 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json"
-        }
-
-        res = requests.get(api_url, headers=headers)
+        res = cached_get(api_url, access_token, params={"branch": branch, "per_page": 1})
 
         try:
             result_data = res.json()
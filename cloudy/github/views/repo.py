@@ -1,4 +1,12 @@
-import requests
+from django.conf import settings
+from github.client import github
+from github.conditional import cached_get
+from github.pagination import iter_pages, json_list_chunks, new_listing, parse_fields, project
+from github.streaming import streaming_response
+from github.contents import (
+    fetch_directory, download_file, parse_bool, parse_max_bytes, GitHubContentsError,
+    resolve_commit, fetch_tree, fetch_tree_contents, path_filter,
+)
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -11,19 +19,18 @@ class GitHubRepoList(APIView):
 
     def get(self, request):
         user = request.user
+        # ?fields=name,html_url: 응답에 포함할 필드만 선택
+        fields = parse_fields(request.query_params.get("fields"))
+        if fields is None:
+            return Response({"error": "Invalid fields parameter"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             access_token = decrypt_token(user.github_access_token)
         except Exception as e:
             return Response({"error": "Token decrypt failed", "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        github_api_url = "https://api.github.com/user/repos?per_page=100&visibility=public"
-
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json",
-        }
-
-        res = requests.get(github_api_url, headers=headers)
+        params = {"per_page": 100, "visibility": "public"}
+        res = cached_get("/user/repos", access_token, params=params)
 
         try:
             repos_data = res.json()
@@ -40,19 +47,11 @@ class GitHubRepoList(APIView):
                 "detail": res.json()
             }, status=res.status_code)
         
-        repos_data = res.json()
-        response_data = []
-
-        for repo in repos_data:
-            response_data.append({
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "html_url": repo["html_url"],
-                "default_branch": repo["default_branch"],
-                "owner": repo["owner"]["login"],
-            })
-
-        return Response(response_data, status=status.HTTP_200_OK)
+        # 100개 넘는 저장소: 나머지 페이지를 병렬로 받아 순서대로 스트리밍
+        listing = new_listing()
+        pages = iter_pages("/user/repos", access_token, params, res, listing)
+        repos = (project(repo, fields) for page in pages for repo in page)
+        return streaming_response(request, json_list_chunks(repos, listing), content_type="application/json", status=status.HTTP_200_OK)
     
 # repo 생성
 class GitHubCreateRepo(APIView):
@@ -74,12 +73,6 @@ class GitHubCreateRepo(APIView):
         except Exception as e:
             return Response({"error": "Token decrypt failed", "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        github_api_url = "https://api.github.com/user/repos"
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json",
-        }
-
         payload = {
             "name": repo_name,
             "description": description,
@@ -87,7 +80,7 @@ class GitHubCreateRepo(APIView):
             "auto_init": auto_init
         }
 
-        res = requests.post(github_api_url, headers=headers, json=payload)
+        res = github.post("/user/repos", access_token, json=payload)
 
         try:
             response_data = res.json()
@@ -140,57 +133,58 @@ class GitHubRepoFileContentsView(APIView):
         repo_name = request.query_params.get("repo_name")
         branch = request.query_params.get("branch", "main")
         path = request.query_params.get("path", "")
+        # 디렉토리 조회 옵션: 하위 디렉토리 포함, 파일 내용 제외, 내용 총 크기 제한
+        recursive = parse_bool(request.query_params.get("recursive"))
+        with_content = parse_bool(request.query_params.get("content"), default=True)
+        max_bytes = request.query_params.get("max_bytes", settings.GITHUB_CONTENT_MAX_BYTES)
 
         if not repo_name:
             return Response({"error": "Missing required parameter: repo_name"}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            max_bytes = parse_max_bytes(max_bytes)
+        except ValueError:
+            return Response({"error": "max_bytes must be a non-negative integer"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             access_token = decrypt_token(user.github_access_token)
         except Exception as e:
             return Response({"error": "Token decrypt failed", "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         github_username = user.username
-        api_url = f"https://api.github.com/repos/{github_username}/{repo_name}/contents/{path}?ref={branch}"
-
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
+        api_url = f"/repos/{github_username}/{repo_name}/contents/{path}"
 
-        res = requests.get(api_url, headers=headers)
+        res = cached_get(api_url, access_token, params={"ref": branch}, headers={"Accept": "application/vnd.github.v3+json"})
         if res.status_code != status.HTTP_200_OK:
             return Response({"error": "GitHub API error", "detail": res.json()}, status=res.status_code)
 
         item = res.json()
 
         if isinstance(item, list):
-            # 디렉토리: 각 파일 내용 포함해서 반환
-            files_data = []
-            for file in item:
-                content = None
-                if file["type"] == "file" and file.get("download_url"):
-                    file_res = requests.get(file["download_url"])
-                    if file_res.status_code == 200:
-                        content = file_res.text
-                files_data.append({
-                    "name": file["name"],
-                    "path": file["path"],
-                    "content": content
-                })
-            return Response({
+            # 디렉토리: 각 파일 내용 포함해서 반환 (파일 내용은 병렬로 요청)
+            try:
+                files_data, truncated = fetch_directory(
+                    access_token, github_username, repo_name, branch, item,
+                    recursive=recursive, with_content=with_content, max_bytes=max_bytes
+                )
+            except GitHubContentsError as e:
+                return Response({"error": "GitHub API error", "detail": e.detail}, status=e.status_code)
+
+            response_data = {
                 "repo": repo_name,
                 "branch": branch,
                 "path": path,
                 "files": files_data
-            }, status=status.HTTP_200_OK)
+            }
+            if truncated:
+                response_data["truncated"] = True
+            return Response(response_data, status=status.HTTP_200_OK)
 
         elif isinstance(item, dict) and item.get("type") == "file":
             # 단일 파일 요청
             content = None
-            if item.get("download_url"):
-                file_res = requests.get(item["download_url"])
-                if file_res.status_code == 200:
-                    content = file_res.text
+            if with_content and item.get("download_url"):
+                content = download_file(item)
             return Response({
                 "repo": repo_name,
                 "branch": branch,
@@ -202,4 +196,65 @@ class GitHubRepoFileContentsView(APIView):
                 }
             }, status=status.HTTP_200_OK)
 
-        return Response({"error": "Unexpected GitHub API response"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({"error": "Unexpected GitHub API response"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# 저장소 전체 트리 조회 (Git Trees API 한 번), 파일 내용은 요청한 경로만
+class GitHubRepoTreeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        repo_name = request.query_params.get("repo_name")
+        branch = request.query_params.get("branch", "main")
+        # pattern=**/*.tf (여러 개는 반복 또는 쉼표로 구분), paths=내용을 받을 파일 경로
+        patterns = self.list_param(request, "pattern")
+        paths = self.list_param(request, "paths")
+        max_bytes = request.query_params.get("max_bytes", settings.GITHUB_CONTENT_MAX_BYTES)
+
+        if not repo_name:
+            return Response({"error": "Missing required parameter: repo_name"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            max_bytes = parse_max_bytes(max_bytes)
+        except ValueError:
+            return Response({"error": "max_bytes must be a non-negative integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            access_token = decrypt_token(user.github_access_token)
+        except Exception as e:
+            return Response({"error": "Token decrypt failed", "detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            commit_sha = resolve_commit(access_token, user.username, repo_name, branch)
+            entries, truncated = fetch_tree(access_token, user.username, repo_name, commit_sha)
+
+            matches = path_filter(patterns)
+            entries = [entry for entry in entries if matches(entry["path"])]
+
+            response_data = {
+                "repo": repo_name,
+                "branch": branch,
+                "commit": commit_sha,
+                "truncated": truncated,
+                "entries": entries,
+            }
+
+            if paths:
+                by_path = {entry["path"]: entry for entry in entries if entry["type"] == "file"}
+                requested = [by_path[path] for path in dict.fromkeys(paths) if path in by_path]
+                contents, content_truncated = fetch_tree_contents(access_token, user.username, repo_name, commit_sha, requested, max_bytes)
+                response_data["files"] = [{"path": path, "content": contents.get(path)} for path in dict.fromkeys(paths)]
+                if content_truncated:
+                    response_data["content_truncated"] = True
+
+        except GitHubContentsError as e:
+            return Response({"error": "GitHub API error", "detail": e.detail}, status=e.status_code)
+
+        return Response(response_data, status=status.HTTP_200_OK)
+
+    def list_param(self, request, name):
+        values = []
+        for value in request.query_params.getlist(name):
+            values.extend(item.strip() for item in value.split(",") if item.strip())
+        return values
@@ -1,5 +1,6 @@
 import base64
-import requests
+from django.conf import settings
+from github.client import github
 import nacl.public
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -32,14 +33,10 @@ class GitHubUploadSecrets(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         github_username = user.username 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json"
-        }
 
         # Step 1. 공개키 조회
-        key_url = f"https://api.github.com/repos/{github_username}/{repo_name}/actions/secrets/public-key"
-        key_res = requests.get(key_url, headers=headers)
+        key_url = f"/repos/{github_username}/{repo_name}/actions/secrets/public-key"
+        key_res = github.get(key_url, access_token)
 
         try:
             key_data = key_res.json()
@@ -69,13 +66,13 @@ class GitHubUploadSecrets(APIView):
         for name, value in secrets.items():
             try:
                 encrypted = self.encrypt_secret(public_key, value)
-                secret_url = f"https://api.github.com/repos/{github_username}/{repo_name}/actions/secrets/{name}"
+                secret_url = f"/repos/{github_username}/{repo_name}/actions/secrets/{name}"
                 payload = {
                     "encrypted_value": encrypted,
                     "key_id": key_id
                 }
 
-                secret_res = requests.put(secret_url, headers=headers, json=payload)
+                secret_res = github.put(secret_url, access_token, json=payload)
                 if secret_res.status_code not in (201, 204):
                     failed.append({
                         name: secret_res.json()
@@ -94,7 +91,7 @@ class GitHubUploadSecrets(APIView):
         return Response({
             "message": f"Secrets uploaded to '{repo_name}'",
             "secrets": list(secrets.keys()),
-            "github_url": f"https://github.com/{github_username}/{repo_name}/settings/secrets/actions"
+            "github_url": f"{settings.GITHUB_URL}/{github_username}/{repo_name}/settings/secrets/actions"
         }, status=status.HTTP_201_CREATED)
 
     def encrypt_secret(self, public_key: str, secret_value: str) -> str:
@@ -1,17 +1,20 @@
-import requests
-import base64
+from github.client import github
+from github.gitdata import commit_files, existing_blobs, plan_upload, GitDataError
+from github.uploads import upload_from, close_sources, Base64JSONBody, GitHubUploadRejected
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework import status
 from login.utils import decrypt_token
 
 class GitHubUploadFiles(APIView):
     permission_classes = [IsAuthenticated]
+    # JSON(files 에 내용 포함), multipart(files 파일 업로드), 그 외 본문은 파일 하나로 request.stream 에서 직접 읽음
+    parser_classes = [JSONParser, MultiPartParser]
 
     def post(self, request):
         user = request.user
-        data = request.data
 
         try:
             access_token = decrypt_token(user.github_access_token)
@@ -19,55 +22,88 @@ class GitHubUploadFiles(APIView):
             return Response({"error": "Token decrypt failed", "detail": str(e)},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        owner = user.username
-        repo = data.get("repo_name")
-        branch = data.get("branch") 
-        commit_message = data.get("commit_message")
-        files = data.get("files", [])
+        content_type = (request.content_type or '').split(';')[0].strip().lower()
+        try:
+            if content_type in ("application/json", "multipart/form-data"):
+                fields, sources = upload_from(content_type, request.data, request.FILES, None, request.query_params)
+            else:
+                fields, sources = upload_from(content_type, None, None, request.stream, request.query_params, request.META.get("CONTENT_LENGTH"))
+        except GitHubUploadRejected as e:
+            return Response({"error": str(e)}, status=e.status_code)
 
-        if not all([repo, branch, commit_message, files]):
-            return Response({"error": "Missing required fields"},
-                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return self.upload(access_token, user.username, fields, sources)
+        finally:
+            close_sources(sources)
 
-        headers = {
-            "Authorization": f"token {access_token}",
-            "Accept": "application/vnd.github+json",
-        }
+    def upload(self, access_token, owner, fields, sources):
+        repo = fields["repo_name"]
+        branch = fields["branch"]
+        commit_message = fields["commit_message"]
 
         # 1. 브랜치 존재 여부 확인
-        ref_url = f"https://api.github.com/repos/{owner}/{repo}/git/ref/heads/{branch}"
-        ref_resp = requests.get(ref_url, headers=headers)
+        ref_url = f"/repos/{owner}/{repo}/git/ref/heads/{branch}"
+        ref_resp = github.get(ref_url, access_token)
 
         if ref_resp.status_code != 200:
             return Response({
                 "error": f"Branch '{branch}' does not exist. Please create it first."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # 2. 파일 업로드
-        for file in files:
-            path = file.get("path")
-            content = file.get("content")
-            if not path or content is None:
+        # 2. 브랜치 트리와 blob SHA 를 비교해 바뀐 파일만 업로드
+        head_sha = ref_resp.json()["object"]["sha"]
+        try:
+            existing = existing_blobs(access_token, owner, repo, head_sha, [source.path for source in sources])
+        except GitDataError as e:
+            return Response({
+                "error": "Failed to read branch tree",
+                "detail": e.detail
+            }, status=e.status_code)
+
+        changed, report = plan_upload(sources, existing)
+        if not changed:
+            return Response({
+                "message": "No changes to upload",
+                **report
+            }, status=status.HTTP_200_OK)
+
+        # 3-a. bulk: 전체 파일을 커밋 하나로 (중간에 실패해도 브랜치는 그대로)
+        if fields["bulk"]:
+            try:
+                commit_sha = commit_files(access_token, owner, repo, branch, head_sha, commit_message, changed)
+            except GitDataError as e:
                 return Response({
-                    "error": "Each file must include 'path' and 'content'"
-                }, status=status.HTTP_400_BAD_REQUEST)
+                    "error": "Failed to commit files",
+                    "detail": e.detail
+                }, status=e.status_code)
+
+            return Response({
+                "message": "Files uploaded successfully",
+                "commit": commit_sha,
+                **report
+            }, status=status.HTTP_201_CREATED)
 
-            encoded = base64.b64encode(content.encode()).decode()
-            file_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{path}"
+        # 3. 파일 업로드 (내용은 base64 로 청크 단위 인코딩하며 전송)
+        for source in changed:
+            file_url = f"/repos/{owner}/{repo}/contents/{source.path}"
             file_payload = {
                 "message": commit_message,
-                "content": encoded,
                 "branch": branch
             }
+            # 기존 파일을 덮어쓸 때는 현재 blob SHA 가 필요
+            if source.path in existing:
+                file_payload["sha"] = existing[source.path]
 
-            upload_resp = requests.put(file_url, headers=headers, json=file_payload)
+            body = Base64JSONBody(file_payload, source)
+            upload_resp = github.put(file_url, access_token, data=body, headers=body.headers)
 
             if upload_resp.status_code not in (200, 201):
                 return Response({
-                    "error": f"Failed to upload '{path}'",
+                    "error": f"Failed to upload '{source.path}'",
                     "detail": upload_resp.json()
                 }, status=upload_resp.status_code)
 
         return Response({
-            "message": f"Files uploaded successfully"
+            "message": f"Files uploaded successfully",
+            **report
         }, status=status.HTTP_201_CREATED)
@@ -1,4 +1,3 @@
-import requests
 from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
@@ -6,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
+from github.client import github
 from .utils import get_tokens_for_user, encrypt_token
 from urllib.parse import urlencode
 
@@ -18,7 +18,7 @@ class GitHubOAuthURLView(APIView):
             "redirect_uri": settings.GITHUB_CALLBACK_URL,
             "scope": "read:user user:email workflow public_repo admin:repo_hook",
         }
-        github_auth_url = f"https://github.com/login/oauth/authorize?{urlencode(params)}"
+        github_auth_url = f"{settings.GITHUB_URL}/login/oauth/authorize?{urlencode(params)}"
         return Response({"url": github_auth_url})
 
 
@@ -30,7 +30,7 @@ class GitHubLogin(APIView):
             return Response({"error": "code is required"}, status=400)
 
         # 1. access token 요청
-        token_res = requests.post("https://github.com/login/oauth/access_token", headers={
+        token_res = github.post(f"{settings.GITHUB_URL}/login/oauth/access_token", headers={
             "Accept": "application/json"
         }, data={
             "client_id": settings.GITHUB_CLIENT_ID,
@@ -44,7 +44,7 @@ class GitHubLogin(APIView):
             return Response({"error": "invalid code", "details": token_json}, status=400)
 
         # 2. 사용자 정보 요청
-        user_info = requests.get("https://api.github.com/user", headers={
+        user_info = github.get("/user", headers={
             "Authorization": f"Bearer {access_token}",
             "Accept": "application/json"
         }).json()
@@ -56,7 +56,7 @@ class GitHubLogin(APIView):
 
         # 이메일(비공개 시) 별도 API 호출
         if not email:
-            email_list = requests.get("https://api.github.com/user/emails", headers={
+            email_list = github.get("/user/emails", headers={
                 "Authorization": f"Bearer {access_token}",
                 "Accept": "application/json"
             }).json()
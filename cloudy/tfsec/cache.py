@@ -0,0 +1,224 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+
+from .models import ScanResultCache
+from .runner import (
+    TFSEC_ARGS, get_tfsec_version, run_tfsec, relativize_outcome,
+    scan_terraform_code, scan_terraform_batch,
+)
+
+
+# 마지막 DB 캐시 정리 시각 (프로세스 단위)
+_last_prune = 0.0
+_prune_lock = threading.Lock()
+
+
+def normalize_source(terraform_code: str) -> str:
+    # 줄바꿈/줄끝 공백 차이는 tfsec 결과에 영향이 없으므로 같은 키로 취급
+    lines = terraform_code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).rstrip('\n')
+
+
+def _key_digest():
+    digest = hashlib.sha256()
+    digest.update(get_tfsec_version().encode())
+    digest.update(b'\0')
+    digest.update(' '.join(TFSEC_ARGS).encode())
+    digest.update(b'\0')
+    return digest
+
+
+def make_cache_key(terraform_code: str) -> str:
+    digest = _key_digest()
+    digest.update(normalize_source(terraform_code).encode())
+    return digest.hexdigest()
+
+
+def make_batch_cache_key(terraform_code: str) -> str:
+    # 배치 실행에서 나눈 결과는 stderr, 조각별 종료 코드가 단일 실행과 다르므로 단일 스캔 키와 분리
+    digest = _key_digest()
+    digest.update(b'batch\0')
+    digest.update(normalize_source(terraform_code).encode())
+    return digest.hexdigest()
+
+
+def make_tree_cache_key(tree_digest: str) -> str:
+    # 여러 파일로 된 모듈: 파일 경로/내용 해시 목록의 해시 기준
+    digest = _key_digest()
+    digest.update(b'tree\0')
+    digest.update(tree_digest.encode())
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """크기(max_size)와 TTL(초)로 제한되는 스레드 안전 LRU"""
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+memory_cache = LRUCache(settings.TFSEC_CACHE_SIZE, settings.TFSEC_CACHE_TTL)
+
+
+def get_cached_outcome(key: str):
+    """(tfsec 실행 결과, 'memory' | 'db') 또는 (None, None)"""
+    outcome = memory_cache.get(key)
+    if outcome is not None:
+        return outcome, 'memory'
+
+    expires_before = timezone.now() - timedelta(seconds=settings.TFSEC_CACHE_TTL)
+    entry = ScanResultCache.objects.filter(key=key, last_hit_at__gte=expires_before).first()
+    if entry is None:
+        return None, None
+
+    ScanResultCache.objects.filter(pk=entry.pk).update(
+        hits=entry.hits + 1,
+        last_hit_at=timezone.now()
+    )
+    memory_cache.set(key, entry.outcome)
+    return entry.outcome, 'db'
+
+
+def set_cached_outcome(key: str, outcome: dict):
+    memory_cache.set(key, outcome)
+
+    try:
+        ScanResultCache.objects.update_or_create(
+            key=key,
+            defaults={'outcome': outcome, 'last_hit_at': timezone.now()}
+        )
+    except IntegrityError:
+        # 다른 워커가 같은 키를 먼저 저장한 경우
+        return
+    if prune_due():
+        prune_db_cache()
+
+
+def prune_due():
+    # 정리 쿼리는 저장마다가 아니라 TFSEC_DB_CACHE_PRUNE_INTERVAL 초에 한 번만
+    global _last_prune
+    now = time.time()
+    with _prune_lock:
+        if now - _last_prune < settings.TFSEC_DB_CACHE_PRUNE_INTERVAL:
+            return False
+        _last_prune = now
+        return True
+
+
+def prune_db_cache():
+    # TTL 지난 항목 삭제 후, 최대 행 수를 넘으면 오래 안 쓰인 것부터 삭제
+    expires_before = timezone.now() - timedelta(seconds=settings.TFSEC_CACHE_TTL)
+    ScanResultCache.objects.filter(last_hit_at__lt=expires_before).delete()
+
+    stale_ids = list(
+        ScanResultCache.objects.order_by('-last_hit_at')
+        .values_list('id', flat=True)[settings.TFSEC_DB_CACHE_MAX_ROWS:]
+    )
+    if stale_ids:
+        ScanResultCache.objects.filter(id__in=stale_ids).delete()
+
+
+def cacheable_outcome(outcome: dict) -> bool:
+    # tfsec 결과(JSON)가 나온 실행만 캐시 — 크래시, 자원 제한으로 종료된 실행은 다음 요청에서 다시 시도
+    if outcome['returncode'] not in (0, 1):
+        return False
+    try:
+        return isinstance(json.loads(outcome['stdout']), dict)
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+
+def cached_scan(terraform_code: str):
+    """캐시 조회 후 없으면 tfsec 실행 → (실행 결과, 캐시 계층 | None, 캐시 키)"""
+    cache_key = make_cache_key(terraform_code)
+    outcome, cache_tier = get_cached_outcome(cache_key)
+
+    if outcome is None:
+        outcome = scan_terraform_code(terraform_code)
+        if cacheable_outcome(outcome):
+            set_cached_outcome(cache_key, outcome)
+
+    return outcome, cache_tier, cache_key
+
+
+def cached_directory_scan(target_dir: str, tree_digest: str):
+    """디렉토리 단위 스캔 (cached_scan 과 같은 반환 형식)"""
+    cache_key = make_tree_cache_key(tree_digest)
+    outcome, cache_tier = get_cached_outcome(cache_key)
+
+    if outcome is None:
+        outcome = relativize_outcome(run_tfsec(target_dir), target_dir)
+        if cacheable_outcome(outcome):
+            set_cached_outcome(cache_key, outcome)
+
+    return outcome, cache_tier, cache_key
+
+
+def cached_batch_scan(snippets: dict) -> dict:
+    """캐시에 없는 조각만 모아 한 번에 스캔 → {이름: (실행 결과, 캐시 계층 | None)}
+
+    단일 스캔 결과는 배치에서도 그대로 쓰고, 배치 결과는 배치 전용 키로만 저장 (단일 스캔 요청에는 쓰지 않음)
+    """
+    results = {}
+    misses = {}
+    miss_keys = {}
+
+    for name, terraform_code in snippets.items():
+        outcome, cache_tier = get_cached_outcome(make_cache_key(terraform_code))
+        if outcome is None:
+            cache_key = make_batch_cache_key(terraform_code)
+            outcome, cache_tier = get_cached_outcome(cache_key)
+        if outcome is None:
+            misses[name] = terraform_code
+            miss_keys[name] = cache_key
+        else:
+            results[name] = (outcome, cache_tier)
+
+    if misses:
+        outcomes, split = scan_terraform_batch(misses)
+        for name, outcome in outcomes.items():
+            # 배치 전체 실패는 특정 조각의 결과가 아니므로 캐시하지 않음
+            if split:
+                set_cached_outcome(miss_keys[name], outcome)
+            results[name] = (outcome, None)
+
+    return {name: results[name] for name in snippets}
@@ -0,0 +1,42 @@
+# 규칙 단위로 반복되는 필드 (compact 형식에서는 rules 사전에 한 번만 기록)
+RULE_FIELDS = (
+    'long_id', 'rule_description', 'rule_provider', 'rule_service',
+    'impact', 'resolution', 'links', 'severity', 'description',
+)
+
+
+def compact_finding(rule_id, result: dict, rule: dict) -> dict:
+    """규칙 id, 리소스, 위치만 가진 결과 (규칙 설명은 rules 사전 참조)"""
+    location = result.get('location') or {}
+    finding = {
+        'rule_id': rule_id,
+        'resource': result.get('resource'),
+        'location': {
+            'filename': location.get('filename'),
+            'start_line': location.get('start_line'),
+            'end_line': location.get('end_line'),
+        },
+    }
+    # 결과별 설명이 규칙 대표 설명과 다를 때만 포함
+    description = result.get('description')
+    if description is not None and description != rule['description']:
+        finding['description'] = description
+    return finding
+
+
+def compact_results(results) -> dict:
+    """tfsec 결과 목록 → {"rules": {rule_id: 메타데이터}, "results": [간소화된 결과]}"""
+    rules = {}
+    findings = []
+
+    for result in results or []:
+        rule_id = result.get('rule_id') or result.get('long_id') or ''
+        rule = rules.get(rule_id)
+        if rule is None:
+            rule = rules[rule_id] = {field: result.get(field) for field in RULE_FIELDS}
+        findings.append(compact_finding(rule_id, result, rule))
+
+    return {
+        'rules': rules,
+        'results': findings,
+    }
@@ -0,0 +1,76 @@
+import json
+import hashlib
+import posixpath
+
+
+def finding_fingerprint(result: dict) -> str:
+    """줄 번호와 무관한 결과 식별자 (규칙, 리소스, 정규화된 파일 경로 기준)"""
+    location = result.get('location') or {}
+    filename = (location.get('filename') or '').replace('\\', '/')
+    filename = posixpath.normpath(filename).lstrip('/') if filename else ''
+    rule = result.get('long_id') or result.get('rule_id') or ''
+    key = f"{rule}\0{result.get('resource') or ''}\0{filename}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def fingerprint_results(results) -> list:
+    # 같은 식별자가 여러 번 나오면 순번을 붙여 구분 (tfsec 출력 순서와 무관하도록 결과 내용 순으로 매김)
+    fingerprints = [finding_fingerprint(result) for result in results]
+    duplicates = {}
+    for index, fingerprint in enumerate(fingerprints):
+        duplicates.setdefault(fingerprint, []).append(index)
+
+    for fingerprint, indexes in duplicates.items():
+        if len(indexes) > 1:
+            indexes.sort(key=lambda index: json.dumps(results[index], sort_keys=True))
+            for count, index in enumerate(indexes[1:], 1):
+                fingerprints[index] = f'{fingerprint}:{count}'
+    return fingerprints
+
+
+def load_baseline(baseline) -> set:
+    """억제 기준선: 식별자 문자열 목록, tfsec 결과 목록, 또는 {"results": [...]} (JSON 문자열도 허용)
+
+    형식이 맞지 않으면 ValueError
+    """
+    if baseline is None or baseline == '':
+        return set()
+
+    if isinstance(baseline, str):
+        # form 필드로 전달된 JSON
+        try:
+            baseline = json.loads(baseline)
+        except json.JSONDecodeError:
+            raise ValueError('baseline is not valid JSON')
+
+    if isinstance(baseline, dict):
+        baseline = baseline.get('results') or []
+    if not isinstance(baseline, list):
+        raise ValueError('baseline must be a list or an object with results')
+
+    fingerprints = set()
+    results = []
+    for item in baseline:
+        if isinstance(item, str):
+            fingerprints.add(item)
+        elif isinstance(item, dict):
+            results.append(item)
+
+    fingerprints.update(fingerprint_results(results))
+    return fingerprints
+
+
+def diff_fingerprints(base: dict, head: dict, suppressed=frozenset()) -> dict:
+    """{식별자: id} 두 개 비교 → 새로 생긴/해결된 id 목록 (집합 연산, O(n))"""
+    base_keys = base.keys()
+    head_keys = head.keys()
+
+    new_keys = head_keys - base_keys
+    suppressed_keys = new_keys & suppressed
+
+    return {
+        'new': sorted(head[key] for key in new_keys - suppressed_keys),
+        'fixed': sorted(base[key] for key in base_keys - head_keys),
+        'unchanged_count': len(head_keys & base_keys),
+        'suppressed_count': len(suppressed_keys),
+    }
@@ -0,0 +1,57 @@
+import json
+import hashlib
+
+from django.conf import settings
+
+from .cache import LRUCache, normalize_source
+from .hcl import parse, HCLSyntaxError
+from .rules import evaluate
+
+MODE_FAST = 'fast'
+MODE_FULL = 'full'
+
+# 파싱된 AST 캐시 (규칙만 바뀌어도 재파싱 없이 재평가)
+ast_cache = LRUCache(settings.TFSEC_AST_CACHE_SIZE, settings.TFSEC_CACHE_TTL)
+
+
+def parse_cached(terraform_code: str) -> list:
+    source = normalize_source(terraform_code)
+    key = hashlib.sha256(source.encode()).hexdigest()
+
+    # 문법 오류도 함께 캐시 (같은 잘못된 코드가 반복 제출되어도 재파싱하지 않음)
+    blocks = ast_cache.get(key)
+    if blocks is None:
+        try:
+            blocks = parse(source)
+        except HCLSyntaxError as e:
+            blocks = e
+        ast_cache.set(key, blocks)
+
+    if isinstance(blocks, HCLSyntaxError):
+        raise blocks
+    return blocks
+
+
+def check_syntax(terraform_code: str) -> list:
+    """tfsec 실행 전 문법 검사 → [{'line', 'column', 'message'}] (문제가 없으면 빈 목록)"""
+    if not settings.TFSEC_SYNTAX_PRECHECK or not isinstance(terraform_code, str):
+        return []
+
+    try:
+        parse_cached(terraform_code)
+    except HCLSyntaxError as e:
+        return [{'line': e.line, 'column': e.column, 'message': e.message}]
+    except Exception:
+        # 깊은 중첩(RecursionError) 등 파서 자체의 한계는 입력 오류가 아니므로 tfsec 판단에 맡김
+        return []
+    return []
+
+
+def fast_scan(terraform_code: str) -> dict:
+    """프로세스 내 규칙 엔진으로 스캔 (tfsec 실행 결과와 같은 형식, 문법 오류 시 HCLSyntaxError)"""
+    results = evaluate(parse_cached(terraform_code))
+    return {
+        'returncode': 1 if results else 0,
+        'stdout': json.dumps({'results': results or None}, indent=2),
+        'stderr': '',
+    }
@@ -0,0 +1,569 @@
+"""Terraform 용 HCL2 부분 파서 (fast 모드 규칙 엔진용)
+
+블록/속성/리터럴 값은 파이썬 값으로 변환하고, 참조·함수 호출·연산식처럼
+정적으로 값을 알 수 없는 식은 Expression(원본 텍스트)으로 남긴다.
+"""
+import re
+
+
+class HCLSyntaxError(Exception):
+    def __init__(self, message, line, column):
+        super().__init__(f'{message} (line {line}, column {column})')
+        self.message = message
+        self.line = line
+        self.column = column
+
+
+class Expression:
+    """정적으로 평가하지 않는 식 (참조, 함수 호출, 연산 등)"""
+
+    __slots__ = ('source',)
+
+    def __init__(self, source):
+        self.source = source
+
+    def __repr__(self):
+        return f'Expression({self.source!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, Expression) and other.source == self.source
+
+    def __hash__(self):
+        return hash(self.source)
+
+
+class Attribute:
+    __slots__ = ('name', 'value', 'line', 'end_line')
+
+    def __init__(self, name, value, line, end_line):
+        self.name = name
+        self.value = value
+        self.line = line
+        self.end_line = end_line
+
+
+class Block:
+    __slots__ = ('type', 'labels', 'attributes', 'blocks', 'line', 'end_line')
+
+    def __init__(self, block_type, labels, line):
+        self.type = block_type
+        self.labels = labels
+        self.attributes = {}
+        self.blocks = []
+        self.line = line
+        self.end_line = line
+
+    def get(self, name, default=None):
+        attribute = self.attributes.get(name)
+        return attribute.value if attribute is not None else default
+
+    def children(self, block_type):
+        return [block for block in self.blocks if block.type == block_type]
+
+
+class Token:
+    __slots__ = ('kind', 'value', 'start', 'end', 'line', 'column')
+
+    def __init__(self, kind, value, start, end, line, column):
+        self.kind = kind
+        self.value = value
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = column
+
+
+# 토큰 종류
+IDENT = 'ident'
+NUMBER = 'number'
+STRING = 'string'
+NEWLINE = 'newline'
+PUNCT = 'punct'
+EOF = 'eof'
+
+_NUMBER_RE = re.compile(r'\d+(\.\d+)?([eE][+-]?\d+)?')
+_IDENT_RE = re.compile(r'[^\W\d][\w\-]*')
+_HEREDOC_RE = re.compile(r'<<(-?)([A-Za-z_][A-Za-z0-9_\-]*)[ \t]*\r?\n')
+_OPERATORS = ('==', '!=', '<=', '>=', '&&', '||', '=>', '...', '::')
+_PUNCTUATION = '{}[]()=,.:?!<>+-*/%'
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+
+class _Lexer:
+    def __init__(self, source):
+        self.source = source
+        self.pos = 0
+        self.line = 1
+        self.line_start = 0
+
+    def error(self, message, pos=None):
+        pos = self.pos if pos is None else pos
+        line = self.source.count('\n', 0, pos) + 1
+        column = pos - (self.source.rfind('\n', 0, pos) + 1) + 1
+        raise HCLSyntaxError(message, line, column)
+
+    def advance_to(self, pos):
+        self.line += self.source.count('\n', self.pos, pos)
+        newline = self.source.rfind('\n', self.pos, pos)
+        if newline != -1:
+            self.line_start = newline + 1
+        self.pos = pos
+
+    def tokens(self):
+        source = self.source
+        length = len(source)
+
+        while True:
+            # 공백, 주석 건너뛰기 (줄바꿈은 토큰으로 남김)
+            while self.pos < length:
+                char = source[self.pos]
+                # NBSP 등 유니코드 공백도 공백으로 취급
+                if char in ' \t\r' or (char != '\n' and char.isspace()):
+                    self.pos += 1
+                elif char == '#' or source.startswith('//', self.pos):
+                    end = source.find('\n', self.pos)
+                    self.pos = length if end == -1 else end
+                elif source.startswith('/*', self.pos):
+                    end = source.find('*/', self.pos + 2)
+                    if end == -1:
+                        self.error('Unterminated block comment')
+                    self.advance_to(end + 2)
+                else:
+                    break
+
+            if self.pos >= length:
+                yield Token(EOF, None, length, length, self.line, self.pos - self.line_start + 1)
+                return
+
+            start = self.pos
+            column = start - self.line_start + 1
+            line = self.line
+            char = source[start]
+
+            if char == '\n':
+                self.advance_to(start + 1)
+                yield Token(NEWLINE, '\n', start, start + 1, line, column)
+                continue
+
+            if char == '"':
+                value, end = self.read_string(start)
+                self.advance_to(end)
+                yield Token(STRING, value, start, end, line, column)
+                continue
+
+            heredoc = _HEREDOC_RE.match(source, start)
+            if heredoc:
+                value, end = self.read_heredoc(heredoc)
+                self.advance_to(end)
+                yield Token(STRING, value, start, end, line, column)
+                continue
+
+            number = _NUMBER_RE.match(source, start)
+            if number:
+                text = number.group(0)
+                value = float(text) if ('.' in text or 'e' in text or 'E' in text) else int(text)
+                self.advance_to(number.end())
+                yield Token(NUMBER, value, start, number.end(), line, column)
+                continue
+
+            ident = _IDENT_RE.match(source, start)
+            if ident:
+                self.advance_to(ident.end())
+                yield Token(IDENT, ident.group(0), start, ident.end(), line, column)
+                continue
+
+            for operator in _OPERATORS:
+                if source.startswith(operator, start):
+                    self.advance_to(start + len(operator))
+                    yield Token(PUNCT, operator, start, self.pos, line, column)
+                    break
+            else:
+                if char not in _PUNCTUATION:
+                    self.error(f'Unexpected character {char!r}')
+                self.advance_to(start + 1)
+                yield Token(PUNCT, char, start, start + 1, line, column)
+
+    def read_string(self, start):
+        # 템플릿 보간(${ ... }) 안의 중첩 문자열/중괄호까지 고려해 닫는 따옴표를 찾음
+        source = self.source
+        pos = start + 1
+        parts = []
+        while True:
+            if pos >= len(source) or source[pos] == '\n':
+                self.error('Unterminated string', start)
+            char = source[pos]
+            if char == '"':
+                return ''.join(parts), pos + 1
+            if char == '\\':
+                escape = source[pos + 1:pos + 2]
+                if escape in _ESCAPES:
+                    parts.append(_ESCAPES[escape])
+                    pos += 2
+                    continue
+                if escape == 'u' and re.fullmatch(r'[0-9A-Fa-f]{4}', source[pos + 2:pos + 6]):
+                    parts.append(chr(int(source[pos + 2:pos + 6], 16)))
+                    pos += 6
+                    continue
+                if escape == 'U' and re.fullmatch(r'[0-9A-Fa-f]{8}', source[pos + 2:pos + 10]):
+                    code_point = int(source[pos + 2:pos + 10], 16)
+                    if code_point <= 0x10FFFF:
+                        parts.append(chr(code_point))
+                        pos += 10
+                        continue
+                self.error(f'Invalid escape sequence \\{escape}', pos)
+            if source.startswith('${', pos) or source.startswith('%{', pos):
+                end = self.skip_template(pos + 2)
+                parts.append(source[pos:end])
+                pos = end
+                continue
+            parts.append(char)
+            pos += 1
+
+    def skip_template(self, pos):
+        source = self.source
+        depth = 1
+        while depth:
+            if pos >= len(source):
+                self.error('Unterminated template interpolation')
+            char = source[pos]
+            if char == '"':
+                _, pos = self.read_string(pos)
+                continue
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            pos += 1
+        return pos
+
+    def read_heredoc(self, match):
+        indent, marker = match.group(1), match.group(2)
+        source = self.source
+        pos = match.end()
+        lines = []
+        while True:
+            end = source.find('\n', pos)
+            line = source[pos:] if end == -1 else source[pos:end]
+            if line.strip() == marker:
+                break
+            if end == -1:
+                self.error(f'Unterminated heredoc, expected {marker}', match.start())
+            lines.append(line)
+            pos = end + 1
+
+        if indent:
+            # <<- 는 공통 들여쓰기 제거
+            widths = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
+            strip = min(widths) if widths else 0
+            lines = [line[strip:] for line in lines]
+
+        close = pos + len(line)
+        return '\n'.join(lines) + ('\n' if lines else ''), close
+
+
+class _Parser:
+    def __init__(self, source):
+        self.source = source
+        self.lexer = _Lexer(source)
+        self.tokens = list(self.lexer.tokens())
+        self.index = 0
+        self.last = None
+        # 괄호/대괄호 안에서는 줄바꿈 무시, 블록/객체 안에서는 구분자로 사용
+        self.newline_modes = [True]
+
+    @property
+    def current(self):
+        if not self.newline_modes[-1]:
+            while self.tokens[self.index].kind == NEWLINE:
+                self.index += 1
+        return self.tokens[self.index]
+
+    def advance(self):
+        token = self.current
+        self.index += 1
+        self.last = token
+        return token
+
+    def enter(self, newlines_significant):
+        self.newline_modes.append(newlines_significant)
+
+    def leave(self):
+        self.newline_modes.pop()
+
+    def error(self, message, token=None):
+        token = token or self.current
+        raise HCLSyntaxError(message, token.line, token.column)
+
+    def describe(self, token):
+        if token.kind == EOF:
+            return 'end of file'
+        if token.kind == NEWLINE:
+            return 'newline'
+        return repr(token.value)
+
+    def expect(self, value):
+        token = self.current
+        if token.kind != PUNCT or token.value != value:
+            self.error(f"Expected '{value}', found {self.describe(token)}")
+        return self.advance()
+
+    def is_punct(self, value):
+        return self.current.kind == PUNCT and self.current.value == value
+
+    def skip_newlines(self):
+        while self.current.kind == NEWLINE:
+            self.advance()
+
+    # body := (attribute | block)*
+    def parse_body(self, closing=None):
+        attributes = {}
+        blocks = []
+
+        while True:
+            self.skip_newlines()
+            token = self.current
+
+            if closing and token.kind == PUNCT and token.value == closing:
+                return attributes, blocks
+            if token.kind == EOF:
+                if closing:
+                    self.error(f"Expected '{closing}', found end of file")
+                return attributes, blocks
+            if token.kind != IDENT:
+                self.error(f'Expected attribute or block, found {self.describe(token)}')
+
+            name = self.advance()
+            if self.is_punct('='):
+                self.advance()
+                value = self.parse_expression()
+                if name.value in attributes:
+                    self.error(f"Duplicate attribute '{name.value}'", name)
+                attributes[name.value] = Attribute(name.value, value, name.line, self.last.line)
+                self.end_statement()
+                continue
+
+            labels = []
+            while self.current.kind in (STRING, IDENT):
+                labels.append(self.advance().value)
+
+            if not self.is_punct('{'):
+                self.error(f"Expected '=' or '{{' after '{name.value}', found {self.describe(self.current)}")
+            self.advance()
+
+            block = Block(name.value, labels, name.line)
+            self.enter(True)
+            block.attributes, block.blocks = self.parse_body('}')
+            self.leave()
+            block.end_line = self.expect('}').line
+            blocks.append(block)
+            self.end_statement()
+
+    def end_statement(self):
+        token = self.current
+        if token.kind in (NEWLINE, EOF) or (token.kind == PUNCT and token.value == '}'):
+            return
+        self.error(f'Expected newline, found {self.describe(token)}')
+
+    # expression := binary ('?' expression ':' expression)?
+    def parse_expression(self):
+        start = self.current
+        value = self.parse_binary()
+        if self.is_punct('?'):
+            self.advance()
+            self.skip_newlines()
+            self.parse_expression()
+            self.skip_newlines()
+            self.expect(':')
+            self.skip_newlines()
+            self.parse_expression()
+            return self.expression_from(start)
+        return value
+
+    def parse_binary(self):
+        start = self.current
+        value = self.parse_unary()
+        combined = False
+        while self.current.kind == PUNCT and self.current.value in (
+            '==', '!=', '<', '>', '<=', '>=', '&&', '||', '+', '-', '*', '/', '%'
+        ):
+            self.advance()
+            self.skip_newlines()
+            self.parse_unary()
+            combined = True
+        return self.expression_from(start) if combined else value
+
+    def parse_unary(self):
+        if self.is_punct('-') or self.is_punct('!'):
+            operator = self.advance()
+            value = self.parse_unary()
+            if operator.value == '-' and isinstance(value, (int, float)) and not isinstance(value, bool):
+                return -value
+            return self.expression_from(operator)
+        return self.parse_postfix()
+
+    def parse_postfix(self):
+        start = self.current
+        value = self.parse_primary()
+        traversed = False
+        while True:
+            if self.is_punct('.'):
+                self.advance()
+                if self.current.kind in (IDENT, NUMBER) or self.is_punct('*'):
+                    self.advance()
+                else:
+                    self.error(f'Expected attribute name after \'.\', found {self.describe(self.current)}')
+                traversed = True
+            elif self.is_punct('['):
+                self.advance()
+                self.enter(False)
+                if self.is_punct('*'):
+                    self.advance()
+                else:
+                    self.parse_expression()
+                self.leave()
+                self.expect(']')
+                traversed = True
+            else:
+                break
+        return self.expression_from(start) if traversed else value
+
+    def parse_primary(self):
+        token = self.current
+
+        if token.kind == NUMBER:
+            return self.advance().value
+        if token.kind == STRING:
+            return self.advance().value
+        if token.kind == IDENT:
+            self.advance()
+            if token.value == 'true':
+                return True
+            if token.value == 'false':
+                return False
+            if token.value == 'null':
+                return None
+            # provider 함수: provider::name::function(...)
+            while self.is_punct('::'):
+                self.advance()
+                if self.current.kind != IDENT:
+                    self.error(f"Expected function name after '::', found {self.describe(self.current)}")
+                self.advance()
+            if self.is_punct('('):
+                self.parse_call_arguments()
+            return self.expression_from(token)
+        if token.kind == PUNCT:
+            if token.value == '[':
+                return self.parse_tuple()
+            if token.value == '{':
+                return self.parse_object()
+            if token.value == '(':
+                self.advance()
+                self.enter(False)
+                self.parse_expression()
+                self.leave()
+                self.expect(')')
+                return self.expression_from(token)
+
+        self.error(f'Expected expression, found {self.describe(token)}')
+
+    def parse_call_arguments(self):
+        self.expect('(')
+        self.enter(False)
+        while not self.is_punct(')'):
+            self.parse_expression()
+            if self.is_punct('...'):
+                self.advance()
+            if self.is_punct(','):
+                self.advance()
+            elif not self.is_punct(')'):
+                self.error(f"Expected ',' or ')', found {self.describe(self.current)}")
+        self.leave()
+        self.advance()
+
+    def parse_tuple(self):
+        start = self.expect('[')
+        self.enter(False)
+        if self.current.kind == IDENT and self.current.value == 'for':
+            self.skip_for_expression(']')
+            self.leave()
+            return self.expression_from(start)
+
+        items = []
+        while not self.is_punct(']'):
+            items.append(self.parse_expression())
+            if self.is_punct(','):
+                self.advance()
+            elif not self.is_punct(']'):
+                self.error(f"Expected ',' or ']', found {self.describe(self.current)}")
+        self.leave()
+        self.advance()
+        return items
+
+    def parse_object(self):
+        start = self.expect('{')
+        self.skip_newlines()
+        if self.current.kind == IDENT and self.current.value == 'for':
+            self.enter(False)
+            self.skip_for_expression('}')
+            self.leave()
+            return self.expression_from(start)
+
+        self.enter(True)
+        items = {}
+        while not self.is_punct('}'):
+            key_token = self.current
+            key = self.parse_expression()
+            if not isinstance(key, str):
+                # 따옴표 없는 키(Name = ...)는 원본 텍스트를 키로 사용
+                key = self.source[key_token.start:self.last.end]
+            if not (self.is_punct('=') or self.is_punct(':')):
+                self.error(f"Expected '=' or ':' after object key, found {self.describe(self.current)}")
+            self.advance()
+            self.skip_newlines()
+            value = self.parse_expression()
+            items[key] = value
+
+            if self.is_punct(','):
+                self.advance()
+            elif self.current.kind != NEWLINE and not self.is_punct('}'):
+                self.error(f"Expected ',', newline or '}}', found {self.describe(self.current)}")
+            self.skip_newlines()
+        self.leave()
+        self.advance()
+        return items
+
+    def skip_for_expression(self, closing):
+        # for 식은 평가하지 않으므로 괄호 짝만 맞춰 건너뜀
+        pairs = {'[': ']', '{': '}', '(': ')'}
+        stack = [closing]
+        while stack:
+            token = self.current
+            if token.kind == EOF:
+                self.error(f"Expected '{stack[-1]}', found end of file")
+            self.advance()
+            if token.kind != PUNCT:
+                continue
+            if token.value in ('[', '{', '('):
+                stack.append(pairs[token.value])
+            elif token.value in (']', '}', ')'):
+                if token.value != stack[-1]:
+                    self.error(f"Expected '{stack[-1]}', found {token.value!r}", token)
+                stack.pop()
+
+    def expression_from(self, start_token):
+        return Expression(self.source[start_token.start:self.last.end])
+
+
+def parse(source: str) -> list:
+    """HCL 소스 → 최상위 블록 목록 (문법 오류 시 HCLSyntaxError)"""
+    # 편집기가 붙이는 UTF-8 BOM 은 무시
+    if source.startswith('\ufeff'):
+        source = source[1:]
+    parser = _Parser(source)
+    attributes, blocks = parser.parse_body()
+    if attributes:
+        # Terraform 설정 파일은 최상위 속성을 허용하지 않지만 .tfvars 는 허용
+        root = Block('', [], 1)
+        root.attributes = attributes
+        blocks = [root, *blocks]
+    return blocks
@@ -0,0 +1,264 @@
+import os
+import re
+import hmac
+import json
+import hashlib
+import tempfile
+import posixpath
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from login.utils import decrypt_token
+
+from .hcl import parse
+from .models import RepoDirectoryFindings, Scan
+from .repo import extract_repo_archive
+from .runner import run_tfsec, relativize_outcome
+from .store import record_scan
+from .uploads import ScanDirectoryWriter, ALLOWED_SUFFIXES
+
+User = get_user_model()
+
+# 파서가 처리하지 못하는 파일에서 로컬 모듈 source 를 찾는 용도
+LOCAL_SOURCE_PATTERN = re.compile(r'\bsource\s*=\s*"(\.\.?/[^"]*)"')
+
+
+def verify_signature(body: bytes, signature: str) -> bool:
+    # X-Hub-Signature-256: "sha256=<hex>"
+    secret = settings.GITHUB_WEBHOOK_SECRET
+    if not secret or not signature or not signature.startswith('sha256='):
+        return False
+
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len('sha256='):])
+
+
+def changed_directories(commits) -> set:
+    """push 페이로드의 커밋 목록 → Terraform 파일이 바뀐 디렉토리 집합"""
+    directories = set()
+    for commit in commits:
+        for key in ('added', 'modified', 'removed'):
+            for path in commit.get(key) or []:
+                if path.lower().endswith(ALLOWED_SUFFIXES):
+                    directories.add(posixpath.dirname(path))
+    return directories
+
+
+def directory_hashes(file_hashes: dict) -> dict:
+    # 파일별 해시 → 디렉토리별 해시 (하위 디렉토리는 포함하지 않음)
+    grouped = {}
+    for rel_path in sorted(file_hashes):
+        directory = posixpath.dirname(rel_path)
+        grouped.setdefault(directory, []).append(f'{posixpath.basename(rel_path)}\0{file_hashes[rel_path]}')
+
+    return {
+        directory: hashlib.sha256('\n'.join(entries).encode()).hexdigest()
+        for directory, entries in grouped.items()
+    }
+
+
+def split_results_by_directory(outcome: dict) -> dict:
+    """상대 경로로 바뀐 tfsec 결과 → {디렉토리: [결과]} (분리할 수 없으면 ValueError)"""
+    data = json.loads(outcome['stdout'])
+    grouped = {}
+    for result in data.get('results') or []:
+        filename = (result.get('location') or {}).get('filename', '')
+        grouped.setdefault(posixpath.dirname(filename), []).append(result)
+
+    # 일부 디렉토리만 다시 스캔해도 전체 스캔과 같은 순서가 되도록 정렬
+    for results in grouped.values():
+        results.sort(key=lambda result: json.dumps(result, sort_keys=True))
+    return grouped
+
+
+def local_module_sources(rel_path: str, text: str) -> list:
+    # module 블록의 source 중 문자열인 값 (로컬 경로 여부는 호출한 쪽에서 확인)
+    if rel_path.lower().endswith('.json'):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return []
+        modules = data.get('module') if isinstance(data, dict) else None
+        items = modules if isinstance(modules, list) else [modules]
+        sources = [
+            module.get('source')
+            for item in items if isinstance(item, dict)
+            for module in item.values() if isinstance(module, dict)
+        ]
+    else:
+        try:
+            blocks = parse(text)
+        except Exception:
+            # 참조를 빠뜨리는 것보다 불필요하게 재스캔하는 편이 안전
+            return LOCAL_SOURCE_PATTERN.findall(text)
+        sources = [block.get('source') for block in blocks if block.type == 'module']
+
+    return [source for source in sources if isinstance(source, str)]
+
+
+def module_references(writer) -> dict:
+    """스캔 디렉토리에 기록된 파일 → {디렉토리: [로컬 모듈로 호출하는 디렉토리]}"""
+    references = {}
+    for rel_path in sorted(writer.file_hashes):
+        directory = posixpath.dirname(rel_path)
+        targets = references.setdefault(directory, set())
+        if rel_path.lower().endswith(('.tfvars', '.tfvars.json')):
+            continue
+
+        with open(os.path.join(writer.root, rel_path), encoding='utf-8', errors='replace') as f:
+            sources = local_module_sources(rel_path, f.read())
+
+        for source in sources:
+            if not source.startswith(('./', '../')):
+                continue
+            target = posixpath.normpath(posixpath.join(directory, source))
+            target = '' if target == '.' else target
+            # 저장소 밖을 가리키는 경로는 무시
+            if target != directory and not target.startswith('..'):
+                targets.add(target)
+
+    return {directory: sorted(targets) for directory, targets in references.items()}
+
+
+def connected_directories(directories, *references) -> set:
+    """모듈 참조로 이어진 디렉토리 전체 (바뀐 모듈을 호출하는 루트와 그 루트가 호출하는 다른 모듈까지)
+
+    tfsec 는 다른 디렉토리에서 호출되지 않는 디렉토리를 루트로 보고 호출한 모듈까지 함께 평가하므로
+    이어진 디렉토리 묶음 단위로 다시 스캔해야 전체 스캔과 결과가 같음
+    """
+    neighbours = {}
+    for mapping in references:
+        for directory, targets in mapping.items():
+            for target in targets:
+                neighbours.setdefault(directory, set()).add(target)
+                neighbours.setdefault(target, set()).add(directory)
+
+    connected = set()
+    pending = list(directories)
+    while pending:
+        directory = pending.pop()
+        if directory in connected:
+            continue
+        connected.add(directory)
+        pending.extend(neighbours.get(directory, ()))
+    return connected
+
+
+def store_directory_findings(repo, branch, commit_sha, hashes, grouped, modules, replace_all=False):
+    with transaction.atomic():
+        existing = RepoDirectoryFindings.objects.filter(repo=repo, branch=branch)
+        if replace_all:
+            existing.exclude(path__in=list(hashes)).delete()
+
+        for directory, content_hash in hashes.items():
+            RepoDirectoryFindings.objects.update_or_create(
+                repo=repo,
+                branch=branch,
+                path=directory,
+                defaults={
+                    'content_hash': content_hash,
+                    'commit_sha': commit_sha or '',
+                    'results': grouped.get(directory, []),
+                    'modules': modules.get(directory, []),
+                }
+            )
+
+
+def merged_findings(repo, branch) -> list:
+    results = []
+    for entry in RepoDirectoryFindings.objects.filter(repo=repo, branch=branch).order_by('path'):
+        results.extend(entry.results)
+    return results
+
+
+def rescan_directories(access_token, owner, repo_name, branch, commit_sha) -> dict:
+    """바뀐 디렉토리와 모듈 참조로 이어진 디렉토리만 다시 스캔하고 저장된 결과에 병합
+
+    모듈 source("../x")를 해석할 수 있도록 저장소 전체를 받음 (blob 캐시에 있는 파일은 다시 받지 않음)
+    """
+    repo = f'{owner}/{repo_name}'
+    stored = {entry.path: entry for entry in RepoDirectoryFindings.objects.filter(repo=repo, branch=branch)}
+
+    with tempfile.TemporaryDirectory() as scan_dir:
+        writer = ScanDirectoryWriter(scan_dir, settings.TFSEC_UPLOAD_MAX_BYTES, settings.TFSEC_UPLOAD_MAX_FILES)
+        extract_repo_archive(writer, access_token, owner, repo_name, commit_sha or branch, urgent=False)
+
+        hashes = directory_hashes(writer.file_hashes)
+        modules = module_references(writer)
+        removed = [directory for directory in stored if directory not in hashes]
+        changed = [
+            directory for directory, content_hash in hashes.items()
+            if directory not in stored or stored[directory].content_hash != content_hash
+        ]
+
+        # 이전 참조도 포함 (호출이 빠진 모듈은 이제 루트로 평가되므로 다시 스캔)
+        previous = {directory: entry.modules for directory, entry in stored.items()}
+        connected = connected_directories([*changed, *removed], previous, modules)
+        rescanned = {directory: content_hash for directory, content_hash in hashes.items() if directory in connected}
+        unchanged = [directory for directory in hashes if directory not in rescanned]
+
+        grouped = {}
+        if rescanned:
+            # 묶음 밖의 디렉토리는 스캔 대상에서 제외 (서로 참조하지 않으므로 결과에 영향 없음)
+            for rel_path in list(writer.file_hashes):
+                if posixpath.dirname(rel_path) not in rescanned:
+                    os.remove(os.path.join(scan_dir, rel_path))
+            outcome = relativize_outcome(run_tfsec(scan_dir), scan_dir)
+            grouped = split_results_by_directory(outcome)
+
+    RepoDirectoryFindings.objects.filter(repo=repo, branch=branch, path__in=removed).delete()
+    store_directory_findings(repo, branch, commit_sha, rescanned, grouped, modules)
+
+    return {
+        'rescanned': sorted(rescanned),
+        'unchanged': sorted(unchanged),
+        'removed': sorted(removed),
+    }
+
+
+def scan_repository(access_token, owner, repo_name, branch, commit_sha) -> dict:
+    """저장된 결과가 없는 브랜치: 전체를 스캔해 디렉토리별 기준 결과를 새로 저장"""
+    repo = f'{owner}/{repo_name}'
+
+    with tempfile.TemporaryDirectory() as scan_dir:
+        writer = ScanDirectoryWriter(scan_dir, settings.TFSEC_UPLOAD_MAX_BYTES, settings.TFSEC_UPLOAD_MAX_FILES)
+        extract_repo_archive(writer, access_token, owner, repo_name, commit_sha or branch, urgent=False)
+
+        hashes = directory_hashes(writer.file_hashes)
+        modules = module_references(writer)
+        grouped = {}
+        if hashes:
+            outcome = relativize_outcome(run_tfsec(scan_dir), scan_dir)
+            grouped = split_results_by_directory(outcome)
+
+    store_directory_findings(repo, branch, commit_sha, hashes, grouped, modules, replace_all=True)
+
+    return {
+        'rescanned': sorted(hashes),
+        'unchanged': [],
+        'removed': [],
+    }
+
+
+def handle_push_event(payload) -> dict:
+    """push 웹훅 처리: 저장소 소유자의 토큰으로 바뀐 디렉토리만 재스캔 (기준 결과가 없으면 전체 스캔)"""
+    repository = payload['repository']
+    owner = repository['owner'].get('login') or repository['owner'].get('name')
+    branch = payload['ref'][len('refs/heads/'):]
+
+    user = User.objects.filter(username=owner).exclude(github_access_token=None).first()
+    if user is None:
+        raise LookupError(f'No user with a GitHub token for {owner}')
+
+    # 첫 push 등 기준 결과가 없으면 바뀐 디렉토리만으로는 전체 결과가 되지 않으므로 전체 스캔
+    repo = f'{owner}/{repository["name"]}'
+    access_token = decrypt_token(user.github_access_token)
+    if RepoDirectoryFindings.objects.filter(repo=repo, branch=branch).exists():
+        summary = rescan_directories(access_token, owner, repository['name'], branch, payload.get('after'))
+    else:
+        summary = scan_repository(access_token, owner, repository['name'], branch, payload.get('after'))
+
+    # 병합된 전체 결과를 새 스캔 이력으로 기록
+    scan = record_scan(repo, branch, payload.get('after'), Scan.SOURCE_WEBHOOK, merged_findings(repo, branch))
+    return {**summary, 'scan_id': scan.id}
@@ -0,0 +1,104 @@
+import json
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from .cache import cached_scan
+from .models import ScanJob
+from .runner import build_scan_payload
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    # 워커 풀은 첫 작업 제출 시 생성 (웹 프로세스마다 하나)
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.TFSEC_JOB_WORKERS,
+                thread_name_prefix='tfsec-job'
+            )
+        return _executor
+
+
+def submit_scan_job(terraform_code: str) -> ScanJob:
+    job = ScanJob.objects.create(terraform_code=terraform_code)
+    get_executor().submit(run_scan_job, job.id)
+    return job
+
+
+def run_scan_job(job_id):
+    close_old_connections()
+    try:
+        ScanJob.objects.filter(id=job_id).update(
+            status=ScanJob.STATUS_RUNNING,
+            started_at=timezone.now()
+        )
+        job = ScanJob.objects.get(id=job_id)
+
+        try:
+            outcome, _, _ = cached_scan(job.terraform_code)
+            result = build_scan_payload(outcome)
+        except json.JSONDecodeError:
+            _finish_job(job_id, ScanJob.STATUS_FAILED, error='Invalid JSON')
+        except Exception as e:
+            _finish_job(job_id, ScanJob.STATUS_FAILED, error=str(e))
+        else:
+            _finish_job(job_id, ScanJob.STATUS_DONE, result=result)
+    finally:
+        # 워커 스레드의 DB 연결 정리
+        connection.close()
+
+
+def _finish_job(job_id, job_status, result=None, error=None):
+    ScanJob.objects.filter(id=job_id).update(
+        status=job_status,
+        result=result,
+        error=error,
+        finished_at=timezone.now()
+    )
+
+
+def expire_stale_job(job: ScanJob) -> ScanJob:
+    """TFSEC_JOB_STALE_AFTER 초 동안 끝나지 않은 pending/running 작업 → failed (처리할 워커가 없는 작업)"""
+    stale_after = settings.TFSEC_JOB_STALE_AFTER
+    if not stale_after or job.status not in (ScanJob.STATUS_PENDING, ScanJob.STATUS_RUNNING):
+        return job
+
+    # 마지막 상태 변경 시각 기준 (pending: 등록, running: 시작)
+    changed_at = job.started_at or job.created_at
+    if timezone.now() - changed_at < timedelta(seconds=stale_after):
+        return job
+
+    # 그 사이 작업이 끝났으면 덮어쓰지 않음
+    ScanJob.objects.filter(id=job.id, status=job.status).update(
+        status=ScanJob.STATUS_FAILED,
+        error='Scan job did not finish (worker stopped or timed out)',
+        finished_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def submit_background(fn, *args):
+    # 작업 테이블 없이 워커 풀에서 실행 (웹훅 증분 스캔 등)
+    def task():
+        close_old_connections()
+        try:
+            return fn(*args)
+        except Exception:
+            logger.exception('Background task %s failed', getattr(fn, '__name__', fn))
+            raise
+        finally:
+            connection.close()
+
+    return get_executor().submit(task)
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 16:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfsec', '0002_scanjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RepoDirectoryFindings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repo', models.CharField(max_length=200)),
+                ('branch', models.CharField(max_length=200)),
+                ('path', models.CharField(blank=True, max_length=255)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('commit_sha', models.CharField(blank=True, max_length=40)),
+                ('results', models.JSONField(default=list)),
+                ('modules', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('repo', 'branch', 'path')},
+            },
+        ),
+    ]
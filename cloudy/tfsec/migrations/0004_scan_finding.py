@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 16:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tfsec', '0003_repodirectoryfindings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Scan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repo', models.CharField(max_length=200)),
+                ('branch', models.CharField(max_length=200)),
+                ('commit_sha', models.CharField(blank=True, max_length=40)),
+                ('source', models.CharField(choices=[('repo', 'Repository scan'), ('webhook', 'Push webhook')], max_length=16)),
+                ('finding_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['repo', 'branch', '-id'], name='tfsec_scan_repo_c17c90_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Finding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('repo', models.CharField(max_length=200)),
+                ('branch', models.CharField(max_length=200)),
+                ('rule_id', models.CharField(max_length=64)),
+                ('long_id', models.CharField(blank=True, max_length=200)),
+                ('severity', models.CharField(max_length=16)),
+                ('resource', models.CharField(blank=True, max_length=255)),
+                ('filename', models.CharField(blank=True, max_length=512)),
+                ('start_line', models.PositiveIntegerField(default=0)),
+                ('end_line', models.PositiveIntegerField(default=0)),
+                ('fingerprint', models.CharField(default='', max_length=48)),
+                ('data', models.JSONField()),
+                ('scan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='findings', to='tfsec.scan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['scan', 'id'], name='tfsec_findi_scan_id_c48523_idx'), models.Index(fields=['scan', 'fingerprint'], name='tfsec_findi_scan_id_13e6cf_idx'), models.Index(fields=['scan', 'severity', 'id'], name='tfsec_findi_scan_id_560920_idx'), models.Index(fields=['scan', 'rule_id', 'id'], name='tfsec_findi_scan_id_268e7e_idx'), models.Index(fields=['repo', 'branch', 'rule_id'], name='tfsec_findi_repo_f06506_idx'), models.Index(fields=['repo', 'branch', 'severity'], name='tfsec_findi_repo_80b411_idx'), models.Index(fields=['repo', 'branch', 'resource'], name='tfsec_findi_repo_fd872c_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,99 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+# tfsec 스캔 결과 캐시 (소스 해시 + tfsec 버전/옵션 기준)
+class ScanResultCache(models.Model):
+    key = models.CharField(max_length=64, unique=True)
+    outcome = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_hit_at = models.DateTimeField(db_index=True)
+
+
+# 비동기 tfsec 스캔 작업
+class ScanJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    terraform_code = models.TextField()
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+
+# 저장소/브랜치의 디렉토리별 tfsec 결과 (push 웹훅 증분 스캔용)
+class RepoDirectoryFindings(models.Model):
+    repo = models.CharField(max_length=200)  # owner/name
+    branch = models.CharField(max_length=200)
+    path = models.CharField(max_length=255, blank=True)  # 저장소 루트는 ''
+    content_hash = models.CharField(max_length=64)
+    commit_sha = models.CharField(max_length=40, blank=True)
+    results = models.JSONField(default=list)
+    modules = models.JSONField(default=list)  # 로컬 모듈로 호출하는 디렉토리
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('repo', 'branch', 'path')
+
+
+# 저장된 스캔 이력
+class Scan(models.Model):
+    SOURCE_REPO = 'repo'
+    SOURCE_WEBHOOK = 'webhook'
+    SOURCE_CHOICES = [
+        (SOURCE_REPO, 'Repository scan'),
+        (SOURCE_WEBHOOK, 'Push webhook'),
+    ]
+
+    repo = models.CharField(max_length=200)  # owner/name
+    branch = models.CharField(max_length=200)
+    commit_sha = models.CharField(max_length=40, blank=True)
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES)
+    finding_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['repo', 'branch', '-id']),
+        ]
+
+
+# 스캔별 개별 결과 (필터 컬럼은 비정규화해서 인덱스)
+class Finding(models.Model):
+    scan = models.ForeignKey(Scan, on_delete=models.CASCADE, related_name='findings')
+    repo = models.CharField(max_length=200)
+    branch = models.CharField(max_length=200)
+    rule_id = models.CharField(max_length=64)
+    long_id = models.CharField(max_length=200, blank=True)
+    severity = models.CharField(max_length=16)
+    resource = models.CharField(max_length=255, blank=True)
+    filename = models.CharField(max_length=512, blank=True)
+    start_line = models.PositiveIntegerField(default=0)
+    end_line = models.PositiveIntegerField(default=0)
+    fingerprint = models.CharField(max_length=48, default='')  # 스캔 간 비교용 (tfsec.diff)
+    data = models.JSONField()  # tfsec 원본 결과
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['scan', 'id']),
+            models.Index(fields=['scan', 'fingerprint']),
+            models.Index(fields=['scan', 'severity', 'id']),
+            models.Index(fields=['scan', 'rule_id', 'id']),
+            models.Index(fields=['repo', 'branch', 'rule_id']),
+            models.Index(fields=['repo', 'branch', 'severity']),
+            models.Index(fields=['repo', 'branch', 'resource']),
+        ]
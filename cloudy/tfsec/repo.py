@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from github.blobs import blob_cache, git_blob_sha
+from github.client import github
+
+from .uploads import LimitedReader, extract_tar_stream
+
+
+class GitHubArchiveError(Exception):
+    def __init__(self, status_code, detail):
+        super().__init__(f'GitHub archive download failed ({status_code})')
+        self.status_code = status_code
+        self.detail = detail
+
+
+def error_detail(res):
+    try:
+        return res.json()
+    except ValueError:
+        return res.text
+
+
+def extract_repo_archive(writer, access_token, owner, repo_name, ref, select=None, urgent=True):
+    """저장소의 *.tf 파일을 스캔 디렉토리에 기록 (select: 경로 필터, urgent=False: 백그라운드 스캔)
+
+    트리 목록의 blob SHA 로 캐시된 파일을 먼저 사용하고, 캐시에 없는 파일이 많으면 tarball 로 받음
+    """
+    entries = repo_tree_entries(writer, access_token, owner, repo_name, ref, select, urgent)
+    if entries is not None:
+        missing = [entry for entry in entries if entry["sha"] not in blob_cache]
+        if len(missing) <= settings.GITHUB_BLOB_FETCH_MAX_MISSES:
+            write_blobs(writer, access_token, owner, repo_name, entries, missing, urgent)
+            return
+
+    extract_tarball(writer, access_token, owner, repo_name, ref, select, urgent)
+
+
+def repo_tree_entries(writer, access_token, owner, repo_name, ref, select=None, urgent=True):
+    # 트리를 쓸 수 없으면(잘린 목록, 캐시 비활성, 요청 실패) None → tarball 로 처리
+    if not blob_cache.enabled:
+        return None
+
+    res = github.get(f"/repos/{owner}/{repo_name}/git/trees/{ref}", access_token, params={"recursive": 1}, urgent=urgent)
+    if res.status_code != 200:
+        return None
+
+    tree = res.json()
+    if tree.get("truncated"):
+        return None
+
+    return [
+        entry for entry in tree.get("tree", [])
+        if entry["type"] == "blob" and writer.accepts(entry["path"]) and (select is None or select(entry["path"]))
+    ]
+
+
+def write_blobs(writer, access_token, owner, repo_name, entries, missing, urgent=True):
+    def fetch_blob(entry):
+        res = github.get(f"/repos/{owner}/{repo_name}/git/blobs/{entry['sha']}", access_token, headers={"Accept": "application/vnd.github.raw"}, urgent=urgent)
+        if res.status_code != 200:
+            raise GitHubArchiveError(res.status_code, error_detail(res))
+        blob_cache.put(entry["sha"], res.content)
+        return res.content
+
+    with ThreadPoolExecutor(max_workers=settings.GITHUB_CONTENT_FETCH_WORKERS) as executor:
+        fetched = dict(zip([entry["sha"] for entry in missing], executor.map(fetch_blob, missing)))
+
+    for entry in entries:
+        if entry["sha"] in fetched:
+            writer.write(entry["path"], [fetched[entry["sha"]]])
+            continue
+        with blob_cache.open(entry["sha"]) as data:
+            if data is None:
+                # 캐시 확인 이후 다른 요청의 정리로 삭제된 blob 은 다시 받음
+                data = fetch_blob(entry)
+            writer.write(entry["path"], [data])
+
+
+def extract_tarball(writer, access_token, owner, repo_name, ref, select=None, urgent=True):
+    """저장소 tarball 을 한 번에 받아 *.tf 파일만 스트림 추출"""
+    archive_url = f"/repos/{owner}/{repo_name}/tarball/{ref}"
+
+    # codeload 로 리다이렉트됨 (다른 호스트이므로 Authorization 헤더는 전달되지 않음)
+    with github.get(archive_url, access_token, stream=True, urgent=urgent) as res:
+        if res.status_code != 200:
+            raise GitHubArchiveError(res.status_code, error_detail(res))
+
+        res.raw.decode_content = True
+        stream = LimitedReader(res.raw, settings.TFSEC_REPO_ARCHIVE_MAX_BYTES)
+        # tarball 최상위 디렉토리({owner}-{repo}-{sha}/)는 제거
+        extract_tar_stream(stream, writer, strip_components=1, select=select)
+
+    # 다음 스캔에서 재사용하도록 추출한 파일을 blob 캐시에 저장
+    for rel_path in writer.file_hashes:
+        with open(os.path.join(writer.root, rel_path), 'rb') as f:
+            data = f.read()
+        blob_cache.put(git_blob_sha(data), data)
@@ -0,0 +1,236 @@
+"""fast 모드 규칙 엔진: HCL AST 에 대해 자주 쓰는 점검만 프로세스 안에서 수행
+
+결과는 tfsec JSON 결과와 같은 스키마로 만든다. 규칙은 @rule 데코레이터로 등록한다.
+"""
+from .hcl import Expression
+
+LINK_BASE = 'https://aquasecurity.github.io/tfsec/latest/checks'
+PUBLIC_CIDRS = ('0.0.0.0/0', '::/0')
+PUBLIC_ACLS = ('public-read', 'public-read-write', 'website', 'authenticated-read')
+
+
+class Rule:
+    __slots__ = (
+        'rule_id', 'long_id', 'provider', 'service', 'severity',
+        'description', 'impact', 'resolution', 'resource_types', 'check',
+    )
+
+    def __init__(self, rule_id, long_id, provider, service, severity,
+                 description, impact, resolution, resource_types, check):
+        self.rule_id = rule_id
+        self.long_id = long_id
+        self.provider = provider
+        self.service = service
+        self.severity = severity
+        self.description = description
+        self.impact = impact
+        self.resolution = resolution
+        self.resource_types = resource_types
+        self.check = check
+
+    @property
+    def link(self):
+        short_name = self.long_id[len(f'{self.provider}-{self.service}-'):]
+        return f'{LINK_BASE}/{self.provider}/{self.service}/{short_name}/'
+
+
+RULES = []
+
+
+def rule(rule_id, long_id, severity, description, impact, resolution, resource_types):
+    """규칙 등록 데코레이터 (check(block) 은 (메시지, 줄 번호, 끝 줄 번호) 를 yield)"""
+    provider, service = long_id.split('-')[:2]
+
+    def decorator(check):
+        RULES.append(Rule(
+            rule_id, long_id, provider, service, severity,
+            description, impact, resolution, tuple(resource_types), check,
+        ))
+        return check
+
+    return decorator
+
+
+def is_known(value):
+    # 참조/함수/보간이 들어간 값은 정적으로 알 수 없으므로 판단하지 않음
+    if isinstance(value, Expression):
+        return False
+    if isinstance(value, str):
+        return '${' not in value and '%{' not in value
+    return True
+
+
+def attribute_lines(block, name):
+    attribute = block.attributes.get(name)
+    if attribute is None:
+        return block.line, block.end_line
+    return attribute.line, attribute.end_line
+
+
+def public_cidrs(value):
+    values = value if isinstance(value, list) else [value]
+    return [cidr for cidr in values if is_known(cidr) and cidr in PUBLIC_CIDRS]
+
+
+@rule(
+    'AVD-AWS-0092', 'aws-s3-no-public-access-with-acl', 'HIGH',
+    'S3 Buckets not publicly accessible through ACL.',
+    'Public access to the bucket can lead to data leakage',
+    "Don't use canned ACLs or switch to private acl",
+    ['aws_s3_bucket', 'aws_s3_bucket_acl'],
+)
+def s3_public_acl(block):
+    acl = block.get('acl')
+    if is_known(acl) and acl in PUBLIC_ACLS:
+        yield (f"Bucket has a public ACL: '{acl}'.", *attribute_lines(block, 'acl'))
+
+
+@rule(
+    'AVD-AWS-0107', 'aws-ec2-no-public-ingress-sgr', 'CRITICAL',
+    'An ingress security group rule allows traffic from /0.',
+    'Your port exposed to the internet',
+    'Set a more restrictive cidr range',
+    ['aws_security_group', 'aws_security_group_rule', 'aws_vpc_security_group_ingress_rule'],
+)
+def security_group_public_ingress(block):
+    resource_type = block.labels[0]
+
+    if resource_type == 'aws_security_group':
+        rules = block.children('ingress')
+    elif resource_type == 'aws_security_group_rule':
+        rules = [block] if block.get('type') == 'ingress' else []
+    else:
+        rules = [block]
+
+    for ingress in rules:
+        for name in ('cidr_blocks', 'ipv6_cidr_blocks', 'cidr_ipv4', 'cidr_ipv6'):
+            if public_cidrs(ingress.get(name)):
+                yield ('Security group rule allows ingress from public internet.', *attribute_lines(ingress, name))
+
+
+@rule(
+    'AVD-AWS-0104', 'aws-ec2-no-public-egress-sgr', 'CRITICAL',
+    'An egress security group rule allows traffic to /0.',
+    'Your port is egressing data to the internet',
+    'Set a more restrictive cidr range',
+    ['aws_security_group', 'aws_security_group_rule', 'aws_vpc_security_group_egress_rule'],
+)
+def security_group_public_egress(block):
+    resource_type = block.labels[0]
+
+    if resource_type == 'aws_security_group':
+        rules = block.children('egress')
+    elif resource_type == 'aws_security_group_rule':
+        rules = [block] if block.get('type') == 'egress' else []
+    else:
+        rules = [block]
+
+    for egress in rules:
+        for name in ('cidr_blocks', 'ipv6_cidr_blocks', 'cidr_ipv4', 'cidr_ipv6'):
+            if public_cidrs(egress.get(name)):
+                yield ('Security group rule allows egress to multiple public addresses.', *attribute_lines(egress, name))
+
+
+@rule(
+    'AVD-AWS-0026', 'aws-ec2-enable-volume-encryption', 'HIGH',
+    'EBS volumes must be encrypted',
+    'Unencrypted sensitive data is vulnerable to compromise.',
+    'Enable encryption of EBS volumes',
+    ['aws_ebs_volume'],
+)
+def ebs_volume_unencrypted(block):
+    encrypted = block.get('encrypted')
+    if encrypted is None or encrypted is False:
+        yield ('EBS volume is not encrypted.', *attribute_lines(block, 'encrypted'))
+
+
+@rule(
+    'AVD-AWS-0131', 'aws-ec2-enable-at-rest-encryption', 'HIGH',
+    'Instance with unencrypted block device.',
+    'The block device could be compromised and read from',
+    'Turn on encryption for all block devices',
+    ['aws_instance'],
+)
+def instance_block_device_unencrypted(block):
+    root_devices = block.children('root_block_device')
+    if not root_devices:
+        yield ('Root block device is not encrypted.', block.line, block.end_line)
+
+    for device in root_devices + block.children('ebs_block_device'):
+        encrypted = device.get('encrypted')
+        if encrypted is None or encrypted is False:
+            label = 'Root' if device.type == 'root_block_device' else 'EBS'
+            yield (f'{label} block device is not encrypted.', *attribute_lines(device, 'encrypted'))
+
+
+@rule(
+    'AVD-AWS-0028', 'aws-ec2-enforce-http-token-imds', 'HIGH',
+    'aws_instance should activate session tokens for Instance Metadata Service.',
+    'Instance metadata service can be interacted with freely',
+    'Enable HTTP token requirement for IMDS',
+    ['aws_instance'],
+)
+def instance_imds_tokens(block):
+    options = block.children('metadata_options')
+    if not options:
+        yield ('Instance does not require IMDS access to require a token', block.line, block.end_line)
+        return
+
+    tokens = options[0].get('http_tokens')
+    endpoint = options[0].get('http_endpoint')
+    if endpoint == 'disabled':
+        return
+    if tokens is None or (is_known(tokens) and tokens != 'required'):
+        yield ('Instance does not require IMDS access to require a token', *attribute_lines(options[0], 'http_tokens'))
+
+
+@rule(
+    'AVD-AWS-0080', 'aws-rds-encrypt-instance-storage-data', 'HIGH',
+    'RDS encryption has not been enabled at a DB Instance level.',
+    'Data can be read from the RDS instances if compromised',
+    'Enable encryption for RDS instances',
+    ['aws_db_instance'],
+)
+def rds_instance_unencrypted(block):
+    # 읽기 복제본은 원본 인스턴스의 암호화 설정을 따름
+    if block.get('replicate_source_db') is not None:
+        return
+    encrypted = block.get('storage_encrypted')
+    if encrypted is None or encrypted is False:
+        yield ('Instance does not have storage encryption enabled.', *attribute_lines(block, 'storage_encrypted'))
+
+
+def evaluate(blocks, filename='main.tf') -> list:
+    """최상위 블록 목록 → tfsec JSON 스키마의 결과 목록"""
+    results = []
+    for block in blocks:
+        if block.type != 'resource' or len(block.labels) != 2:
+            continue
+
+        resource_type, resource_name = block.labels
+        for registered in RULES:
+            if resource_type not in registered.resource_types:
+                continue
+
+            for description, start_line, end_line in registered.check(block):
+                results.append({
+                    'rule_id': registered.rule_id,
+                    'long_id': registered.long_id,
+                    'rule_description': registered.description,
+                    'rule_provider': registered.provider,
+                    'rule_service': registered.service,
+                    'impact': registered.impact,
+                    'resolution': registered.resolution,
+                    'links': [registered.link],
+                    'description': description,
+                    'severity': registered.severity,
+                    'warning': False,
+                    'status': 0,
+                    'resource': f'{resource_type}.{resource_name}',
+                    'location': {
+                        'filename': filename,
+                        'start_line': start_line,
+                        'end_line': end_line,
+                    },
+                })
+    return results
@@ -0,0 +1,211 @@
+import os
+import json
+import shutil
+import signal
+import resource
+import tempfile
+import subprocess
+from functools import lru_cache
+
+from django.conf import settings
+
+from .compact import compact_results
+from .scheduler import scheduler
+
+TFSEC_ARGS = ['--format', 'json']
+OUTPUT_COMPACT = 'compact'
+
+
+class ScanTimeout(Exception):
+    pass
+
+
+@lru_cache(maxsize=1)
+def get_tfsec_version() -> str:
+    """설치된 tfsec 버전 문자열 (프로세스당 한 번만 조회)"""
+    result = subprocess.run(
+        ['tfsec', '--version'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    return result.stdout.decode().strip()
+
+
+@lru_cache(maxsize=1)
+def prlimit_path():
+    # util-linux prlimit (Debian 기반 이미지에 기본 포함)
+    return shutil.which('prlimit')
+
+
+def resource_limits() -> list:
+    """[(rlimit, prlimit 옵션, 값)] (0 인 제한은 제외)"""
+    limits = []
+    cpu_seconds = settings.TFSEC_CPU_LIMIT
+    if cpu_seconds:
+        limits.append((resource.RLIMIT_CPU, '--cpu', cpu_seconds))
+
+    memory_bytes = settings.TFSEC_MEMORY_LIMIT_MB * 1024 * 1024
+    if memory_bytes:
+        limits.append((resource.RLIMIT_AS, '--as', memory_bytes))
+    return limits
+
+
+def tfsec_command(target_dir: str, limits: list) -> list:
+    # prlimit 으로 감싸 exec 전에 제한 적용 (preexec_fn 은 멀티스레드 프로세스에서 안전하지 않음)
+    command = ['tfsec', target_dir, *TFSEC_ARGS]
+    if limits and prlimit_path():
+        return [prlimit_path(), *(f'{option}={value}' for _, option, value in limits), '--', *command]
+    return command
+
+
+def _limit_resources(pid: int, limits: list):
+    # prlimit 명령이 없는 환경: 실행 직후 부모에서 적용 (적용 전 짧은 구간은 제한 없이 실행됨)
+    try:
+        for limit, _, value in limits:
+            resource.prlimit(pid, limit, (value, value))
+    except ProcessLookupError:
+        # 이미 종료된 경우
+        pass
+
+
+def run_tfsec(target_dir: str, stdout_file=None) -> dict:
+    """stdout_file 을 주면 tfsec 출력을 메모리 대신 해당 파일에 기록 (반환값의 stdout 은 None)"""
+    limits = resource_limits()
+    command = tfsec_command(target_dir, limits)
+
+    # 동시 실행 수 제한 (대기열이 가득 차면 ScanRejected)
+    with scheduler.slot():
+        process = subprocess.Popen(
+            command,
+            stdout=stdout_file if stdout_file is not None else subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True
+        )
+        if limits and command[0] == 'tfsec':
+            _limit_resources(process.pid, limits)
+
+        try:
+            stdout, stderr = process.communicate(timeout=settings.TFSEC_TIMEOUT or None)
+        except subprocess.TimeoutExpired:
+            # 프로세스 그룹 전체 종료 후 파이프 정리
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.communicate()
+            raise ScanTimeout(f'tfsec timed out after {settings.TFSEC_TIMEOUT}s')
+
+    return {
+        'returncode': process.returncode,
+        'stdout': stdout.decode() if stdout is not None else None,
+        'stderr': stderr.decode(),
+    }
+
+
+def scan_terraform_code(terraform_code: str) -> dict:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tf_path = os.path.join(temp_dir, 'main.tf')
+        with open(tf_path, 'w') as f:
+            f.write(terraform_code)
+
+        return run_tfsec(temp_dir)
+
+
+def scan_terraform_batch(snippets: dict) -> dict:
+    """여러 코드 조각을 하위 디렉토리로 배치해 tfsec 한 번으로 스캔 → ({이름: 실행 결과}, 분리 성공 여부)"""
+    names = list(snippets)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 이름은 사용자 입력이므로 디렉토리명은 인덱스로 사용
+        for index, name in enumerate(names):
+            snippet_dir = os.path.join(temp_dir, str(index))
+            os.mkdir(snippet_dir)
+            with open(os.path.join(snippet_dir, 'main.tf'), 'w') as f:
+                f.write(snippets[name])
+
+        outcome = run_tfsec(temp_dir)
+
+        try:
+            results = json.loads(outcome['stdout']).get('results') or []
+        except (json.JSONDecodeError, AttributeError):
+            # 결과를 나눌 수 없는 실패는 모든 조각에 그대로 전달
+            return {name: outcome for name in names}, False
+
+        grouped = {index: [] for index in range(len(names))}
+        root = os.path.realpath(temp_dir)
+        for result in results:
+            filename = os.path.realpath(result.get('location', {}).get('filename', ''))
+            index = os.path.relpath(filename, root).split(os.sep)[0]
+            if index.isdigit() and int(index) in grouped:
+                grouped[int(index)].append(result)
+
+    # 단일 스캔과 같은 형태로 조각별 결과 재구성
+    return {
+        name: {
+            'returncode': 1 if grouped[index] else 0,
+            'stdout': json.dumps({'results': grouped[index] or None}, indent=2),
+            'stderr': '',
+        }
+        for index, name in enumerate(names)
+    }, True
+
+
+def relativize_outcome(outcome: dict, target_dir: str) -> dict:
+    # 임시 디렉토리 절대 경로 대신 스캔 루트 기준 상대 경로로 기록 (캐시 재사용, 디렉토리별 분리용)
+    try:
+        data = json.loads(outcome['stdout'])
+    except json.JSONDecodeError:
+        return outcome
+
+    if not isinstance(data, dict):
+        return outcome
+
+    root = os.path.realpath(target_dir)
+    for result in data.get('results') or []:
+        location = result.get('location') or {}
+        if location.get('filename'):
+            location['filename'] = os.path.relpath(os.path.realpath(location['filename']), root)
+
+    return {**outcome, 'stdout': json.dumps(data, indent=2)}
+
+
+def build_scan_payload(outcome: dict, output: str = None) -> dict:
+    """tfsec 실행 결과 → 응답 본문 (json.JSONDecodeError 는 호출한 쪽에서 처리)
+
+    output='compact' 이면 규칙 메타데이터를 rules 사전으로 분리한 형식으로 반환
+    """
+    if output == OUTPUT_COMPACT:
+        return build_compact_payload(outcome)
+
+    if outcome['returncode'] != 0:
+        return {
+            'status': 'error',
+            'message': 'tfsec failed',
+            'stdout': outcome['stdout'],
+            'stderr': outcome['stderr']
+        }
+
+    return {
+        'status': 'success',
+        'data': json.loads(outcome['stdout'])  # 문자열 → JSON으로 파싱
+    }
+
+
+def build_compact_payload(outcome: dict) -> dict:
+    try:
+        data = json.loads(outcome['stdout'])
+    except json.JSONDecodeError:
+        if outcome['returncode'] != 0:
+            return build_scan_payload(outcome)
+        raise
+
+    payload = {
+        'status': 'success' if outcome['returncode'] == 0 else 'error',
+        'format': OUTPUT_COMPACT,
+        'data': compact_results(data.get('results') if isinstance(data, dict) else None),
+    }
+    # 결과가 있어 tfsec 가 0 이 아닌 코드로 끝난 경우에도 결과는 compact 형식으로 전달
+    if outcome['returncode'] != 0:
+        payload['message'] = 'tfsec failed'
+        payload['stderr'] = outcome['stderr']
+    return payload
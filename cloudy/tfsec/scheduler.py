@@ -0,0 +1,117 @@
+import math
+import time
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class ScanRejected(Exception):
+    """스캔 대기열 입장 실패 (retry_after: 재시도 권장 초)"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ScanQueueFull(ScanRejected):
+    pass
+
+
+class ScanQueueTimeout(ScanRejected):
+    pass
+
+
+class ScanScheduler:
+    """프로세스 내 동시 tfsec 실행 수와 대기열 길이를 제한"""
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = 0
+
+        # 호스트 사이징용 통계
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+        self._finished = 0
+
+    def has_slot(self) -> bool:
+        # max_concurrent 0 이면 제한 없음
+        return not self.max_concurrent or self._running < self.max_concurrent
+
+    def estimate_retry_after(self) -> int:
+        avg_run = self._total_run / self._finished if self._finished else 1.0
+        rounds = (self._waiting + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(avg_run * rounds))
+
+    @contextmanager
+    def slot(self):
+        enqueued_at = time.monotonic()
+
+        with self._cond:
+            if not self.has_slot():
+                if self._waiting >= self.max_queue:
+                    self._rejected += 1
+                    raise ScanQueueFull('Scan queue is full', self.estimate_retry_after())
+
+                self._waiting += 1
+                try:
+                    # queue_timeout 0 이면 자리가 날 때까지 대기
+                    admitted = self._cond.wait_for(self.has_slot, timeout=self.queue_timeout or None)
+                finally:
+                    self._waiting -= 1
+
+                if not admitted:
+                    self._timed_out += 1
+                    raise ScanQueueTimeout('Timed out waiting for a scan slot', self.estimate_retry_after())
+
+            waited = time.monotonic() - enqueued_at
+            self._running += 1
+            self._admitted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+        started_at = time.monotonic()
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._finished += 1
+                self._total_run += time.monotonic() - started_at
+                self._cond.notify()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return self._waiting
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'waiting': self._waiting,
+                'admitted': self._admitted,
+                'rejected': self._rejected,
+                'queue_timeouts': self._timed_out,
+                'avg_wait_ms': round(self._total_wait / self._admitted * 1000, 1) if self._admitted else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 1),
+                'avg_run_ms': round(self._total_run / self._finished * 1000, 1) if self._finished else 0.0,
+            }
+
+
+scheduler = ScanScheduler(
+    max_concurrent=settings.TFSEC_MAX_CONCURRENT,
+    max_queue=settings.TFSEC_MAX_QUEUE,
+    queue_timeout=settings.TFSEC_QUEUE_TIMEOUT,
+)
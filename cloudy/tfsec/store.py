@@ -0,0 +1,66 @@
+from django.db import transaction
+
+from .diff import fingerprint_results
+from .models import Scan, Finding
+
+BULK_BATCH_SIZE = 1000
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _finding_from_result(scan, result, fingerprint):
+    location = result.get('location') or {}
+    return Finding(
+        scan=scan,
+        repo=scan.repo,
+        branch=scan.branch,
+        rule_id=(result.get('rule_id') or '')[:64],
+        long_id=(result.get('long_id') or '')[:200],
+        severity=(result.get('severity') or '')[:16],
+        resource=(result.get('resource') or '')[:255],
+        filename=(location.get('filename') or '')[:512],
+        start_line=location.get('start_line') or 0,
+        end_line=location.get('end_line') or 0,
+        fingerprint=fingerprint,
+        data=result,
+    )
+
+
+def record_scan(repo, branch, commit_sha, source, results) -> Scan:
+    """스캔 1건과 결과 전체 저장 (결과는 bulk_create 로 배치 삽입)"""
+    with transaction.atomic():
+        scan = Scan.objects.create(
+            repo=repo,
+            branch=branch,
+            commit_sha=commit_sha or '',
+            source=source,
+            finding_count=len(results),
+        )
+        Finding.objects.bulk_create(
+            (
+                _finding_from_result(scan, result, fingerprint)
+                for result, fingerprint in zip(results, fingerprint_results(results))
+            ),
+            batch_size=BULK_BATCH_SIZE
+        )
+    return scan
+
+
+def parse_page_params(query_params):
+    # cursor: 이전 페이지 마지막 id (키셋 페이지네이션), limit: 페이지 크기
+    cursor = query_params.get('cursor')
+    limit = query_params.get('limit')
+
+    cursor = int(cursor) if cursor else None
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE) if limit else DEFAULT_PAGE_SIZE
+    return cursor, limit
+
+
+def keyset_page(queryset, cursor, limit, descending=False):
+    """id 기준 키셋 페이지 → (항목 목록, 다음 cursor | None)"""
+    if cursor is not None:
+        queryset = queryset.filter(id__lt=cursor) if descending else queryset.filter(id__gt=cursor)
+
+    items = list(queryset.order_by('-id' if descending else 'id')[:limit + 1])
+    next_cursor = items[limit - 1].id if len(items) > limit else None
+    return items[:limit], next_cursor
@@ -0,0 +1,119 @@
+import json
+
+CHUNK_SIZE = 64 * 1024
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+SARIF_LEVELS = {
+    'CRITICAL': 'error',
+    'HIGH': 'error',
+    'MEDIUM': 'warning',
+    'LOW': 'note',
+}
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    # 파일에서 필요한 만큼만 읽어 오는 문자열 버퍼
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # 이미 처리한 앞부분은 버림 (메모리 사용량을 결과 1건 + 청크 크기로 유지)
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self, extra=''):
+        while True:
+            while self.pos < len(self.text) and (self.text[self.pos].isspace() or self.text[self.pos] in extra):
+                self.pos += 1
+            if self.pos < len(self.text) or not self.fill():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+
+def iter_tfsec_results(fileobj):
+    """tfsec JSON 출력 파일에서 results 배열의 항목을 하나씩 파싱 (전체를 메모리에 올리지 않음)"""
+    buffer = _Buffer(fileobj)
+
+    # '"results"' 키와 뒤따르는 '[' (또는 null) 위치까지 이동
+    while True:
+        index = buffer.text.find('"results"', buffer.pos)
+        if index != -1:
+            buffer.pos = index + len('"results"')
+            buffer.skip_whitespace(':')
+            break
+        buffer.pos = max(buffer.pos, len(buffer.text) - len('"results"'))
+        if not buffer.fill():
+            return
+
+    if buffer.peek() != '[':
+        return  # "results": null
+    buffer.pos += 1
+
+    while True:
+        buffer.skip_whitespace(',')
+        if buffer.peek() in (']', ''):
+            return
+
+        while True:
+            try:
+                result, end = _decoder.raw_decode(buffer.text, buffer.pos)
+                break
+            except json.JSONDecodeError:
+                if not buffer.fill():
+                    raise
+        buffer.pos = end
+        yield result
+
+
+def ndjson_chunks(results):
+    for result in results:
+        yield json.dumps(result) + '\n'
+
+
+def _sarif_result(result):
+    location = result.get('location') or {}
+    return {
+        'ruleId': result.get('long_id') or result.get('rule_id'),
+        'level': SARIF_LEVELS.get((result.get('severity') or '').upper(), 'warning'),
+        'message': {'text': result.get('description') or result.get('rule_description') or ''},
+        'locations': [{
+            'physicalLocation': {
+                'artifactLocation': {'uri': location.get('filename')},
+                'region': {
+                    'startLine': location.get('start_line') or 1,
+                    'endLine': location.get('end_line') or location.get('start_line') or 1,
+                },
+            },
+        }],
+    }
+
+
+def sarif_chunks(results, tool_version):
+    # 규칙 목록(driver.rules)은 선택 항목이라 생략하고 결과만 순서대로 기록
+    header = {
+        'version': '2.1.0',
+        '$schema': SARIF_SCHEMA,
+        'runs': [{
+            'tool': {'driver': {'name': 'tfsec', 'version': tool_version, 'informationUri': 'https://github.com/aquasecurity/tfsec'}},
+            'results': [],
+        }],
+    }
+    opening = json.dumps(header)
+    yield opening[:opening.rindex('[]')] + '['
+
+    for index, result in enumerate(results):
+        yield (',' if index else '') + json.dumps(_sarif_result(result))
+
+    yield ']}]}'
@@ -1,3 +1,1095 @@
-from django.test import TestCase
+import io
+import os
+import re
+import hmac
+import json
+import shutil
+import hashlib
+import tarfile
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from github.blobs import blob_cache, git_blob_sha
+
+from .cache import cached_scan, cached_batch_scan, memory_cache, LRUCache, make_cache_key
+from .compact import compact_results
+from .diff import finding_fingerprint, fingerprint_results, load_baseline
+from .fast import check_syntax
+from .hcl import parse
+from .rules import RULES, evaluate
+from .incremental import (
+    verify_signature, changed_directories, module_references, rescan_directories, scan_repository, merged_findings,
+)
+from .jobs import expire_stale_job, run_scan_job
+from .models import Scan, ScanJob, ScanResultCache
+from .repo import extract_repo_archive, GitHubArchiveError
+from .runner import tfsec_command, resource_limits
+from .scheduler import ScanScheduler, ScanQueueFull, ScanQueueTimeout, scheduler
+from .streaming import iter_tfsec_results, ndjson_chunks, sarif_chunks
+from .store import record_scan, parse_page_params, keyset_page
+from .uploads import ScanDirectoryWriter, UploadRejected, extract_tar_stream
+
+REPO_FILES = {
+    'main.tf': b'resource "aws_s3_bucket" "b" {\n  acl = "public-read"\n}\n',
+    'modules/net/vpc.tf': b'cidr = "10.0.0.0/16"\n',
+    'README.md': b'not terraform\n',
+}
+
+
+def tar_gz(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as archive:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    # tarball(→ codeload 리다이렉트), git trees, git blobs 만 흉내냄
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, status_code, body, content_type='application/json'):
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+
+        if self.path == '/repos/u/r/tarball/main':
+            self.send_response(302)
+            self.send_header('Location', f'http://127.0.0.1:{server.server_port}/codeload/u-r-abc.tar.gz')
+            self.end_headers()
+        elif self.path == '/codeload/u-r-abc.tar.gz':
+            # GitHub tarball 은 최상위에 {owner}-{repo}-{sha}/ 디렉토리가 있음
+            self.send_body(200, tar_gz({f'u-r-abc/{name}': data for name, data in REPO_FILES.items()}), 'application/x-gzip')
+        elif self.path.startswith('/repos/u/r/git/trees/main'):
+            tree = [{'path': name, 'type': 'blob', 'sha': git_blob_sha(data)} for name, data in REPO_FILES.items()]
+            self.send_body(200, json.dumps({'tree': tree, 'truncated': False}).encode())
+        elif self.path.startswith('/repos/u/r/git/blobs/'):
+            sha = self.path.rsplit('/', 1)[1]
+            data = next((data for data in REPO_FILES.values() if git_blob_sha(data) == sha), None)
+            if data is None:
+                self.send_body(404, b'{"message": "Not Found"}')
+            else:
+                self.send_body(200, data, 'application/octet-stream')
+        else:
+            self.send_body(404, b'{"message": "Not Found"}')
+
+
+class ScanDirectoryWriterTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.writer = ScanDirectoryWriter(self.root, 1024, 10)
+
+    def test_rejects_paths_outside_root(self):
+        for path in ('../evil.tf', 'a/../../evil.tf', '..\\evil.tf'):
+            with self.subTest(path=path), self.assertRaises(UploadRejected):
+                self.writer.write(path, [b'x = 1'])
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.root), 'evil.tf')))
+
+    def test_absolute_paths_stay_inside_root(self):
+        self.writer.write('/etc/evil.tf', [b'x = 1'])
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'etc', 'evil.tf')))
+
+    def test_rejects_symlink_escape(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside, ignore_errors=True)
+        os.symlink(outside, os.path.join(self.root, 'link'))
+        with self.assertRaises(UploadRejected):
+            self.writer.write('link/evil.tf', [b'x = 1'])
+        self.assertEqual(os.listdir(outside), [])
+
+    def test_skips_non_terraform_files(self):
+        self.assertFalse(self.writer.write('README.md', [b'hi']))
+        self.assertEqual(self.writer.file_hashes, {})
+
+    def test_size_limit(self):
+        with self.assertRaises(UploadRejected) as raised:
+            self.writer.write('big.tf', [b'x' * 1025])
+        self.assertEqual(raised.exception.status_code, 413)
+
+    def test_tar_member_traversal_rejected(self):
+        archive = tar_gz({'ok.tf': b'x = 1', '../evil.tf': b'x = 2'})
+        with self.assertRaises(UploadRejected):
+            extract_tar_stream(io.BytesIO(archive), self.writer)
+        self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.root), 'evil.tf')))
+
+
+class ExtractRepoArchiveTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHubHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.enterClassContext(override_settings(GITHUB_API_URL=f'http://127.0.0.1:{cls.server.server_port}'))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.writer = ScanDirectoryWriter(self.root, 1024 * 1024, 100)
+
+    def use_blob_cache(self, max_bytes):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        for name, value in (('root', cache_dir), ('max_bytes', max_bytes), ('total_bytes', None)):
+            patcher = mock.patch.object(blob_cache, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.root, rel_path), 'rb') as f:
+            return f.read()
+
+    def test_tarball_extracts_terraform_files_only(self):
+        # 캐시를 끄면 트리 조회 없이 tarball 한 번으로 받음
+        self.use_blob_cache(0)
+        extract_repo_archive(self.writer, 'token', 'u', 'r', 'main')
+
+        self.assertEqual(sorted(self.writer.file_hashes), ['main.tf', 'modules/net/vpc.tf'])
+        self.assertEqual(self.read('main.tf'), REPO_FILES['main.tf'])
+        self.assertEqual(self.read('modules/net/vpc.tf'), REPO_FILES['modules/net/vpc.tf'])
+        self.assertEqual(self.server.requests, ['/repos/u/r/tarball/main', '/codeload/u-r-abc.tar.gz'])
+
+    def test_tarball_select(self):
+        self.use_blob_cache(0)
+        extract_repo_archive(self.writer, 'token', 'u', 'r', 'main', select=lambda name: name.startswith('modules/'))
+        self.assertEqual(list(self.writer.file_hashes), ['modules/net/vpc.tf'])
+
+    def test_tarball_error(self):
+        self.use_blob_cache(0)
+        with self.assertRaises(GitHubArchiveError) as raised:
+            extract_repo_archive(self.writer, 'token', 'u', 'missing', 'main')
+        self.assertEqual(raised.exception.status_code, 404)
+
+    def test_blobs_from_tree_and_cache(self):
+        self.use_blob_cache(1024 * 1024)
+        extract_repo_archive(self.writer, 'token', 'u', 'r', 'main')
+        self.assertEqual(self.read('main.tf'), REPO_FILES['main.tf'])
+        self.assertEqual(sum('/git/blobs/' in path for path in self.server.requests), 2)
+
+        # 두 번째는 캐시된 blob 사용 (트리 조회만)
+        self.server.requests.clear()
+        writer = ScanDirectoryWriter(tempfile.mkdtemp(dir=self.root), 1024 * 1024, 100)
+        extract_repo_archive(writer, 'token', 'u', 'r', 'main')
+        self.assertEqual(sorted(writer.file_hashes), ['main.tf', 'modules/net/vpc.tf'])
+        self.assertFalse(any('/git/blobs/' in path for path in self.server.requests))
+
+    def test_evicted_blob_is_refetched(self):
+        self.use_blob_cache(1024 * 1024)
+        extract_repo_archive(self.writer, 'token', 'u', 'r', 'main')
+
+        # 캐시 확인 직후 삭제된 상황
+        sha = git_blob_sha(REPO_FILES['main.tf'])
+        real_open = blob_cache.open
+
+        def evicted_open(blob_sha):
+            if blob_sha == sha:
+                os.remove(blob_cache.path(sha))
+            return real_open(blob_sha)
+
+        self.server.requests.clear()
+        writer = ScanDirectoryWriter(tempfile.mkdtemp(dir=self.root), 1024 * 1024, 100)
+        with mock.patch.object(blob_cache, 'open', evicted_open):
+            extract_repo_archive(writer, 'token', 'u', 'r', 'main')
+        with open(os.path.join(writer.root, 'main.tf'), 'rb') as f:
+            self.assertEqual(f.read(), REPO_FILES['main.tf'])
+        self.assertIn(f'/repos/u/r/git/blobs/{sha}', self.server.requests)
+
+
+@override_settings(TFSEC_SYNTAX_PRECHECK=True)
+class CheckSyntaxTests(SimpleTestCase):
+    def test_reports_errors(self):
+        errors = check_syntax('resource "a" "b" {')
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['line'], 1)
+
+    def test_accepts_valid_variants(self):
+        for code in (
+            '﻿resource "a" "b" {\n  x = 1\n}',
+            'resource "a" "b" {\n  x = 1\n}',
+            'x = "\\U0001F600"',
+            'x = "\\u00e9"',
+        ):
+            with self.subTest(code=code):
+                self.assertEqual(check_syntax(code), [])
+
+    def test_fails_open_on_deep_nesting(self):
+        self.assertEqual(check_syntax('x = ' + '[' * 100000 + ']' * 100000), [])
+
+    def test_fails_open_on_parser_errors(self):
+        with mock.patch('tfsec.fast.parse', side_effect=RuntimeError('parser bug')):
+            self.assertEqual(check_syntax('x = "fail-open"'), [])
+
+
+@override_settings(GITHUB_WEBHOOK_SECRET='secret')
+class VerifySignatureTests(SimpleTestCase):
+    body = b'{"ref": "refs/heads/main"}'
+
+    def sign(self, body, secret='secret'):
+        return 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+    def test_accepts_valid_signature(self):
+        self.assertTrue(verify_signature(self.body, self.sign(self.body)))
+
+    def test_rejects_invalid_signatures(self):
+        for signature in (
+            self.sign(self.body, 'other'),
+            self.sign(self.body + b' '),
+            self.sign(self.body)[len('sha256='):],
+            'sha1=' + self.sign(self.body)[len('sha256='):],
+            '',
+            None,
+        ):
+            with self.subTest(signature=signature):
+                self.assertFalse(verify_signature(self.body, signature))
+
+    @override_settings(GITHUB_WEBHOOK_SECRET='')
+    def test_rejects_everything_without_secret(self):
+        self.assertFalse(verify_signature(self.body, 'sha256=' + hmac.new(b'', self.body, hashlib.sha256).hexdigest()))
+
+
+class ChangedDirectoriesTests(SimpleTestCase):
+    def test_collects_terraform_directories(self):
+        commits = [
+            {'added': ['main.tf', 'docs/README.md'], 'modified': ['modules/net/vpc.tf'], 'removed': []},
+            {'added': None, 'modified': ['envs/prod/terraform.tfvars'], 'removed': ['old/legacy.tf.json']},
+            {},
+        ]
+        self.assertEqual(changed_directories(commits), {'', 'modules/net', 'envs/prod', 'old'})
+
+    def test_ignores_non_terraform_changes(self):
+        self.assertEqual(changed_directories([{'modified': ['app.py', 'tf/notes.txt']}]), set())
+
+
+class ModuleReferencesTests(SimpleTestCase):
+    def test_local_sources(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        writer = ScanDirectoryWriter(root, 1024 * 1024, 100)
+        for rel_path, text in (
+            ('main.tf', 'module "a" {\n  source = "./modules/a"\n}\nmodule "r" {\n  source = "hashicorp/consul/aws"\n}\n'),
+            ('envs/prod/main.tf', 'module "a" {\n  source = "../../modules/a"\n}\nmodule "up" {\n  source = "../../../outside"\n}\n'),
+            ('envs/prod/broken.tf', 'module "b" {\n  source = "../../modules/b"\n'),
+            ('envs/dev/main.tf.json', json.dumps({'module': {'a': {'source': '../../modules/a'}}})),
+            ('modules/a/main.tf', 'module "root" {\n  source = "../.."\n}\n'),
+            ('modules/b/terraform.tfvars', 'source = "./ignored"\n'),
+        ):
+            writer.write(rel_path, [text.encode()])
+
+        self.assertEqual(module_references(writer), {
+            '': ['modules/a'],
+            'envs/prod': ['modules/a', 'modules/b'],
+            'envs/dev': ['modules/a'],
+            'modules/a': [''],
+            'modules/b': [],
+        })
+
+
+MODULE_CALL_PATTERN = re.compile(r'source\s*=\s*"(\.\.?/[^"]*)"')
+RESOURCE_PATTERN = re.compile(r'^resource "(\w+)" "(\w+)"', re.MULTILINE)
+
+
+def fake_tfsec(target_dir, stdout_file=None):
+    # tfsec 처럼 다른 디렉토리에서 호출되지 않는 디렉토리를 루트로 보고, 루트가 호출한 모듈까지 평가
+    # 결과 description 에 평가한 루트를 넣어 모듈이 어느 루트에서 평가되었는지 구분
+    root = os.path.realpath(target_dir)
+    files = {}
+    for current, _, names in os.walk(root):
+        for name in sorted(names):
+            if name.endswith('.tf'):
+                with open(os.path.join(current, name)) as f:
+                    files.setdefault(os.path.relpath(current, root), []).append((os.path.join(current, name), f.read()))
+
+    calls = {
+        directory: [
+            target for source in MODULE_CALL_PATTERN.findall(''.join(text for _, text in entries))
+            if (target := os.path.normpath(os.path.join(directory, source))) in files
+        ]
+        for directory, entries in files.items()
+    }
+    called = {target for targets in calls.values() for target in targets}
+
+    results = []
+
+    def evaluate(directory, root_module):
+        for path, text in files[directory]:
+            for match in RESOURCE_PATTERN.finditer(text):
+                results.append({
+                    'rule_id': 'TEST001',
+                    'resource': f'{match[1]}.{match[2]}',
+                    'description': f'evaluated from {root_module}',
+                    'location': {'filename': path, 'start_line': text.count('\n', 0, match.start()) + 1},
+                })
+        for target in calls[directory]:
+            evaluate(target, root_module)
+
+    for directory in sorted(files):
+        if directory not in called:
+            evaluate(directory, directory)
+
+    return {'returncode': 1 if results else 0, 'stdout': json.dumps({'results': results or None}), 'stderr': ''}
+
+
+BASE_TREE = {
+    'envs/prod/main.tf': 'module "net" {\n  source = "../../modules/net"\n}\n\nresource "aws_s3_bucket" "prod" {}\n',
+    'modules/net/main.tf': 'resource "aws_vpc" "main" {}\n',
+    'modules/db/main.tf': 'resource "aws_db_instance" "db" {}\n',
+    'standalone/main.tf': 'resource "aws_instance" "web" {}\n',
+}
+
+
+class IncrementalRescanTests(TestCase):
+    def setUp(self):
+        self.tree = dict(BASE_TREE)
+        for target, replacement in (
+            ('tfsec.incremental.extract_repo_archive', self.fake_extract),
+            ('tfsec.incremental.run_tfsec', fake_tfsec),
+        ):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fake_extract(self, writer, access_token, owner, repo_name, ref, select=None, urgent=True):
+        for rel_path, text in self.tree.items():
+            writer.write(rel_path, [text.encode()])
+
+    def assert_matches_full_scan(self, tree):
+        # 기준 결과(BASE_TREE)에서 증분 재스캔한 결과와 바뀐 트리를 처음부터 전체 스캔한 결과 비교
+        self.tree = dict(BASE_TREE)
+        scan_repository('token', 'u', 'incremental', 'main', 'a' * 40)
+        self.tree = tree
+        summary = rescan_directories('token', 'u', 'incremental', 'main', 'b' * 40)
+        scan_repository('token', 'u', 'full', 'main', 'b' * 40)
+
+        self.assertEqual(merged_findings('u/incremental', 'main'), merged_findings('u/full', 'main'))
+        return summary
+
+    def test_changed_module_is_scanned_from_its_caller(self):
+        tree = {**BASE_TREE, 'modules/net/main.tf': 'resource "aws_vpc" "main" {}\nresource "aws_subnet" "a" {}\n'}
+        summary = self.assert_matches_full_scan(tree)
+
+        self.assertEqual(summary, {
+            'rescanned': ['envs/prod', 'modules/net'],
+            'unchanged': ['modules/db', 'standalone'],
+            'removed': [],
+        })
+        descriptions = {result['description'] for result in merged_findings('u/incremental', 'main')
+                        if result['location']['filename'].startswith('modules/net/')}
+        self.assertEqual(descriptions, {'evaluated from envs/prod'})
+
+    def test_module_dropped_by_caller_becomes_root(self):
+        tree = {**BASE_TREE, 'envs/prod/main.tf': 'resource "aws_s3_bucket" "prod" {}\n'}
+        summary = self.assert_matches_full_scan(tree)
+        self.assertEqual(summary['rescanned'], ['envs/prod', 'modules/net'])
+
+    def test_new_root_calling_existing_module(self):
+        tree = {**BASE_TREE, 'envs/dev/main.tf': 'module "db" {\n  source = "../../modules/db"\n}\n'}
+        summary = self.assert_matches_full_scan(tree)
+        self.assertEqual(summary['rescanned'], ['envs/dev', 'modules/db'])
+
+    def test_removed_directory(self):
+        tree = {path: text for path, text in BASE_TREE.items() if not path.startswith('standalone/')}
+        summary = self.assert_matches_full_scan(tree)
+        self.assertEqual(summary, {
+            'rescanned': [],
+            'unchanged': ['envs/prod', 'modules/db', 'modules/net'],
+            'removed': ['standalone'],
+        })
+
+    def test_unchanged_tree_runs_nothing(self):
+        scan_repository('token', 'u', 'incremental', 'main', 'a' * 40)
+        with mock.patch('tfsec.incremental.run_tfsec', side_effect=AssertionError('tfsec should not run')):
+            summary = rescan_directories('token', 'u', 'incremental', 'main', 'b' * 40)
+        self.assertEqual(summary['rescanned'], [])
+
+
+def tfsec_result(rule_id='AVD-AWS-0086', resource='aws_s3_bucket.b', filename='main.tf', line=1, **extra):
+    return {
+        'rule_id': rule_id,
+        'long_id': rule_id.lower(),
+        'severity': 'HIGH',
+        'resource': resource,
+        'location': {'filename': filename, 'start_line': line, 'end_line': line},
+        **extra,
+    }
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_ignores_line_numbers(self):
+        self.assertEqual(finding_fingerprint(tfsec_result(line=1)), finding_fingerprint(tfsec_result(line=40)))
+        self.assertEqual(finding_fingerprint(tfsec_result(filename='./a/main.tf')), finding_fingerprint(tfsec_result(filename='a/main.tf')))
+        self.assertNotEqual(finding_fingerprint(tfsec_result()), finding_fingerprint(tfsec_result(resource='aws_s3_bucket.c')))
+
+    def test_duplicate_suffixes_do_not_depend_on_order(self):
+        results = [tfsec_result(line=3), tfsec_result(resource='aws_s3_bucket.c'), tfsec_result(line=9)]
+        def by_result(results):
+            keys = [(result['location']['start_line'], result['resource']) for result in results]
+            return dict(zip(keys, fingerprint_results(results)))
+
+        forward = by_result(results)
+        backward = by_result(results[::-1])
+
+        self.assertEqual(forward, backward)
+        self.assertEqual(len(set(forward.values())), 3)
+
+
+class LoadBaselineTests(SimpleTestCase):
+    def test_formats(self):
+        fingerprint = finding_fingerprint(tfsec_result())
+        for baseline in (
+            [fingerprint],
+            [tfsec_result(line=7)],
+            {'results': [tfsec_result()]},
+            json.dumps([fingerprint]),
+            json.dumps({'results': [tfsec_result()]}),
+        ):
+            with self.subTest(baseline=baseline):
+                self.assertEqual(load_baseline(baseline), {fingerprint})
+
+    def test_empty(self):
+        for baseline in (None, '', [], {}, '[]'):
+            with self.subTest(baseline=baseline):
+                self.assertEqual(load_baseline(baseline), set())
+
+    def test_rejects_other_values(self):
+        for baseline in ('not json', '"abc"', '42', 42, True):
+            with self.subTest(baseline=baseline), self.assertRaises(ValueError):
+                load_baseline(baseline)
+
+
+class ScanDiffViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='u', github_id='1'))
+
+    def record(self, results):
+        return record_scan('u/r', 'main', '', Scan.SOURCE_REPO, results)
+
+    def test_reordered_duplicates_are_unchanged(self):
+        base = self.record([tfsec_result(line=3), tfsec_result(line=9)])
+        head = self.record([tfsec_result(line=9), tfsec_result(line=3), tfsec_result(rule_id='AVD-AWS-0132')])
+
+        res = self.client.get('/check_security/scans/diff/', {'repo_name': 'r', 'base_scan_id': base.id, 'head_scan_id': head.id})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([result['rule_id'] for result in res.data['new']], ['AVD-AWS-0132'])
+        self.assertEqual(res.data['fixed'], [])
+        self.assertEqual(res.data['unchanged_count'], 2)
+
+    def test_baseline_as_form_field(self):
+        self.record([])
+        self.record([tfsec_result(), tfsec_result(rule_id='AVD-AWS-0132')])
+
+        res = self.client.post('/check_security/scans/diff/', {
+            'repo_name': 'r',
+            'baseline': json.dumps([finding_fingerprint(tfsec_result())]),
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([result['rule_id'] for result in res.data['new']], ['AVD-AWS-0132'])
+        self.assertEqual(res.data['suppressed_count'], 1)
+
+    def test_invalid_baseline(self):
+        res = self.client.post('/check_security/scans/diff/', {'repo_name': 'r', 'baseline': 'abc'})
+        self.assertEqual(res.status_code, 400)
+
+
+class ScanSchedulerTests(SimpleTestCase):
+    def hold_slots(self, scan_scheduler, count):
+        # 슬롯을 잡은 채로 대기하는 스레드 (release.set() 으로 반납)
+        release = threading.Event()
+        entered = threading.Semaphore(0)
+
+        def hold():
+            with scan_scheduler.slot():
+                entered.release()
+                release.wait(5)
+
+        threads = [threading.Thread(target=hold) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for _ in range(count):
+            self.assertTrue(entered.acquire(timeout=5))
+
+        def finish():
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        self.addCleanup(finish)
+        return finish
+
+    def test_zero_max_concurrent_is_unlimited(self):
+        scan_scheduler = ScanScheduler(max_concurrent=0, max_queue=0, queue_timeout=0.1)
+        self.hold_slots(scan_scheduler, 3)
+        self.assertEqual(scan_scheduler.stats()['running'], 3)
+        with scan_scheduler.slot() as waited:
+            self.assertLess(waited, 0.1)
+
+    def test_queue_full(self):
+        scan_scheduler = ScanScheduler(max_concurrent=1, max_queue=0, queue_timeout=1)
+        self.hold_slots(scan_scheduler, 1)
+        with self.assertRaises(ScanQueueFull) as raised, scan_scheduler.slot():
+            pass
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+        self.assertEqual(scan_scheduler.stats()['rejected'], 1)
+
+    def test_queue_timeout(self):
+        scan_scheduler = ScanScheduler(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        self.hold_slots(scan_scheduler, 1)
+        with self.assertRaises(ScanQueueTimeout), scan_scheduler.slot():
+            pass
+        self.assertEqual(scan_scheduler.queue_depth, 0)
+        self.assertEqual(scan_scheduler.stats()['queue_timeouts'], 1)
+
+    def test_waiting_scan_gets_released_slot(self):
+        scan_scheduler = ScanScheduler(max_concurrent=1, max_queue=1, queue_timeout=5)
+        finish = self.hold_slots(scan_scheduler, 1)
+        threading.Timer(0.05, finish).start()
+        with scan_scheduler.slot() as waited:
+            self.assertGreater(waited, 0)
+        self.assertEqual(scan_scheduler.stats()['admitted'], 2)
+
+
+class ScanRejectedViewTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch('tfsec.cache.get_tfsec_version', return_value='v-test')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post_scan(self, code):
+        return self.client.post('/check_security/', {'terraform_code': code}, content_type='application/json')
+
+    def test_queue_full_is_429(self):
+        with mock.patch.multiple(scheduler, max_concurrent=1, max_queue=0), mock.patch.object(scheduler, '_running', 1):
+            res = self.post_scan('resource "a" "queue_full" {}')
+        self.assertEqual(res.status_code, 429)
+        self.assertEqual(res['Retry-After'], str(res.json()['retry_after']))
+
+    def test_queue_timeout_is_503(self):
+        with mock.patch.multiple(scheduler, max_concurrent=1, max_queue=1, queue_timeout=0.01), \
+                mock.patch.object(scheduler, '_running', 1):
+            res = self.post_scan('resource "a" "queue_timeout" {}')
+        self.assertEqual(res.status_code, 503)
+        self.assertIn('Retry-After', res)
+
+
+class TfsecCommandTests(SimpleTestCase):
+    @override_settings(TFSEC_CPU_LIMIT=30, TFSEC_MEMORY_LIMIT_MB=512)
+    def test_limits_applied_before_exec(self):
+        with mock.patch('tfsec.runner.prlimit_path', return_value='/usr/bin/prlimit'):
+            command = tfsec_command('/scan', resource_limits())
+        self.assertEqual(command, [
+            '/usr/bin/prlimit', '--cpu=30', f'--as={512 * 1024 * 1024}', '--',
+            'tfsec', '/scan', '--format', 'json',
+        ])
+
+    @override_settings(TFSEC_CPU_LIMIT=0, TFSEC_MEMORY_LIMIT_MB=0)
+    def test_no_limits(self):
+        with mock.patch('tfsec.runner.prlimit_path', return_value='/usr/bin/prlimit'):
+            self.assertEqual(tfsec_command('/scan', resource_limits()), ['tfsec', '/scan', '--format', 'json'])
+
+
+def tfsec_outcome(results=None, stderr=''):
+    return {'returncode': 1 if results else 0, 'stdout': json.dumps({'results': results}), 'stderr': stderr}
+
+
+class CacheTestCase(TestCase):
+    def setUp(self):
+        memory_cache.clear()
+        self.addCleanup(memory_cache.clear)
+        patcher = mock.patch('tfsec.cache.get_tfsec_version', return_value='v-test')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ScanCacheTests(CacheTestCase):
+    code = 'resource "aws_s3_bucket" "b" {\n  acl = "public-read"\n}'
+
+    def scan(self, code=None, outcome=None):
+        with mock.patch('tfsec.cache.scan_terraform_code', return_value=outcome or tfsec_outcome([tfsec_result()])) as run:
+            result = cached_scan(code or self.code)
+        return result, run.call_count
+
+    def test_miss_then_memory_then_db(self):
+        (outcome, tier, key), runs = self.scan()
+        self.assertEqual((tier, runs), (None, 1))
+
+        (cached, tier, cached_key), runs = self.scan()
+        self.assertEqual((cached, tier, cached_key, runs), (outcome, 'memory', key, 0))
+
+        # 다른 워커(메모리 캐시 없음)에서는 DB 에서 읽음
+        memory_cache.clear()
+        (cached, tier, _), runs = self.scan()
+        self.assertEqual((cached, tier, runs), (outcome, 'db', 0))
+        self.assertEqual(ScanResultCache.objects.get(key=key).hits, 1)
+
+    def test_whitespace_only_changes_share_a_key(self):
+        self.assertEqual(make_cache_key(self.code), make_cache_key(self.code.replace('\n', '\r\n') + '  \n\n'))
+        self.assertNotEqual(make_cache_key(self.code), make_cache_key(self.code.replace('public-read', 'private')))
+
+    @override_settings(TFSEC_CACHE_TTL=60)
+    def test_expired_db_entry_is_a_miss(self):
+        (_, _, key), _ = self.scan()
+        memory_cache.clear()
+        ScanResultCache.objects.filter(key=key).update(last_hit_at=timezone.now() - timedelta(seconds=61))
+
+        (_, tier, _), runs = self.scan()
+        self.assertEqual((tier, runs), (None, 1))
+
+    def test_failed_runs_are_not_cached(self):
+        for outcome in (
+            {'returncode': -9, 'stdout': '', 'stderr': 'killed'},
+            {'returncode': 1, 'stdout': 'panic: runtime error', 'stderr': ''},
+        ):
+            with self.subTest(outcome=outcome):
+                self.scan('resource "a" "failing" {}', outcome)
+                (_, tier, _), runs = self.scan('resource "a" "failing" {}', outcome)
+                self.assertEqual((tier, runs), (None, 1))
+        self.assertFalse(ScanResultCache.objects.exists())
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_ttl(self):
+        cache = LRUCache(max_size=2, ttl=10)
+        with mock.patch('tfsec.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('tfsec.cache.time.monotonic', return_value=109.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('tfsec.cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get('a'))
+
+    def test_disabled(self):
+        cache = LRUCache(max_size=0, ttl=10)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+
+class BatchCacheTests(CacheTestCase):
+    def test_batch_results_are_not_served_to_single_scans(self):
+        batch_outcome = tfsec_outcome([tfsec_result()])
+        with mock.patch('tfsec.cache.scan_terraform_batch', return_value=({'a': batch_outcome}, True)):
+            self.assertEqual(cached_batch_scan({'a': 'resource "a" "b" {}'}), {'a': (batch_outcome, None)})
+
+        # 단일 스캔은 배치 결과 대신 tfsec 를 직접 실행
+        single_outcome = tfsec_outcome([tfsec_result()], stderr='warning: something')
+        with mock.patch('tfsec.cache.scan_terraform_code', return_value=single_outcome) as scan:
+            outcome, cache_tier, _ = cached_scan('resource "a" "b" {}')
+        scan.assert_called_once()
+        self.assertEqual((outcome, cache_tier), (single_outcome, None))
+
+        # 배치는 같은 조각에 대해 캐시된 결과 사용
+        with mock.patch('tfsec.cache.scan_terraform_batch', side_effect=AssertionError('batch should not run')):
+            self.assertEqual(cached_batch_scan({'a': 'resource "a" "b" {}'})['a'][1], 'memory')
+
+    def test_batch_reuses_single_scan_results(self):
+        single_outcome = tfsec_outcome(stderr='from a single run')
+        with mock.patch('tfsec.cache.scan_terraform_code', return_value=single_outcome):
+            cached_scan('resource "a" "single" {}')
+
+        with mock.patch('tfsec.cache.scan_terraform_batch', side_effect=AssertionError('batch should not run')):
+            self.assertEqual(cached_batch_scan({'s': 'resource "a" "single" {}'}), {'s': (single_outcome, 'memory')})
+
+    def test_unsplit_batch_failure_is_not_cached(self):
+        failure = {'returncode': 2, 'stdout': 'panic', 'stderr': 'boom'}
+        with mock.patch('tfsec.cache.scan_terraform_batch', return_value=({'a': failure}, False)):
+            cached_batch_scan({'a': 'resource "a" "fail" {}'})
+        with mock.patch('tfsec.cache.scan_terraform_batch', return_value=({'a': tfsec_outcome()}, True)) as scan:
+            cached_batch_scan({'a': 'resource "a" "fail" {}'})
+        scan.assert_called_once()
+
+
+class CompactResultsTests(SimpleTestCase):
+    def test_rules_are_listed_once(self):
+        results = [
+            tfsec_result(line=1, description='Bucket has a public ACL', impact='public'),
+            tfsec_result(line=5, resource='aws_s3_bucket.c', description='Bucket has a public ACL', impact='public'),
+            tfsec_result(line=9, resource='aws_s3_bucket.d', description='Bucket d has a public ACL', impact='public'),
+            tfsec_result(rule_id='AVD-AWS-0132', line=3),
+        ]
+        compact = compact_results(results)
+
+        self.assertEqual(list(compact['rules']), ['AVD-AWS-0086', 'AVD-AWS-0132'])
+        self.assertEqual(compact['rules']['AVD-AWS-0086']['impact'], 'public')
+        self.assertEqual(compact['results'][0], {
+            'rule_id': 'AVD-AWS-0086',
+            'resource': 'aws_s3_bucket.b',
+            'location': {'filename': 'main.tf', 'start_line': 1, 'end_line': 1},
+        })
+        self.assertEqual([result.get('description') for result in compact['results']], [None, None, 'Bucket d has a public ACL', None])
+
+    def test_empty(self):
+        self.assertEqual(compact_results(None), {'rules': {}, 'results': []})
+
+
+class ScanJobTests(TestCase):
+    def setUp(self):
+        # 워커 스레드 대신 테스트에서 직접 실행 (테스트 트랜잭션의 DB 연결은 닫지 않음)
+        self.submitted = []
+        for target, replacement in (
+            ('tfsec.jobs.get_executor', lambda: mock.Mock(submit=lambda fn, *args: self.submitted.append((fn, args)))),
+            ('tfsec.jobs.connection', mock.Mock()),
+            ('tfsec.jobs.close_old_connections', lambda: None),
+        ):
+            patcher = mock.patch(target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def create_job(self, code='resource "a" "b" {}'):
+        res = self.client.post('/check_security/jobs/', {'terraform_code': code}, content_type='application/json')
+        self.assertEqual(res.status_code, 202)
+        self.assertEqual(res.json()['status'], ScanJob.STATUS_PENDING)
+        return res.json()['job_id']
+
+    def poll(self, job_id):
+        res = self.client.get(f'/check_security/jobs/{job_id}/')
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def run_submitted(self):
+        for fn, args in self.submitted:
+            fn(*args)
+
+    def test_lifecycle(self):
+        job_id = self.create_job()
+        self.assertEqual([(fn, args) for fn, args in self.submitted], [(run_scan_job, (ScanJob.objects.get().id,))])
+        self.assertEqual(self.poll(job_id)['status'], ScanJob.STATUS_PENDING)
+
+        with mock.patch('tfsec.jobs.cached_scan', return_value=(tfsec_outcome(), None, 'key')):
+            self.run_submitted()
+
+        body = self.poll(job_id)
+        self.assertEqual(body['status'], ScanJob.STATUS_DONE)
+        self.assertEqual(body['result'], {'status': 'success', 'data': {'results': None}})
+        self.assertIsNotNone(body['started_at'])
+        self.assertIsNotNone(body['finished_at'])
+
+    def test_failed_scan(self):
+        job_id = self.create_job()
+        with mock.patch('tfsec.jobs.cached_scan', side_effect=RuntimeError('tfsec crashed')):
+            self.run_submitted()
+
+        body = self.poll(job_id)
+        self.assertEqual((body['status'], body['error']), (ScanJob.STATUS_FAILED, 'tfsec crashed'))
+
+    def test_syntax_error_is_rejected_before_queueing(self):
+        res = self.client.post('/check_security/jobs/', {'terraform_code': 'resource "a" {'}, content_type='application/json')
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.submitted, [])
+
+    def test_unknown_job(self):
+        self.assertEqual(self.client.get('/check_security/jobs/00000000-0000-0000-0000-000000000000/').status_code, 404)
+
+
+@override_settings(TFSEC_JOB_STALE_AFTER=600)
+class ExpireStaleJobTests(TestCase):
+    def job(self, job_status, age, started=False):
+        changed_at = timezone.now() - timedelta(seconds=age)
+        job = ScanJob.objects.create(terraform_code='x', status=job_status, started_at=changed_at if started else None)
+        if not started:
+            ScanJob.objects.filter(id=job.id).update(created_at=changed_at)
+        return ScanJob.objects.get(id=job.id)
+
+    def test_stale_pending_and_running_jobs_fail(self):
+        for job_status, started in ((ScanJob.STATUS_PENDING, False), (ScanJob.STATUS_RUNNING, True)):
+            with self.subTest(status=job_status):
+                job = expire_stale_job(self.job(job_status, 601, started))
+                self.assertEqual(job.status, ScanJob.STATUS_FAILED)
+                self.assertIsNotNone(job.finished_at)
+
+    def test_recent_and_finished_jobs_are_kept(self):
+        for job_status, age in ((ScanJob.STATUS_PENDING, 10), (ScanJob.STATUS_DONE, 6000), (ScanJob.STATUS_FAILED, 6000)):
+            with self.subTest(status=job_status):
+                self.assertEqual(expire_stale_job(self.job(job_status, age)).status, job_status)
+
+    def test_running_job_uses_start_time(self):
+        job = self.job(ScanJob.STATUS_RUNNING, 30, started=True)
+        ScanJob.objects.filter(id=job.id).update(created_at=timezone.now() - timedelta(seconds=6000))
+        self.assertEqual(expire_stale_job(ScanJob.objects.get(id=job.id)).status, ScanJob.STATUS_RUNNING)
+
+    def test_job_finished_meanwhile_is_not_overwritten(self):
+        job = self.job(ScanJob.STATUS_RUNNING, 601, started=True)
+        ScanJob.objects.filter(id=job.id).update(status=ScanJob.STATUS_DONE, result={'status': 'success'})
+        self.assertEqual(expire_stale_job(job).status, ScanJob.STATUS_DONE)
+
+    @override_settings(TFSEC_JOB_STALE_AFTER=0)
+    def test_disabled(self):
+        self.assertEqual(expire_stale_job(self.job(ScanJob.STATUS_PENDING, 60000)).status, ScanJob.STATUS_PENDING)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(get_user_model().objects.create(username='u', github_id='1'))
+
+    def test_parse_page_params(self):
+        self.assertEqual(parse_page_params({}), (None, 100))
+        self.assertEqual(parse_page_params({'cursor': '7', 'limit': '5'}), (7, 5))
+        self.assertEqual(parse_page_params({'limit': '0'}), (None, 1))
+        self.assertEqual(parse_page_params({'limit': '100000'}), (None, 1000))
+        with self.assertRaises(ValueError):
+            parse_page_params({'cursor': 'x'})
+
+    def test_keyset_page_walks_all_rows_once(self):
+        scans = [record_scan('u/r', 'main', str(n), Scan.SOURCE_REPO, []) for n in range(5)]
+        ids = [scan.id for scan in scans]
+
+        for descending, expected in ((False, ids), (True, ids[::-1])):
+            with self.subTest(descending=descending):
+                seen, cursor = [], None
+                while True:
+                    page, cursor = keyset_page(Scan.objects.all(), cursor, 2, descending)
+                    seen += [scan.id for scan in page]
+                    if cursor is None:
+                        break
+                self.assertEqual(seen, expected)
+
+    def test_exact_last_page_has_no_cursor(self):
+        for n in range(4):
+            record_scan('u/r', 'main', str(n), Scan.SOURCE_REPO, [])
+        page, cursor = keyset_page(Scan.objects.all(), None, 4)
+        self.assertEqual((len(page), cursor), (4, None))
+
+    def test_scan_list_newest_first(self):
+        scans = [record_scan('u/r', 'main', str(n), Scan.SOURCE_REPO, []) for n in range(3)]
+        record_scan('u/r', 'dev', 'x', Scan.SOURCE_REPO, [])
+        record_scan('other/r', 'main', 'y', Scan.SOURCE_REPO, [])
+
+        res = self.client.get('/check_security/scans/', {'repo_name': 'r', 'limit': 2})
+        self.assertEqual([scan['commit_sha'] for scan in res.data['scans']], ['2', '1'])
+        self.assertEqual(res.data['next_cursor'], scans[1].id)
+
+        res = self.client.get('/check_security/scans/', {'repo_name': 'r', 'limit': 2, 'cursor': res.data['next_cursor']})
+        self.assertEqual([scan['commit_sha'] for scan in res.data['scans']], ['0'])
+        self.assertIsNone(res.data['next_cursor'])
+
+    def test_invalid_page_params(self):
+        for path in ('/check_security/scans/', '/check_security/findings/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path, {'repo_name': 'r', 'cursor': 'x'}).status_code, 400)
+
+    def test_finding_filters(self):
+        record_scan('u/r', 'main', 'old', Scan.SOURCE_REPO, [tfsec_result(rule_id='AVD-OLD')])
+        scan = record_scan('u/r', 'main', 'new', Scan.SOURCE_REPO, [
+            tfsec_result(filename='main.tf', line=1),
+            tfsec_result(rule_id='AVD-AWS-0132', filename='modules/a/main.tf', severity='LOW'),
+            tfsec_result(rule_id='AVD-AWS-0089', filename='modules/b/main.tf', severity='MEDIUM'),
+        ])
+
+        def rule_ids(**params):
+            res = self.client.get('/check_security/findings/', {'repo_name': 'r', **params})
+            self.assertEqual(res.status_code, 200)
+            return [result['rule_id'] for result in res.data['results']]
+
+        self.assertEqual(rule_ids(), ['AVD-AWS-0086', 'AVD-AWS-0132', 'AVD-AWS-0089'])
+        self.assertEqual(rule_ids(severity='low,medium'), ['AVD-AWS-0132', 'AVD-AWS-0089'])
+        self.assertEqual(rule_ids(rule_id='AVD-AWS-0086,AVD-AWS-0089'), ['AVD-AWS-0086', 'AVD-AWS-0089'])
+        self.assertEqual(rule_ids(path='modules/'), ['AVD-AWS-0132', 'AVD-AWS-0089'])
+        self.assertEqual(rule_ids(path='modules/', severity='LOW'), ['AVD-AWS-0132'])
+        self.assertEqual(rule_ids(scan_id=scan.id - 1), ['AVD-OLD'])
+
+    def test_finding_pages(self):
+        record_scan('u/r', 'main', '', Scan.SOURCE_REPO, [tfsec_result(line=n) for n in range(5)])
+
+        lines, cursor = [], None
+        while True:
+            params = {'repo_name': 'r', 'limit': 2, **({'cursor': cursor} if cursor else {})}
+            res = self.client.get('/check_security/findings/', params)
+            lines += [result['location']['start_line'] for result in res.data['results']]
+            cursor = res.data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(lines, [0, 1, 2, 3, 4])
+
+    def test_finding_list_without_scans(self):
+        self.assertEqual(self.client.get('/check_security/findings/', {'repo_name': 'r'}).status_code, 404)
+
+
+class CountingReader(io.StringIO):
+    def __init__(self, text):
+        super().__init__(text)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.consumed += len(chunk)
+        return chunk
+
+
+class StreamingResultsTests(SimpleTestCase):
+    def parse(self, text, chunk_size=7):
+        with mock.patch('tfsec.streaming.CHUNK_SIZE', chunk_size):
+            return list(iter_tfsec_results(io.StringIO(text)))
+
+    def test_matches_json_loads(self):
+        results = [
+            tfsec_result(line=n, description='brackets ] and , "results" inside {strings}')
+            for n in range(20)
+        ]
+        text = json.dumps({'results': results}, indent=2)
+        for chunk_size in (1, 7, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(text, chunk_size), results)
+
+    def test_no_results(self):
+        for text in ('{"results": null}', '{"results": []}', '{\n  "results" :\n  [ ]\n}', '{}', ''):
+            with self.subTest(text=text):
+                self.assertEqual(self.parse(text), [])
+
+    def test_truncated_output_raises(self):
+        text = json.dumps({'results': [tfsec_result(), tfsec_result()]})
+        with self.assertRaises(json.JSONDecodeError):
+            self.parse(text[:-20])
+
+    def test_reads_incrementally(self):
+        text = json.dumps({'results': [tfsec_result(line=n) for n in range(1000)]})
+        reader = CountingReader(text)
+        with mock.patch('tfsec.streaming.CHUNK_SIZE', 1024):
+            results = iter_tfsec_results(reader)
+            self.assertEqual(next(results)['location']['start_line'], 0)
+            self.assertLessEqual(reader.consumed, 2048)
+            self.assertEqual(len(list(results)), 999)
+
+    def test_ndjson(self):
+        lines = ''.join(ndjson_chunks([tfsec_result(line=1), tfsec_result(line=2)])).splitlines()
+        self.assertEqual([json.loads(line)['location']['start_line'] for line in lines], [1, 2])
+
+    def test_sarif_shape(self):
+        results = [
+            tfsec_result(description='public bucket', line=3),
+            tfsec_result(rule_id='AVD-AWS-0132', severity='LOW', location={'filename': 'a.tf'}),
+            {'rule_id': 'X', 'severity': 'UNKNOWN'},
+        ]
+        sarif = json.loads(''.join(sarif_chunks(results, 'v1.28.0')))
+
+        self.assertEqual(sarif['version'], '2.1.0')
+        self.assertEqual(len(sarif['runs']), 1)
+        run = sarif['runs'][0]
+        self.assertEqual(run['tool']['driver']['name'], 'tfsec')
+        self.assertEqual(run['tool']['driver']['version'], 'v1.28.0')
+        self.assertEqual([result['ruleId'] for result in run['results']], ['avd-aws-0086', 'avd-aws-0132', 'X'])
+        self.assertEqual([result['level'] for result in run['results']], ['error', 'note', 'warning'])
+        self.assertEqual(run['results'][0]['message'], {'text': 'public bucket'})
+        self.assertEqual(run['results'][0]['locations'][0]['physicalLocation'], {
+            'artifactLocation': {'uri': 'main.tf'},
+            'region': {'startLine': 3, 'endLine': 3},
+        })
+        self.assertEqual(run['results'][1]['locations'][0]['physicalLocation']['region'], {'startLine': 1, 'endLine': 1})
+
+    def test_sarif_without_results(self):
+        self.assertEqual(json.loads(''.join(sarif_chunks([], 'v1')))['runs'][0]['results'], [])
+
+
+class RuleTests(SimpleTestCase):
+    def findings(self, code):
+        return [(result['rule_id'], result['resource'], result['location']['start_line']) for result in evaluate(parse(code))]
+
+    def rule_ids(self, code):
+        return [rule_id for rule_id, _, _ in self.findings(code)]
+
+    def test_s3_public_acl(self):
+        code = 'resource "aws_s3_bucket" "b" {\n  bucket = "x"\n  acl    = "public-read"\n}\n'
+        self.assertEqual(self.findings(code), [('AVD-AWS-0092', 'aws_s3_bucket.b', 3)])
+        self.assertEqual(self.rule_ids('resource "aws_s3_bucket_acl" "a" {\n  acl = "website"\n}\n'), ['AVD-AWS-0092'])
+        self.assertEqual(self.rule_ids('resource "aws_s3_bucket" "b" {\n  acl = "private"\n}\n'), [])
+        self.assertEqual(self.rule_ids('resource "aws_s3_bucket" "b" {\n  acl = var.acl\n}\n'), [])
+
+    def test_security_group_ingress(self):
+        code = (
+            'resource "aws_security_group" "sg" {\n'
+            '  ingress {\n'
+            '    cidr_blocks = ["10.0.0.0/8", "0.0.0.0/0"]\n'
+            '  }\n'
+            '  ingress {\n'
+            '    ipv6_cidr_blocks = ["::/0"]\n'
+            '  }\n'
+            '  ingress {\n'
+            '    cidr_blocks = ["10.0.0.0/8"]\n'
+            '  }\n'
+            '}\n'
+        )
+        self.assertEqual(self.findings(code), [('AVD-AWS-0107', 'aws_security_group.sg', 3), ('AVD-AWS-0107', 'aws_security_group.sg', 6)])
+        self.assertEqual(self.rule_ids('resource "aws_security_group_rule" "r" {\n  type = "ingress"\n  cidr_blocks = ["0.0.0.0/0"]\n}\n'), ['AVD-AWS-0107'])
+        self.assertEqual(self.rule_ids('resource "aws_vpc_security_group_ingress_rule" "r" {\n  cidr_ipv4 = "0.0.0.0/0"\n}\n'), ['AVD-AWS-0107'])
+        self.assertEqual(self.rule_ids('resource "aws_security_group_rule" "r" {\n  type = "ingress"\n  cidr_blocks = [var.cidr]\n}\n'), [])
+
+    def test_security_group_egress(self):
+        self.assertEqual(self.rule_ids('resource "aws_security_group" "sg" {\n  egress {\n    cidr_blocks = ["0.0.0.0/0"]\n  }\n}\n'), ['AVD-AWS-0104'])
+        self.assertEqual(self.rule_ids('resource "aws_security_group_rule" "r" {\n  type = "egress"\n  cidr_blocks = ["0.0.0.0/0"]\n}\n'), ['AVD-AWS-0104'])
+        self.assertEqual(self.rule_ids('resource "aws_vpc_security_group_egress_rule" "r" {\n  cidr_ipv6 = "::/0"\n}\n'), ['AVD-AWS-0104'])
+        self.assertEqual(self.rule_ids('resource "aws_security_group_rule" "r" {\n  type = "egress"\n  cidr_blocks = ["10.0.0.0/8"]\n}\n'), [])
+
+    def test_ebs_volume_encryption(self):
+        self.assertEqual(self.findings('resource "aws_ebs_volume" "v" {\n  size = 8\n}\n'), [('AVD-AWS-0026', 'aws_ebs_volume.v', 1)])
+        self.assertEqual(self.findings('resource "aws_ebs_volume" "v" {\n  encrypted = false\n}\n'), [('AVD-AWS-0026', 'aws_ebs_volume.v', 2)])
+        self.assertEqual(self.rule_ids('resource "aws_ebs_volume" "v" {\n  encrypted = true\n}\n'), [])
+        self.assertEqual(self.rule_ids('resource "aws_ebs_volume" "v" {\n  encrypted = var.encrypted\n}\n'), [])
+
+    def instance(self, body):
+        return 'resource "aws_instance" "i" {\n' + body + '}\n'
+
+    def test_instance_block_devices(self):
+        imds = '  metadata_options {\n    http_tokens = "required"\n  }\n'
+        self.assertEqual(self.rule_ids(self.instance(imds)), ['AVD-AWS-0131'])
+        self.assertEqual(self.rule_ids(self.instance(imds + '  root_block_device {\n    encrypted = true\n  }\n')), [])
+        self.assertEqual(self.findings(self.instance(
+            imds
+            + '  root_block_device {\n    encrypted = true\n  }\n'
+            + '  ebs_block_device {\n    encrypted = false\n  }\n'
+        )), [('AVD-AWS-0131', 'aws_instance.i', 9)])
+
+    def test_instance_imds_tokens(self):
+        root = '  root_block_device {\n    encrypted = true\n  }\n'
+        self.assertEqual(self.rule_ids(self.instance(root)), ['AVD-AWS-0028'])
+        self.assertEqual(self.rule_ids(self.instance(root + '  metadata_options {\n    http_tokens = "optional"\n  }\n')), ['AVD-AWS-0028'])
+        self.assertEqual(self.rule_ids(self.instance(root + '  metadata_options {\n    http_endpoint = "enabled"\n  }\n')), ['AVD-AWS-0028'])
+        self.assertEqual(self.rule_ids(self.instance(root + '  metadata_options {\n    http_endpoint = "disabled"\n  }\n')), [])
+        self.assertEqual(self.rule_ids(self.instance(root + '  metadata_options {\n    http_tokens = var.tokens\n  }\n')), [])
+
+    def test_rds_instance_encryption(self):
+        self.assertEqual(self.rule_ids('resource "aws_db_instance" "db" {\n  engine = "mysql"\n}\n'), ['AVD-AWS-0080'])
+        self.assertEqual(self.rule_ids('resource "aws_db_instance" "db" {\n  storage_encrypted = true\n}\n'), [])
+        self.assertEqual(self.rule_ids('resource "aws_db_instance" "db" {\n  replicate_source_db = aws_db_instance.main.id\n}\n'), [])
+
+    def test_only_resource_blocks_are_checked(self):
+        self.assertEqual(self.rule_ids('data "aws_ebs_volume" "v" {\n}\nmodule "aws_ebs_volume" {\n  source = "./m"\n}\n'), [])
+
+    def test_result_schema(self):
+        [result] = evaluate(parse('resource "aws_s3_bucket" "b" {\n  acl = "public-read"\n}\n'), filename='s3.tf')
+        self.assertEqual(result['long_id'], 'aws-s3-no-public-access-with-acl')
+        self.assertEqual((result['rule_provider'], result['rule_service'], result['severity']), ('aws', 's3', 'HIGH'))
+        self.assertEqual(result['links'], ['https://aquasecurity.github.io/tfsec/latest/checks/aws/s3/no-public-access-with-acl/'])
+        self.assertEqual(result['location'], {'filename': 's3.tf', 'start_line': 2, 'end_line': 2})
+
+    def test_every_rule_is_covered(self):
+        covered = {'AVD-AWS-0092', 'AVD-AWS-0107', 'AVD-AWS-0104', 'AVD-AWS-0026', 'AVD-AWS-0131', 'AVD-AWS-0028', 'AVD-AWS-0080'}
+        self.assertEqual({registered.rule_id for registered in RULES}, covered)
@@ -0,0 +1,132 @@
+import os
+import hashlib
+import tarfile
+import zipfile
+import tempfile
+
+CHUNK_SIZE = 64 * 1024
+ALLOWED_SUFFIXES = ('.tf', '.tfvars', '.tf.json', '.tfvars.json')
+ZIP_CONTENT_TYPES = ('application/zip', 'application/x-zip-compressed')
+
+
+class UploadRejected(Exception):
+    """업로드 거부 (status_code: 400 또는 413)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LimitedReader:
+    # 요청 본문을 읽으면서 바이트 수 제한
+    def __init__(self, stream, max_bytes):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:
+            raise UploadRejected(f'Upload exceeds {self.max_bytes} bytes', status_code=413)
+        return data
+
+
+class ScanDirectoryWriter:
+    """업로드된 Terraform 파일을 청크 단위로 스캔 디렉토리에 기록"""
+
+    def __init__(self, root, max_bytes, max_files):
+        self.root = os.path.realpath(root)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.total_bytes = 0
+        self.file_hashes = {}
+
+    def resolve(self, rel_path):
+        # 절대 경로, '..' 등 스캔 디렉토리 밖을 가리키는 경로는 거부
+        rel_path = rel_path.replace('\\', '/').lstrip('/')
+        target = os.path.realpath(os.path.join(self.root, rel_path))
+        if not target.startswith(self.root + os.sep):
+            raise UploadRejected(f'Invalid file path: {rel_path}')
+        return target
+
+    def accepts(self, rel_path):
+        return rel_path.lower().endswith(ALLOWED_SUFFIXES)
+
+    def write(self, rel_path, chunks):
+        if not self.accepts(rel_path):
+            return False
+
+        target = self.resolve(rel_path)
+        if len(self.file_hashes) >= self.max_files:
+            raise UploadRejected(f'Too many files (max {self.max_files})', status_code=413)
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        digest = hashlib.sha256()
+        with open(target, 'wb') as f:
+            for chunk in chunks:
+                self.total_bytes += len(chunk)
+                if self.total_bytes > self.max_bytes:
+                    raise UploadRejected(f'Extracted files exceed {self.max_bytes} bytes', status_code=413)
+                digest.update(chunk)
+                f.write(chunk)
+
+        self.file_hashes[os.path.relpath(target, self.root)] = digest.hexdigest()
+        return True
+
+    def tree_digest(self):
+        digest = hashlib.sha256()
+        for rel_path in sorted(self.file_hashes):
+            digest.update(f'{rel_path}\0{self.file_hashes[rel_path]}\n'.encode())
+        return digest.hexdigest()
+
+
+def iter_chunks(fileobj):
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def extract_tar_stream(stream, writer, strip_components=0, select=None):
+    # 'r|*' 스트림 모드: 본문 전체를 메모리/디스크에 두지 않고 순서대로 추출 (gz/bz2/xz 자동 인식)
+    try:
+        with tarfile.open(fileobj=stream, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                name = '/'.join(member.name.split('/')[strip_components:])
+                if name and writer.accepts(name) and (select is None or select(name)):
+                    writer.write(name, iter_chunks(archive.extractfile(member)))
+    except tarfile.TarError as e:
+        raise UploadRejected(f'Invalid tar archive: {e}')
+
+
+def extract_zip_stream(stream, writer, max_bytes):
+    # zip 은 목차가 끝에 있으므로 임시 파일로 청크 단위 저장 후 추출
+    with tempfile.TemporaryFile() as spool:
+        total = 0
+        for chunk in iter_chunks(stream):
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadRejected(f'Upload exceeds {max_bytes} bytes', status_code=413)
+            spool.write(chunk)
+        spool.seek(0)
+
+        try:
+            with zipfile.ZipFile(spool) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not writer.accepts(info.filename):
+                        continue
+                    with archive.open(info) as member:
+                        writer.write(info.filename, iter_chunks(member))
+        except zipfile.BadZipFile as e:
+            raise UploadRejected(f'Invalid zip archive: {e}')
+
+
+def extract_archive(stream, writer, content_type, max_bytes):
+    if content_type in ZIP_CONTENT_TYPES:
+        extract_zip_stream(stream, writer, max_bytes)
+    else:
+        extract_tar_stream(stream, writer)
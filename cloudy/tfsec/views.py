@@ -1,15 +1,77 @@
 import os
 import json
+import shutil
 import tempfile
-import subprocess
+from functools import partial
 
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import AllowAny  
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.parsers import MultiPartParser
+from login.utils import decrypt_token
+from github.ratelimit import GitHubRateLimited
+from github.streaming import streaming_response
+
+from .cache import cached_scan, cached_batch_scan, cached_directory_scan
+from .compact import compact_results
+from .diff import load_baseline, diff_fingerprints
+from .fast import fast_scan, check_syntax, MODE_FAST, MODE_FULL
+from .hcl import HCLSyntaxError
+from .incremental import (
+    verify_signature, changed_directories, directory_hashes, split_results_by_directory,
+    module_references, store_directory_findings, merged_findings, handle_push_event,
+)
+from .jobs import submit_scan_job, submit_background, expire_stale_job
+from .models import ScanJob, Scan, Finding
+from .repo import extract_repo_archive, GitHubArchiveError
+from .runner import build_scan_payload, run_tfsec, get_tfsec_version, ScanTimeout, OUTPUT_COMPACT
+from .scheduler import scheduler, ScanRejected, ScanQueueFull
+from .store import record_scan, parse_page_params, keyset_page
+from .streaming import iter_tfsec_results, ndjson_chunks, sarif_chunks
+from .uploads import ScanDirectoryWriter, LimitedReader, UploadRejected, extract_archive, ZIP_CONTENT_TYPES, CHUNK_SIZE
+
+
+def scan_rejected_response(e: ScanRejected) -> Response:
+    # 대기열 가득 참 → 429, 대기 시간 초과 → 503
+    response_status = status.HTTP_429_TOO_MANY_REQUESTS if isinstance(e, ScanQueueFull) else status.HTTP_503_SERVICE_UNAVAILABLE
+    response = Response({'error': str(e), 'retry_after': e.retry_after}, status=response_status)
+    response['Retry-After'] = str(e.retry_after)
+    return response
+
+
+def scan_timeout_response(e: ScanTimeout) -> Response:
+    return Response({'error': 'tfsec timed out', 'detail': str(e)}, status=status.HTTP_504_GATEWAY_TIMEOUT)
+
+
+def requested_mode(request):
+    # fast: 내장 규칙 엔진, full(기본값): tfsec
+    mode = request.query_params.get('mode')
+    if mode is None and isinstance(request.data, dict):
+        mode = request.data.get('mode')
+    return mode or MODE_FULL
+
+
+def requested_output(request, from_body=True):
+    # ?format= 은 DRF 렌더러 선택에 쓰이므로 output 파라미터 사용 (예: output=compact)
+    output = request.query_params.get('output')
+    if output is None and from_body and isinstance(request.data, dict):
+        output = request.data.get('output')
+    return output
+
+
+def syntax_error_payload(errors: list) -> dict:
+    return {'status': 'error', 'message': 'Invalid HCL syntax', 'errors': errors}
+
+
+def syntax_error_response(errors: list) -> Response:
+    # 문법 오류는 tfsec 를 실행하지 않고 바로 400
+    return Response(syntax_error_payload(errors), status=status.HTTP_400_BAD_REQUEST)
+
 
 class CheckTerraformSecurityView(APIView):
-    permission_classes = [AllowAny]  
+    permission_classes = [AllowAny]
 
     def post(self, request):
         try:
@@ -18,34 +80,585 @@ class CheckTerraformSecurityView(APIView):
             if terraform_code is None:
                 return Response({'error': 'terraform_code is missing'}, status=status.HTTP_400_BAD_REQUEST)
 
-            with tempfile.TemporaryDirectory() as temp_dir:
-                tf_path = os.path.join(temp_dir, 'main.tf')
-                with open(tf_path, 'w') as f:
-                    f.write(terraform_code)
+            errors = check_syntax(terraform_code)
+            if errors:
+                return syntax_error_response(errors)
+
+            # mode=fast: 프로세스 내 규칙 엔진 (문법 검사를 끈 경우 파싱 실패 시 tfsec 로 대체)
+            if requested_mode(request) == MODE_FAST:
+                try:
+                    outcome = fast_scan(terraform_code)
+                except (HCLSyntaxError, RecursionError):
+                    pass
+                else:
+                    response = Response(build_scan_payload(outcome, requested_output(request)), status=status.HTTP_200_OK)
+                    response['X-Scan-Mode'] = MODE_FAST
+                    return response
 
-                result = subprocess.run(
-                    ['tfsec', temp_dir, '--format', 'json'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
+            # 동일한 코드는 캐시된 결과 사용 (메모리 → DB 순)
+            outcome, cache_tier, cache_key = cached_scan(terraform_code)
 
-                stdout = result.stdout.decode()
-                stderr = result.stderr.decode()
+            response = Response(build_scan_payload(outcome, requested_output(request)), status=status.HTTP_200_OK)
+            response['X-Scan-Mode'] = MODE_FULL
+            response['X-Scan-Cache'] = cache_tier or 'miss'
+            response['X-Scan-Cache-Key'] = cache_key
+            response['X-Scan-Queue-Depth'] = str(scheduler.queue_depth)
+            return response
+
+        except ScanRejected as e:
+            return scan_rejected_response(e)
+        except ScanTimeout as e:
+            return scan_timeout_response(e)
+        except json.JSONDecodeError:
+            return Response({'error': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# 여러 코드 조각을 tfsec 한 번으로 스캔
+class CheckTerraformSecurityBatchView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        snippets = request.data.get('snippets')
+
+        # {이름: 코드} 또는 [{"name": ..., "terraform_code": ...}] 형식 허용
+        if isinstance(snippets, list):
+            try:
+                snippets = {item['name']: item['terraform_code'] for item in snippets}
+            except (KeyError, TypeError):
+                return Response({'error': "Each snippet must include 'name' and 'terraform_code'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not isinstance(snippets, dict) or not snippets:
+            return Response({'error': 'snippets is missing'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not all(isinstance(code, str) for code in snippets.values()):
+            return Response({'error': 'terraform_code must be a string'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(snippets) > settings.TFSEC_BATCH_MAX_SNIPPETS:
+            return Response({
+                'error': f'Too many snippets (max {settings.TFSEC_BATCH_MAX_SNIPPETS})'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # 문법 오류가 있는 조각은 tfsec 배치에서 제외
+        snippets = {str(name): code for name, code in snippets.items()}
+        invalid = {name: check_syntax(code) for name, code in snippets.items()}
+        invalid = {name: errors for name, errors in invalid.items() if errors}
+
+        try:
+            valid = {name: code for name, code in snippets.items() if name not in invalid}
+            scanned = cached_batch_scan(valid) if valid else {}
+        except ScanRejected as e:
+            return scan_rejected_response(e)
+        except ScanTimeout as e:
+            return scan_timeout_response(e)
+        except Exception as e:
+            return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        output = requested_output(request)
+        results = {}
+        cache_hits = 0
+        for name in snippets:
+            if name in invalid:
+                results[name] = syntax_error_payload(invalid[name])
+                continue
+
+            outcome, cache_tier = scanned[name]
+            if cache_tier:
+                cache_hits += 1
+            try:
+                results[name] = build_scan_payload(outcome, output)
+            except json.JSONDecodeError:
+                results[name] = {'error': 'Invalid JSON'}
+
+        response = Response({'results': results}, status=status.HTTP_200_OK)
+        response['X-Scan-Cache-Hits'] = f'{cache_hits}/{len(scanned)}'
+        return response
+
+
+# 여러 파일로 된 모듈 스캔 (tar/zip 본문 또는 multipart 업로드)
+class CheckTerraformModuleView(APIView):
+    permission_classes = [AllowAny]
+    # tar/zip 본문은 파서를 거치지 않고 request.stream 에서 직접 읽음
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        max_bytes = settings.TFSEC_UPLOAD_MAX_BYTES
+        content_type = (request.content_type or '').split(';')[0].strip().lower()
 
-                if result.returncode != 0:
+        content_length = request.META.get('CONTENT_LENGTH')
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            return Response({'error': f'Upload exceeds {max_bytes} bytes'}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        try:
+            with tempfile.TemporaryDirectory() as scan_dir:
+                writer = ScanDirectoryWriter(scan_dir, max_bytes, settings.TFSEC_UPLOAD_MAX_FILES)
+
+                try:
+                    if content_type == 'multipart/form-data':
+                        self.write_multipart(request, writer, max_bytes)
+                    elif request.stream is None:
+                        return Response({'error': 'Request body is empty'}, status=status.HTTP_400_BAD_REQUEST)
+                    else:
+                        extract_archive(LimitedReader(request.stream, max_bytes), writer, content_type, max_bytes)
+                except UploadRejected as e:
+                    return Response({'error': str(e)}, status=e.status_code)
+
+                if not writer.file_hashes:
+                    return Response({'error': 'No Terraform files found'}, status=status.HTTP_400_BAD_REQUEST)
+
+                outcome, cache_tier, cache_key = cached_directory_scan(scan_dir, writer.tree_digest())
+
+            response = Response({
+                **build_scan_payload(outcome, requested_output(request, from_body=False)),
+                'files': sorted(writer.file_hashes),
+            }, status=status.HTTP_200_OK)
+            response['X-Scan-Cache'] = cache_tier or 'miss'
+            response['X-Scan-Cache-Key'] = cache_key
+            response['X-Scan-Queue-Depth'] = str(scheduler.queue_depth)
+            return response
+
+        except ScanRejected as e:
+            return scan_rejected_response(e)
+        except ScanTimeout as e:
+            return scan_timeout_response(e)
+        except json.JSONDecodeError:
+            return Response({'error': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def write_multipart(self, request, writer, max_bytes):
+        # archive: tar/zip 파일 1개, files: 개별 파일 (paths 로 상대 경로 지정 가능)
+        archive = request.FILES.get('archive')
+        if archive is not None:
+            if archive.size > max_bytes:
+                raise UploadRejected(f'Upload exceeds {max_bytes} bytes', status_code=413)
+            archive_type = ZIP_CONTENT_TYPES[0] if archive.name.lower().endswith('.zip') else archive.content_type
+            extract_archive(archive, writer, archive_type, max_bytes)
+
+        files = request.FILES.getlist('files')
+        paths = request.data.getlist('paths')
+        if paths and len(paths) != len(files):
+            raise UploadRejected("'paths' must match the number of 'files'")
+
+        for index, uploaded in enumerate(files):
+            rel_path = paths[index] if paths else uploaded.name
+            writer.write(rel_path, uploaded.chunks(chunk_size=CHUNK_SIZE))
+
+
+# GitHub 저장소(repo@ref)를 tarball 한 번으로 받아 서버에서 스캔
+class CheckRepoSecurityView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        user = request.user
+        repo_name = request.data.get('repo_name')
+        ref = request.data.get('ref') or request.data.get('branch', 'main')
+
+        if not repo_name:
+            return Response({'error': 'Missing required parameter: repo_name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            access_token = decrypt_token(user.github_access_token)
+        except Exception as e:
+            return Response({'error': 'Token decrypt failed', 'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with tempfile.TemporaryDirectory() as scan_dir:
+                writer = ScanDirectoryWriter(scan_dir, settings.TFSEC_UPLOAD_MAX_BYTES, settings.TFSEC_UPLOAD_MAX_FILES)
+
+                try:
+                    extract_repo_archive(writer, access_token, user.username, repo_name, ref)
+                except GitHubArchiveError as e:
                     return Response({
-                        'status': 'error',
-                        'message': 'tfsec failed',
-                        'stdout': stdout,
-                        'stderr': stderr
-                    })
+                        'error': 'GitHub API error',
+                        'status_code': e.status_code,
+                        'detail': e.detail
+                    }, status=e.status_code)
+                except UploadRejected as e:
+                    return Response({'error': str(e)}, status=e.status_code)
 
-                return Response({
-                    'status': 'success',
-                    'data': json.loads(stdout)  # 문자열 → JSON으로 파싱
-                }, status=status.HTTP_200_OK)
+                if not writer.file_hashes:
+                    return Response({'error': 'No Terraform files found'}, status=status.HTTP_400_BAD_REQUEST)
+
+                outcome, cache_tier, cache_key = cached_directory_scan(scan_dir, writer.tree_digest())
+                modules = module_references(writer)
+
+            # 이후 push 웹훅 증분 스캔의 기준이 되도록 디렉토리별 결과 저장 + 스캔 이력 기록
+            scan = None
+            try:
+                grouped = split_results_by_directory(outcome)
+            except (json.JSONDecodeError, AttributeError):
+                pass
+            else:
+                repo = f'{user.username}/{repo_name}'
+                store_directory_findings(repo, ref, '', directory_hashes(writer.file_hashes), grouped, modules, replace_all=True)
+                scan = record_scan(repo, ref, '', Scan.SOURCE_REPO, [r for rs in grouped.values() for r in rs])
+
+            response = Response({
+                **build_scan_payload(outcome, requested_output(request)),
+                'repo': repo_name,
+                'ref': ref,
+                'files': sorted(writer.file_hashes),
+                'scan_id': scan.id if scan else None,
+            }, status=status.HTTP_200_OK)
+            response['X-Scan-Cache'] = cache_tier or 'miss'
+            response['X-Scan-Cache-Key'] = cache_key
+            return response
 
+        except ScanRejected as e:
+            return scan_rejected_response(e)
+        except ScanTimeout as e:
+            return scan_timeout_response(e)
         except json.JSONDecodeError:
             return Response({'error': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+        except GitHubRateLimited:
+            # GitHubRateLimitMiddleware 에서 429 로 응답
+            raise
         except Exception as e:
             return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# 저장소/브랜치의 병합된 최신 결과 조회
+class RepoFindingsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        repo_name = request.query_params.get('repo_name')
+        branch = request.query_params.get('branch', 'main')
+
+        if not repo_name:
+            return Response({'error': 'Missing required parameter: repo_name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'repo': repo_name,
+            'branch': branch,
+            'results': merged_findings(f'{request.user.username}/{repo_name}', branch),
+        }, status=status.HTTP_200_OK)
+
+
+# 저장된 스캔 이력 조회 (최신순, 키셋 페이지네이션)
+class ScanListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        repo_name = request.query_params.get('repo_name')
+        branch = request.query_params.get('branch', 'main')
+
+        if not repo_name:
+            return Response({'error': 'Missing required parameter: repo_name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            cursor, limit = parse_page_params(request.query_params)
+        except ValueError:
+            return Response({'error': 'cursor and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Scan.objects.filter(repo=f'{request.user.username}/{repo_name}', branch=branch)
+        scans, next_cursor = keyset_page(queryset, cursor, limit, descending=True)
+
+        return Response({
+            'scans': [{
+                'id': scan.id,
+                'commit_sha': scan.commit_sha,
+                'source': scan.source,
+                'finding_count': scan.finding_count,
+                'created_at': scan.created_at,
+            } for scan in scans],
+            'next_cursor': next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+# 저장된 결과 조회 (scan_id 미지정 시 최신 스캔, severity/rule_id/path 필터)
+class FindingListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        repo_name = params.get('repo_name')
+        branch = params.get('branch', 'main')
+
+        if not repo_name:
+            return Response({'error': 'Missing required parameter: repo_name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            cursor, limit = parse_page_params(params)
+        except ValueError:
+            return Response({'error': 'cursor and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        scans = Scan.objects.filter(repo=f'{request.user.username}/{repo_name}', branch=branch)
+        scan = scans.filter(id=params['scan_id']).first() if params.get('scan_id', '').isdigit() else scans.order_by('-id').first()
+        if scan is None:
+            return Response({'error': 'Scan not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        queryset = Finding.objects.filter(scan=scan)
+        if params.get('severity'):
+            queryset = queryset.filter(severity__in=params['severity'].upper().split(','))
+        if params.get('rule_id'):
+            queryset = queryset.filter(rule_id__in=params['rule_id'].split(','))
+        if params.get('path'):
+            queryset = queryset.filter(filename__startswith=params['path'])
+
+        findings, next_cursor = keyset_page(queryset.only('id', 'data'), cursor, limit)
+
+        results = [finding.data for finding in findings]
+        if requested_output(request, from_body=False) == OUTPUT_COMPACT:
+            return Response({
+                'scan_id': scan.id,
+                'format': OUTPUT_COMPACT,
+                **compact_results(results),
+                'next_cursor': next_cursor,
+            }, status=status.HTTP_200_OK)
+
+        return Response({
+            'scan_id': scan.id,
+            'results': results,
+            'next_cursor': next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+# 두 스캔 비교 (새로 생긴 / 해결된 결과), POST 시 baseline 으로 억제 목록 전달 가능
+class ScanDiffView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return self.diff(request, request.query_params)
+
+    def post(self, request):
+        return self.diff(request, request.data, baseline=request.data.get('baseline'))
+
+    def diff(self, request, params, baseline=None):
+        repo_name = params.get('repo_name')
+        branch = params.get('branch', 'main')
+
+        if not repo_name:
+            return Response({'error': 'Missing required parameter: repo_name'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            suppressed = load_baseline(baseline)
+        except ValueError as e:
+            return Response({'error': 'Invalid baseline', 'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        scans = Scan.objects.filter(repo=f'{request.user.username}/{repo_name}', branch=branch)
+        try:
+            head_id = params.get('head_scan_id')
+            head = scans.filter(id=int(head_id)).first() if head_id else scans.order_by('-id').first()
+            if head is None:
+                return Response({'error': 'Head scan not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            # base 미지정 시 head 직전 스캔
+            base_id = params.get('base_scan_id')
+            base = scans.filter(id=int(base_id)).first() if base_id else scans.filter(id__lt=head.id).order_by('-id').first()
+            if base is None:
+                return Response({'error': 'Base scan not found'}, status=status.HTTP_404_NOT_FOUND)
+        except (TypeError, ValueError):
+            return Response({'error': 'Scan ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 식별자/id 만 읽어서 비교하고, 본문은 달라진 결과만 조회
+        base_fingerprints = dict(Finding.objects.filter(scan=base).values_list('fingerprint', 'id'))
+        head_fingerprints = dict(Finding.objects.filter(scan=head).values_list('fingerprint', 'id'))
+        changes = diff_fingerprints(base_fingerprints, head_fingerprints, suppressed)
+
+        data_by_id = dict(
+            Finding.objects.filter(id__in=changes['new'] + changes['fixed']).values_list('id', 'data')
+        )
+
+        return Response({
+            'base_scan_id': base.id,
+            'head_scan_id': head.id,
+            'new': [data_by_id[finding_id] for finding_id in changes['new']],
+            'fixed': [data_by_id[finding_id] for finding_id in changes['fixed']],
+            'unchanged_count': changes['unchanged_count'],
+            'suppressed_count': changes['suppressed_count'],
+        }, status=status.HTTP_200_OK)
+
+
+# GitHub push 웹훅: 바뀐 Terraform 디렉토리만 재스캔
+class GitHubPushWebhookView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        # 서명 검증은 파싱 전 원본 본문 기준
+        if not verify_signature(request.body, request.headers.get('X-Hub-Signature-256', '')):
+            return Response({'error': 'Invalid signature'}, status=status.HTTP_403_FORBIDDEN)
+
+        event = request.headers.get('X-GitHub-Event')
+        if event == 'ping':
+            return Response({'message': 'pong'}, status=status.HTTP_200_OK)
+        if event != 'push':
+            return Response({'message': f"Ignored event '{event}'"}, status=status.HTTP_202_ACCEPTED)
+
+        payload = request.data
+        ref = payload.get('ref', '')
+        if not ref.startswith('refs/heads/') or payload.get('deleted'):
+            return Response({'message': 'Ignored ref'}, status=status.HTTP_202_ACCEPTED)
+
+        directories = changed_directories(payload.get('commits') or [])
+        if not directories:
+            return Response({'message': 'No Terraform changes'}, status=status.HTTP_202_ACCEPTED)
+
+        submit_background(handle_push_event, payload)
+
+        return Response({
+            'message': 'Rescan scheduled',
+            'directories': sorted(directories),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+# 대용량 결과 스트리밍 (output=ndjson | sarif), tfsec 출력은 파일에 기록 후 한 건씩 파싱해 전송
+class CheckTerraformSecurityStreamView(APIView):
+    permission_classes = [AllowAny]
+
+    STREAM_CONTENT_TYPES = {
+        'ndjson': 'application/x-ndjson',
+        'sarif': 'application/sarif+json',
+    }
+
+    def post(self, request):
+        output = requested_output(request) or 'ndjson'
+        if output not in self.STREAM_CONTENT_TYPES:
+            return Response({'error': 'output must be ndjson or sarif'}, status=status.HTTP_400_BAD_REQUEST)
+
+        terraform_code = request.data.get('terraform_code')
+        repo_name = request.data.get('repo_name')
+
+        if terraform_code is None and not repo_name:
+            return Response({'error': 'terraform_code or repo_name is missing'}, status=status.HTTP_400_BAD_REQUEST)
+        if terraform_code is None and not request.user.is_authenticated:
+            return Response({'error': 'Authentication required to scan a repository'}, status=status.HTTP_401_UNAUTHORIZED)
+
+        if terraform_code is not None:
+            errors = check_syntax(terraform_code)
+            if errors:
+                return syntax_error_response(errors)
+
+        # 작업 디렉토리는 응답이 닫힐 때 삭제
+        work_dir = tempfile.mkdtemp()
+        scan_dir = os.path.join(work_dir, 'src')
+        output_path = os.path.join(work_dir, 'tfsec.json')
+        os.mkdir(scan_dir)
+
+        try:
+            if terraform_code is not None:
+                with open(os.path.join(scan_dir, 'main.tf'), 'w') as f:
+                    f.write(terraform_code)
+            else:
+                ref = request.data.get('ref') or request.data.get('branch', 'main')
+                writer = ScanDirectoryWriter(scan_dir, settings.TFSEC_UPLOAD_MAX_BYTES, settings.TFSEC_UPLOAD_MAX_FILES)
+                extract_repo_archive(writer, decrypt_token(request.user.github_access_token), request.user.username, repo_name, ref)
+
+            with open(output_path, 'wb') as stdout_file:
+                outcome = run_tfsec(scan_dir, stdout_file=stdout_file)
+
+            with open(output_path, 'r') as f:
+                head = f.read(CHUNK_SIZE)
+
+            # 결과가 아닌 오류 출력이면 기존 응답 형식 그대로 반환
+            if outcome['returncode'] != 0 and not head.lstrip().startswith('{'):
+                shutil.rmtree(work_dir, ignore_errors=True)
+                return Response({
+                    'status': 'error',
+                    'message': 'tfsec failed',
+                    'stdout': head,
+                    'stderr': outcome['stderr']
+                }, status=status.HTTP_200_OK)
+
+        except GitHubArchiveError as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return Response({'error': 'GitHub API error', 'status_code': e.status_code, 'detail': e.detail}, status=e.status_code)
+        except UploadRejected as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return Response({'error': str(e)}, status=e.status_code)
+        except ScanRejected as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return scan_rejected_response(e)
+        except ScanTimeout as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return scan_timeout_response(e)
+        except GitHubRateLimited:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise
+        except Exception as e:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        response = streaming_response(
+            request,
+            self.stream(scan_dir, output_path, output),
+            content_type=self.STREAM_CONTENT_TYPES[output]
+        )
+        # 스트림이 시작되지 않고 닫혀도(클라이언트 연결 종료 등) 삭제되도록 응답에 등록
+        response._resource_closers.append(partial(shutil.rmtree, work_dir, ignore_errors=True))
+        response['X-Scan-Queue-Depth'] = str(scheduler.queue_depth)
+        return response
+
+    def stream(self, scan_dir, output_path, output):
+        with open(output_path, 'r') as f:
+            results = self.relative_results(iter_tfsec_results(f), scan_dir)
+            if output == 'sarif':
+                yield from sarif_chunks(results, get_tfsec_version())
+            else:
+                yield from ndjson_chunks(results)
+
+    def relative_results(self, results, scan_dir):
+        root = os.path.realpath(scan_dir)
+        for result in results:
+            location = result.get('location') or {}
+            if location.get('filename'):
+                location['filename'] = os.path.relpath(os.path.realpath(location['filename']), root)
+            yield result
+
+
+# 비동기 스캔 작업 등록
+class ScanJobCreateView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        terraform_code = request.data.get('terraform_code')
+
+        if terraform_code is None:
+            return Response({'error': 'terraform_code is missing'}, status=status.HTTP_400_BAD_REQUEST)
+
+        errors = check_syntax(terraform_code)
+        if errors:
+            return syntax_error_response(errors)
+
+        try:
+            job = submit_scan_job(terraform_code)
+        except Exception as e:
+            return Response({'error': 'Internal server error', 'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({
+            'job_id': str(job.id),
+            'status': job.status,
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+# 비동기 스캔 작업 상태/결과 조회
+class ScanJobDetailView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, job_id):
+        job = ScanJob.objects.filter(id=job_id).first()
+
+        if job is None:
+            return Response({'error': 'Scan job not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        job = expire_stale_job(job)
+        return Response({
+            'job_id': str(job.id),
+            'status': job.status,
+            'result': job.result,
+            'error': job.error,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at,
+        }, status=status.HTTP_200_OK)
+
+
+# tfsec 스케줄러 상태 (프로세스 단위 대기열/대기 시간)
+class ScanSchedulerStatsView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(scheduler.stats(), status=status.HTTP_200_OK)